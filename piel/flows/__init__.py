@@ -13,9 +13,11 @@ from .digital_electro_optic import (
     find_nearest_phase_for_bit,
 )
 from .electro_optic import (
+    calculate_target_mode_transmission,
     extract_phase_from_fock_state_transitions,
     format_electro_optic_fock_transition,
     generate_s_parameter_circuit_from_photonic_circuit,
     get_state_phase_transitions,
     get_state_to_phase_map,
+    solve_transition_phases,
 )
@@ -10,7 +10,6 @@ from ..types import (
     OpticalStateTransitions,
     TruthTable,
     TruthTableLogicType,
-    convert_tuple_to_string,
     convert_to_bits,
 )
 
@@ -125,74 +124,105 @@ def add_truth_table_phase_to_bit_data(
     return truth_table
 
 
-def convert_optical_transitions_to_truth_table(
+def _compose_transition_arrays(
     optical_state_transitions: OpticalStateTransitions,
-    bit_phase_map=BitPhaseMap,
     logic: TruthTableLogicType = "implementation",
-) -> TruthTable:
-    ports_list = optical_state_transitions.keys_list
-    output_ports_list = list()
-    if logic == "implementation":
-        transitions_dataframe = optical_state_transitions.target_output_dataframe
-    elif logic == "full":
-        transitions_dataframe = optical_state_transitions.transition_dataframe
-    else:
+) -> tuple[np.ndarray, np.ndarray]:
+    # Returns the (n_transitions, n_phases) phases and the (n_transitions, n_modes) integer input Fock states.
+    if logic not in ("implementation", "full"):
         raise ValueError(f"Invalid logic type: {logic}")
 
-    phase_bit_array_length = len(transitions_dataframe["phase"][0])
-    truth_table_raw = dict()
-
-    # Check if all input and output ports are in the dataframe
-    for port_i in ports_list:
-        truth_table_raw[port_i] = transitions_dataframe.loc[:, port_i].values
+    if optical_state_transitions.is_columnar:
+        phase_array = np.asarray(optical_state_transitions.phase_array, dtype=float)
+        input_fock_state_array = np.asarray(
+            optical_state_transitions.input_fock_state_array, dtype=int
+        )
+        if logic == "implementation":
+            target_mode_output_array = (
+                optical_state_transitions.target_mode_output_array
+            )
+            if target_mode_output_array is None:
+                target_mode_output_array = np.zeros(len(phase_array))
+            implementation_mask = np.asarray(target_mode_output_array) == 1
+            phase_array = phase_array[implementation_mask]
+            input_fock_state_array = input_fock_state_array[implementation_mask]
+        return phase_array, input_fock_state_array
 
-        if port_i == "phase":
-            continue
+    if logic == "implementation":
+        transitions_dataframe = optical_state_transitions.target_output_dataframe
+    else:
+        transitions_dataframe = optical_state_transitions.transition_dataframe
+    phase_array = np.asarray(transitions_dataframe["phase"].tolist(), dtype=float)
+    input_fock_state_array = np.rint(
+        np.asarray(
+            [
+                np.ravel(np.real(input_fock_state_i))
+                for input_fock_state_i in transitions_dataframe["input_fock_state"]
+            ]
+        )
+    ).astype(int)
+    return phase_array, input_fock_state_array
 
-        if not isinstance(transitions_dataframe.loc[0, port_i], tuple):
-            print(transitions_dataframe.loc[0, port_i])
-            continue
 
-        truth_table_raw[f"{port_i}_str"] = transitions_dataframe.loc[:, port_i].apply(
-            convert_tuple_to_string
-        )
+def convert_optical_transitions_to_truth_table(
+    optical_state_transitions: OpticalStateTransitions,
+    bit_phase_map=BitPhaseMap,
+    logic: TruthTableLogicType = "implementation",
+) -> TruthTable:
+    """
+    Converts the optical state transitions into a truth table that maps each input Fock state to the bits of the
+    phases applied onto each switch. The Fock states and phases are processed as integer and float arrays: the
+    transitions are deduplicated on their input Fock state in a single hashed pass, keeping the first transition of
+    each input, and all their phases are mapped to bits in a single ``BitPhaseMap`` lookup.
 
-        truth_table_raw[f"{port_i}_str"] = truth_table_raw[f"{port_i}_str"].apply(
-            lambda x: "".join(str(x))
-        )
-        truth_table_raw[f"{port_i}_str"] = truth_table_raw[
-            f"{port_i}_str"
-        ].values.tolist()
+    Args:
+        optical_state_transitions (OpticalStateTransitions): The optical state transitions.
+        bit_phase_map (BitPhaseMap): The phase-bits mapping.
+        logic (TruthTableLogicType): Whether to convert the transitions with a target mode output,
+            ``"implementation"``, or all of them, ``"full"``. Defaults to "implementation".
 
-    for phase_iterable_id_i in range(phase_bit_array_length):
-        # Initialise lists
-        truth_table_raw[f"bit_phase_{phase_iterable_id_i}"] = list()
-        output_ports_list.append(f"bit_phase_{phase_iterable_id_i}")
+    Returns:
+        TruthTable: The truth table with the ``input_fock_state_str`` input port and the ``bit_phase_<i>`` output
+        ports.
+    """
+    phase_array, input_fock_state_array = _compose_transition_arrays(
+        optical_state_transitions, logic=logic
+    )
 
-    for transition_id_i in range(len(transitions_dataframe)):
-        bit_phase = convert_phase_to_bit_iterable(
-            phase=transitions_dataframe["phase"].iloc[transition_id_i],
-            bit_phase_map=bit_phase_map,
+    # Keep the first transition of each input Fock state.
+    unique_transitions_mask = (
+        ~pd.DataFrame(input_fock_state_array).duplicated(keep="first").to_numpy()
+    )
+    phase_array = phase_array[unique_transitions_mask]
+    input_fock_state_array = input_fock_state_array[unique_transitions_mask]
+
+    # Only the unique input Fock states are converted into strings.
+    input_fock_state_str = np.full(len(input_fock_state_array), "", dtype=str)
+    for mode_i in range(input_fock_state_array.shape[1]):
+        input_fock_state_str = np.char.add(
+            input_fock_state_str, input_fock_state_array[:, mode_i].astype(str)
         )
 
-        for phase_iterable_id_i in range(phase_bit_array_length):
-            truth_table_raw[f"bit_phase_{phase_iterable_id_i}"].append(
-                bit_phase[phase_iterable_id_i]
-            )
+    # Assumes last bit phase mapping is the largest one
+    max_bit_length = len(bit_phase_map.bits[-1])
+    bit_phase_array, _ = bit_phase_map.convert_phase_to_bits(phase_array)
+    bit_phase_array = np.char.zfill(bit_phase_array, max_bit_length)
 
     input_ports = ["input_fock_state_str"]
-    output_ports = output_ports_list
-
-    truth_table_filtered_dictionary = filter_and_correct_truth_table(
-        truth_table_dictionary=truth_table_raw,
-        input_ports=input_ports,
-        output_ports=output_ports,
-    )
+    output_ports = [
+        f"bit_phase_{phase_iterable_id_i}"
+        for phase_iterable_id_i in range(phase_array.shape[1])
+    ]
+    truth_table_dictionary = {"input_fock_state_str": input_fock_state_str.tolist()}
+    for phase_iterable_id_i, output_port_i in enumerate(output_ports):
+        truth_table_dictionary[output_port_i] = bit_phase_array[
+            :, phase_iterable_id_i
+        ].tolist()
 
     return TruthTable(
         input_ports=input_ports,
         output_ports=output_ports,
-        **truth_table_filtered_dictionary,
+        **truth_table_dictionary,
     )
 
 
@@ -219,32 +249,15 @@ def convert_phase_to_bit_iterable(
     # Assumes last bit phase mapping is the largest one
     max_bit_length = len(bit_phase_map.bits[-1])
 
-    bit_array = []
-
-    for phase_i in phase:
-        # Apply rounding function if provided
-        if rounding_function:
-            phase_i = rounding_function(phase_i)
-
-        # Check if phase is in the dataframe
-        matched_rows = bit_phase_map.dataframe.loc[
-            bit_phase_map.dataframe["phase"] == phase_i, "bits"
-        ]
-
-        # If exact phase is not found, use the nearest phase bit representation
-        if matched_rows.empty:
-            bitstring, _ = find_nearest_bit_for_phase(
-                phase_i, bit_phase_map, rounding_function
-            )
-        else:
-            bitstring = matched_rows.iloc[0]
-
-        # Pad the bitstring to the maximum length
-        full_length_bitstring = bitstring.zfill(max_bit_length)
+    # Apply rounding function if provided
+    if rounding_function:
+        phase = [rounding_function(phase_i) for phase_i in phase]
 
-        bit_array.append(full_length_bitstring)
+    # Exact phases are their own nearest phase, so all the phases are mapped in a single sorted lookup.
+    bit_array, _ = bit_phase_map.convert_phase_to_bits(np.asarray(phase, dtype=float))
 
-    return tuple(bit_array)
+    # Pad the bitstrings to the maximum length
+    return tuple(np.char.zfill(bit_array, max_bit_length).tolist())
 
 
 def find_nearest_bit_for_phase(
@@ -259,31 +272,20 @@ def find_nearest_bit_for_phase(
 
     Args:
         target_phase(float): Target phase to map to.
-        bit_phase_map(pd.DataFrame): Dataframe containing the phase-bits mapping.
+        bit_phase_map(BitPhaseMap): The phase-bits mapping.
         rounding_function(Callable): Rounding function to apply to the target phase.
 
     Returns:
-        bitstring(str): Bitstring corresponding to the nearest phase.
+        tuple: The bitstring corresponding to the nearest phase, and the nearest phase.
     """
-    # TODO interim pydantic-dataframe migration
-    bit_phase_map = bit_phase_map.dataframe
-
     # Apply rounding function if provided
     if rounding_function:
         target_phase = rounding_function(target_phase)
 
-    # Find the nearest phase from the dataframe
-    phases = bit_phase_map["phase"].values
-    nearest_phase = phases[
-        np.argmin(np.abs(phases - target_phase))
-    ]  # TODO implement rounding function here.
+    # Find the nearest phase and its bitstring from the sorted phase index
+    bitstring, nearest_phase = bit_phase_map.convert_phase_to_bits(target_phase)
 
-    # Get the corresponding bitstring for the nearest phase
-    bitstring = bit_phase_map.loc[bit_phase_map["phase"] == nearest_phase, "bits"].iloc[
-        0
-    ]
-
-    return bitstring, nearest_phase
+    return str(bitstring), nearest_phase.item()
 
 
 def find_nearest_phase_for_bit(
@@ -346,37 +348,19 @@ def filter_and_correct_truth_table(
         if port not in truth_table_dictionary:
             raise ValueError(f"Port '{port}' not found in truth_table_dictionary.")
 
-    # Initialize a dictionary to keep track of mappings
-    mapping_dict = {}
-
-    # Initialize lists to store the corrected inputs and outputs
-    corrected_inputs = {input_port: [] for input_port in input_ports}
-    corrected_outputs = {output_port: [] for output_port in output_ports}
-
-    # Get the length of the files lists
-    num_entries = len(truth_table_dictionary[input_ports[0]])
-
-    for i in range(num_entries):
-        # Extract the current input value
-        input_value = tuple(
-            truth_table_dictionary[input_port][i] for input_port in input_ports
-        )
-
-        # Extract the current set of output values
-        output_values = tuple(
-            truth_table_dictionary[output_port][i] for output_port in output_ports
-        )
-
-        if input_value not in mapping_dict:
-            # Store the unique mapping
-            mapping_dict[input_value] = output_values
-            # Append to the corrected lists
-            for input_port, value in zip(input_ports, input_value):
-                corrected_inputs[input_port].append(value)
-            for output_port, value in zip(output_ports, output_values):
-                corrected_outputs[output_port].append(value)
-
-    # Combine the corrected inputs and outputs into a single dictionary
-    corrected_truth_table = {**corrected_inputs, **corrected_outputs}
+    truth_table_dataframe = pd.DataFrame(
+        {
+            port: list(truth_table_dictionary[port])
+            for port in input_ports + output_ports
+        }
+    )
+    # Retain the first mapping of each unique input value in a single hashed pass.
+    unique_mappings_mask = ~truth_table_dataframe.duplicated(
+        subset=input_ports, keep="first"
+    )
+    corrected_truth_table = {
+        port: truth_table_dataframe.loc[unique_mappings_mask, port].tolist()
+        for port in input_ports + output_ports
+    }
 
     return corrected_truth_table
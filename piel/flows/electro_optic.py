@@ -1,8 +1,10 @@
+import jax
 import jax.numpy as jnp  # TODO add typing
+import numpy as np
 import gdsfactory as gf
-from itertools import product
+from itertools import islice, product
 import sax
-from typing import Optional, Callable
+from typing import Optional, Callable, Iterator
 from ..types import (
     absolute_to_threshold,
     convert_array_type,
@@ -13,17 +15,21 @@ from ..types import (
     PhaseTransitionTypes,
     OpticalTransmissionCircuit,
     OpticalStateTransitions,
+    PortsTuple,
     SParameterCollection,
+    SParameterMatrixTuple,
     TupleIntType,
 )
 from ..tools.sax.netlist import (
     address_value_dictionary_to_function_parameter_dictionary,
     get_matched_model_recursive_netlist_instances,
 )
-from ..tools.sax.utils import sax_to_s_parameters_standard_matrix
+from ..tools.sax.cache import SaxCircuitCache
+from ..tools.sax.subcircuit import compose_passive_cached_circuit
+from ..tools.sax.utils import SParameterPortPlan, sax_to_s_parameters_standard_matrix
 from ..tools.qutip import fock_states_only_individual_modes
 from ..models.frequency.defaults import get_default_models
-from ..integration.thewalrus_qutip import fock_transition_probability_amplitude
+from ..integration.thewalrus_qutip import fock_transition_probability_amplitude_matrix
 
 
 def compose_phase_address_state(
@@ -106,6 +112,205 @@ def calculate_switch_unitaries(
     return implemented_unitary_dictionary
 
 
+def compose_switch_function_parameter_batch(
+    switch_function_parameter_state: dict,
+) -> dict:
+    """
+    This function stacks the per-configuration switch function parameter states into a single function parameter
+    dictionary in which every leaf is an array with a leading configuration axis. All the configurations must share
+    the same nested structure, which is the case when they are composed from the same switch instance list.
+
+    .. code-block:: python
+
+        # Input
+        {
+            0: {"mzi_1": {"sxt": {"active_phase_rad": 0}}},
+            1: {"mzi_1": {"sxt": {"active_phase_rad": 3.14}}},
+        }
+        # Output
+        {"mzi_1": {"sxt": {"active_phase_rad": Array([0.0, 3.14])}}}
+
+    Args:
+        switch_function_parameter_state (dict): The dictionary of the switch function parameter state.
+
+    Returns:
+        dict: The batched function parameter dictionary.
+    """
+    function_parameter_states = list(switch_function_parameter_state.values())
+    if len(function_parameter_states) == 0:
+        raise ValueError("At least one switch function parameter state is required.")
+    return jax.tree_util.tree_map(
+        lambda *values: jnp.stack([jnp.asarray(value) for value in values]),
+        *function_parameter_states,
+    )
+
+
+def calculate_switch_unitaries_batched(
+    circuit: OpticalTransmissionCircuit,
+    switch_function_parameter_state: dict,
+    input_ports_order: tuple[str] | None = None,
+) -> SParameterMatrixTuple:
+    """
+    This function calculates the switch unitaries for all the switch function parameter states in a single circuit
+    evaluation. The function parameter states are stacked into arrays with a leading configuration axis, which the
+    ``sax`` models broadcast over, and the resulting S-parameter dictionary is converted to the standard matrix
+    notation with a single ``SParameterPortPlan`` gather. This avoids a separate circuit dispatch and conversion per
+    configuration.
+
+    Note that the ``sax`` circuit itself is not wrapped in ``jax.vmap`` as the ``klu`` backend solver only supports a
+    single batch dimension, which is the one provided by the stacked parameters.
+
+    The ports are selected as in ``sax_to_s_parameters_standard_matrix``, so if an ``input_ports_order`` is provided,
+    the remaining output ports are sorted by name.
+
+    Args:
+        circuit (OpticalTransmissionCircuit): The optical transmission circuit.
+        switch_function_parameter_state (dict): The dictionary of the switch function parameter state.
+        input_ports_order (tuple): The ports order tuple containing the names and order of the input ports.
+
+    Returns:
+        SParameterMatrixTuple: The ``(n_configs, n_out, n_in)`` unitary tensor and the input ports order.
+    """
+    configuration_amount = len(switch_function_parameter_state)
+    batched_function_parameter_state = compose_switch_function_parameter_batch(
+        switch_function_parameter_state=switch_function_parameter_state
+    )
+    sax_s_parameters = circuit(**batched_function_parameter_state)
+
+    if len(jax.tree_util.tree_leaves(batched_function_parameter_state)) == 0:
+        # No configuration parameters, so the circuit has no configuration axis to map over.
+        sax_s_parameters = {
+            key: jnp.broadcast_to(value, (configuration_amount,))
+            for key, value in sax_s_parameters.items()
+        }
+
+    # The port layout is static, so it is resolved once and gathered for all the configurations together.
+    port_plan = SParameterPortPlan.from_sax_input(
+        sax_s_parameters, input_ports_order=input_ports_order
+    )
+    unitaries, ports_order = sax_to_s_parameters_standard_matrix(
+        sax_s_parameters, port_plan=port_plan
+    )
+    return unitaries, ports_order
+
+
+def compose_phase_configuration_chunks(
+    switch_states: list[NumericalTypes],
+    switch_amount: int,
+    chunk_size: int = 1024,
+) -> Iterator[list[tuple]]:
+    """
+    This function lazily enumerates the cross product of the ``switch_states`` over ``switch_amount`` switches in
+    chunks of at most ``chunk_size`` phase configurations. The configurations are yielded in the same order as
+    ``itertools.product``, but the full cross product is never held in memory.
+
+    Args:
+        switch_states (list): The list of switch states.
+        switch_amount (int): The amount of switches in the circuit.
+        chunk_size (int): The maximum amount of phase configurations per chunk.
+
+    Yields:
+        list[tuple]: A chunk of phase configurations.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be a positive integer.")
+    phase_configurations = product(switch_states, repeat=switch_amount)
+    while phase_configurations_chunk := list(islice(phase_configurations, chunk_size)):
+        yield phase_configurations_chunk
+
+
+def stream_switch_unitaries(
+    circuit: OpticalTransmissionCircuit,
+    switch_instance_list: list[tuple],
+    switch_states: list[NumericalTypes],
+    chunk_size: int = 1024,
+    input_ports_order: tuple[str] | None = None,
+) -> Iterator[tuple[list[tuple], ArrayTypes, PortsTuple]]:
+    """
+    This function evaluates the switch unitaries for every phase configuration of the ``switch_instance_list`` chunk
+    by chunk. Each chunk is evaluated with a single batched circuit evaluation, so the memory usage is bounded by
+    ``chunk_size`` rather than by ``len(switch_states) ** len(switch_instance_list)``.
+
+    Args:
+        circuit (OpticalTransmissionCircuit): The optical transmission circuit.
+        switch_instance_list (list[tuple]): The list of switch instance addresses.
+        switch_states (list): The list of switch states.
+        chunk_size (int): The maximum amount of phase configurations per chunk.
+        input_ports_order (tuple): The ports order tuple containing the names and order of the input ports.
+
+    Yields:
+        tuple: The chunk phase configurations, the ``(chunk_size, n_out, n_in)`` unitary tensor and the ports order.
+    """
+    for phase_configurations_chunk in compose_phase_configuration_chunks(
+        switch_states=switch_states,
+        switch_amount=len(switch_instance_list),
+        chunk_size=chunk_size,
+    ):
+        switch_function_parameter_state = compose_switch_function_parameter_state(
+            switch_phase_address_state=compose_phase_address_state(
+                switch_instance_map=switch_instance_list,
+                switch_phase_permutation_map=phase_configurations_chunk,
+            )
+        )
+        unitaries, ports_order = calculate_switch_unitaries_batched(
+            circuit=circuit,
+            switch_function_parameter_state=switch_function_parameter_state,
+            input_ports_order=input_ports_order,
+        )
+        yield phase_configurations_chunk, unitaries, ports_order
+
+
+def filter_phase_configurations_by_transition(
+    circuit: OpticalTransmissionCircuit,
+    switch_instance_list: list[tuple],
+    input_fock_state: ArrayTypes,
+    output_fock_state: ArrayTypes,
+    switch_states: list[NumericalTypes] | None = None,
+    chunk_size: int = 1024,
+    threshold: float = 1e-6,
+    input_ports_order: tuple[str] | None = None,
+) -> list[tuple]:
+    """
+    This function streams the phase configurations of a switch fabric and only keeps the configurations that
+    implement the classical transition from ``input_fock_state`` to ``output_fock_state``. The output state of each
+    configuration is determined as in ``format_electro_optic_fock_transition``, by thresholding the absolute
+    transmission of the input state through the corresponding unitary.
+
+    Args:
+        circuit (OpticalTransmissionCircuit): The optical transmission circuit.
+        switch_instance_list (list[tuple]): The list of switch instance addresses.
+        input_fock_state (ArrayTypes): The input Fock state.
+        output_fock_state (ArrayTypes): The target output Fock state.
+        switch_states (list): The list of switch states. Defaults to ``[0, pi]``.
+        chunk_size (int): The maximum amount of phase configurations per chunk.
+        threshold (float): The transmission threshold of an occupied output mode.
+        input_ports_order (tuple): The ports order tuple containing the names and order of the input ports.
+
+    Returns:
+        list[tuple]: The phase configurations that implement the transition.
+    """
+    if switch_states is None:
+        switch_states = [0, jnp.pi]
+
+    input_fock_state = jnp.ravel(jnp.asarray(input_fock_state))
+    output_fock_state = jnp.ravel(jnp.asarray(output_fock_state))
+
+    matched_phase_configurations = list()
+    for phase_configurations_chunk, unitaries, _ in stream_switch_unitaries(
+        circuit=circuit,
+        switch_instance_list=switch_instance_list,
+        switch_states=switch_states,
+        chunk_size=chunk_size,
+        input_ports_order=input_ports_order,
+    ):
+        raw_output_states = jnp.abs(unitaries @ input_fock_state) > threshold
+        matched = jnp.all(raw_output_states == (output_fock_state > 0), axis=-1)
+        matched_phase_configurations.extend(
+            phase_configurations_chunk[i] for i in jnp.flatnonzero(matched).tolist()
+        )
+    return matched_phase_configurations
+
+
 def calculate_all_transition_probability_amplitudes(
     unitary_matrix: ArrayTypes,
     input_fock_states: list[ArrayTypes],
@@ -114,35 +319,120 @@ def calculate_all_transition_probability_amplitudes(
     """
     This tells us the transition probabilities between our photon states for a particular implemented unitary.
 
+    The amplitudes are computed at once with ``fock_transition_probability_amplitude_matrix`` and this dictionary is
+    a per-transition view of the resulting amplitude matrix.
+
     Args:
         unitary_matrix (jnp.ndarray): The unitary matrix.
         input_fock_states (list): The list of input Fock states.
         output_fock_states (list): The list of output Fock states.
 
+    Returns:
+        dict[int, FockStatePhaseTransitionType]: The dictionary of the Fock state phase transition type.
+    """
+    transition_probability_amplitudes = fock_transition_probability_amplitude_matrix(
+        unitary_matrices=unitary_matrix,
+        input_fock_states=input_fock_states,
+        output_fock_states=output_fock_states,
+    )
+    return compose_transition_probability_amplitudes_data(
+        transition_probability_amplitudes=transition_probability_amplitudes,
+        input_fock_states=input_fock_states,
+        output_fock_states=output_fock_states,
+    )
+
+
+def compose_transition_probability_amplitudes_data(
+    transition_probability_amplitudes: ArrayTypes,
+    input_fock_states: list[ArrayTypes],
+    output_fock_states: list[ArrayTypes],
+) -> dict[int, FockStatePhaseTransitionType]:
+    """
+    Composes the per-transition dictionary view of a ``(n_input_states, n_output_states)`` transition probability
+    amplitude matrix, iterating over the output states for each input state.
+
+    Args:
+        transition_probability_amplitudes (ArrayTypes): The transition probability amplitude matrix.
+        input_fock_states (list): The list of input Fock states.
+        output_fock_states (list): The list of output Fock states.
+
     Returns:
         dict[int, FockStatePhaseTransitionType]: The dictionary of the Fock state phase transition type.
     """
     i = 0
     circuit_transition_probability_data_i = dict()
-    for input_fock_state in input_fock_states:
-        for output_fock_state in output_fock_states:
-            fock_transition_probability_amplitude_i = (
-                fock_transition_probability_amplitude(
-                    initial_fock_state=input_fock_state,
-                    final_fock_state=output_fock_state,
-                    unitary_matrix=unitary_matrix,
-                )
-            )
+    for input_index, input_fock_state in enumerate(input_fock_states):
+        for output_index, output_fock_state in enumerate(output_fock_states):
             data = {
                 "input_fock_state": input_fock_state,
                 "output_fock_state": output_fock_state,
-                "fock_transition_probability_amplitude": fock_transition_probability_amplitude_i,
+                "fock_transition_probability_amplitude": transition_probability_amplitudes[
+                    input_index, output_index
+                ],
             }
             circuit_transition_probability_data_i[i] = data
             i += 1
     return circuit_transition_probability_data_i
 
 
+def compose_fock_state_matrix(
+    fock_states: list[ArrayTypes],
+) -> ArrayTypes:
+    """
+    Stacks a list of Fock states into a ``(n_modes, n_states)`` matrix in which each column is a Fock state, so that
+    a unitary can be applied to all the states in a single matrix product.
+
+    Args:
+        fock_states (list): The list of Fock states.
+
+    Returns:
+        jnp.ndarray: The Fock state matrix.
+    """
+    return jnp.concatenate(
+        [jnp.reshape(jnp.asarray(fock_state), (-1, 1)) for fock_state in fock_states],
+        axis=1,
+    )
+
+
+def calculate_classical_transition_probability_amplitude_matrix(
+    unitary_matrix: ArrayTypes,
+    input_fock_states: list[ArrayTypes],
+    target_mode_index: Optional[int] = None,
+) -> dict[str, ArrayTypes | None]:
+    """
+    This tells us the classical transition probabilities of all the input states for one or a stack of implemented
+    s-parameter transformations at once, by computing :math:`|U S|` where each column of :math:`S` is an input state.
+
+    Args:
+        unitary_matrix (jnp.ndarray): The ``(n_out, n_in)`` unitary matrix or a ``(..., n_out, n_in)`` stack.
+        input_fock_states (list): The list of input Fock states.
+        target_mode_index (int): The target mode index.
+
+    Returns:
+        dict: The ``(..., n_out, n_states)`` ``mode_transformation`` and ``classical_transition_mode_probability``
+        arrays, and the ``(..., n_states)`` ``classical_transition_target_mode_probability`` array, which is None
+        if no ``target_mode_index`` is provided.
+    """
+    mode_transformation = jnp.asarray(unitary_matrix) @ compose_fock_state_matrix(
+        input_fock_states
+    )
+    classical_transition_mode_probability = jnp.abs(
+        mode_transformation
+    )  # Assuming probabilities are the squares of the amplitudes TODO recheck
+
+    classical_transition_target_mode_probability = None
+    if target_mode_index is not None:
+        classical_transition_target_mode_probability = (
+            classical_transition_mode_probability[..., target_mode_index, :]
+        )
+
+    return {
+        "mode_transformation": mode_transformation,
+        "classical_transition_mode_probability": classical_transition_mode_probability,
+        "classical_transition_target_mode_probability": classical_transition_target_mode_probability,
+    }
+
+
 def calculate_classical_transition_probability_amplitudes(
     unitary_matrix: ArrayTypes,
     input_fock_states: list[ArrayTypes],
@@ -157,6 +447,9 @@ def calculate_classical_transition_probability_amplitudes(
     the provided files and return the target mode and append the relevant probability files to the files dictionary. It will
     raise an error if no method is implemented.
 
+    The probabilities are computed for all the states at once with
+    ``calculate_classical_transition_probability_amplitude_matrix`` and this dictionary is a per-state view of it.
+
     Args:
         unitary_matrix (jnp.ndarray): The unitary matrix.
         input_fock_states (list): The list of input Fock states.
@@ -166,52 +459,74 @@ def calculate_classical_transition_probability_amplitudes(
     Returns:
         dict: The dictionary of the circuit transition probability files.
     """
-    circuit_transition_probability_data = {}
-
-    for i, input_fock_state in enumerate(input_fock_states):
-        mode_transformation = jnp.dot(unitary_matrix, input_fock_state)
-        classical_transition_mode_probability = jnp.abs(
-            mode_transformation
-        )  # Assuming probabilities are the squares of the amplitudes TODO recheck
-
-        if target_mode_index is not None:
-            if (
-                isinstance(
-                    classical_transition_mode_probability[target_mode_index],
-                    jnp.ndarray,
-                )
-                and classical_transition_mode_probability[target_mode_index].ndim == 1
-            ):
-                classical_transition_target_mode_probability = (
-                    classical_transition_mode_probability[target_mode_index].item()
-                )
-            else:
-                classical_transition_target_mode_probability = float(
-                    classical_transition_mode_probability[target_mode_index]
-                )
-        elif determine_ideal_mode_function is not None:
-            # Determine the ideal mode function and append the relevant probability files to the files dictionary
-            target_mode_index = determine_ideal_mode_function(mode_transformation)
-            classical_transition_target_mode_probability = (
-                classical_transition_mode_probability[target_mode_index]
-            )
-        else:
-            classical_transition_target_mode_probability = None
-            print(
-                ValueError(
-                    "No target mode index provided and no method to determine it. Will continue."
-                )
+    if (
+        target_mode_index is None
+        and determine_ideal_mode_function is not None
+        and len(input_fock_states) > 0
+    ):
+        # Determine the ideal mode from the first input state transformation
+        target_mode_index = determine_ideal_mode_function(
+            jnp.dot(unitary_matrix, input_fock_states[0])
+        )
+    elif target_mode_index is None:
+        print(
+            ValueError(
+                "No target mode index provided and no method to determine it. Will continue."
             )
-            pass
+        )
+
+    classical_transitions = calculate_classical_transition_probability_amplitude_matrix(
+        unitary_matrix=unitary_matrix,
+        input_fock_states=input_fock_states,
+        target_mode_index=target_mode_index,
+    )
+    return compose_classical_transition_probability_data(
+        classical_transitions=classical_transitions,
+        input_fock_states=input_fock_states,
+        unitary_matrix=unitary_matrix,
+    )
+
+
+def compose_classical_transition_probability_data(
+    classical_transitions: dict[str, ArrayTypes | None],
+    input_fock_states: list[ArrayTypes],
+    unitary_matrix: ArrayTypes,
+) -> dict:
+    """
+    Composes the per-state dictionary view of the classical transitions of a single unitary as returned by
+    ``calculate_classical_transition_probability_amplitude_matrix``.
+
+    Args:
+        classical_transitions (dict): The classical transition arrays of a single unitary.
+        input_fock_states (list): The list of input Fock states.
+        unitary_matrix (jnp.ndarray): The unitary matrix.
+
+    Returns:
+        dict: The dictionary of the circuit transition probability files.
+    """
+    mode_transformation = classical_transitions["mode_transformation"]
+    classical_transition_mode_probability = classical_transitions[
+        "classical_transition_mode_probability"
+    ]
+    classical_transition_target_mode_probability = classical_transitions[
+        "classical_transition_target_mode_probability"
+    ]
 
+    circuit_transition_probability_data = {}
+    for i, input_fock_state in enumerate(input_fock_states):
         data = {
             "input_fock_state": input_fock_state,
-            "mode_transformation": mode_transformation,
-            "classical_transition_mode_probability": classical_transition_mode_probability,
-            "classical_transition_target_mode_probability": classical_transition_target_mode_probability,
+            "mode_transformation": mode_transformation[:, i : i + 1],
+            "classical_transition_mode_probability": classical_transition_mode_probability[
+                :, i : i + 1
+            ],
+            "classical_transition_target_mode_probability": float(
+                classical_transition_target_mode_probability[i]
+            )
+            if classical_transition_target_mode_probability is not None
+            else None,
             "unitary_matrix": unitary_matrix,
         }
-
         circuit_transition_probability_data[i] = data
 
     return circuit_transition_probability_data
@@ -238,17 +553,58 @@ def construct_unitary_transition_probability_performance(
     implemented_unitary_probability_dictionary = dict()
     for id_i, circuit_unitaries_i in unitary_phase_implementations_dictionary.items():
         implemented_unitary_probability_dictionary[id_i] = dict()
-        for id_i_i, implemented_unitaries_i in circuit_unitaries_i.items():
-            implemented_unitary_probability_dictionary[id_i][
-                id_i_i
-            ] = calculate_all_transition_probability_amplitudes(
-                unitary_matrix=implemented_unitaries_i[0],
+        if len(circuit_unitaries_i) == 0:
+            continue
+        transition_probability_amplitudes_i = (
+            construct_unitary_transition_probability_amplitude_matrices(
+                unitary_matrices=jnp.stack(
+                    [
+                        implemented_unitaries_i[0]
+                        for implemented_unitaries_i in circuit_unitaries_i.values()
+                    ]
+                ),
                 input_fock_states=input_fock_states,
                 output_fock_states=output_fock_states,
             )
+        )
+        for unitary_index, id_i_i in enumerate(circuit_unitaries_i.keys()):
+            implemented_unitary_probability_dictionary[id_i][id_i_i] = (
+                compose_transition_probability_amplitudes_data(
+                    transition_probability_amplitudes=transition_probability_amplitudes_i[
+                        unitary_index
+                    ],
+                    input_fock_states=input_fock_states,
+                    output_fock_states=output_fock_states,
+                )
+            )
     return implemented_unitary_probability_dictionary
 
 
+def construct_unitary_transition_probability_amplitude_matrices(
+    unitary_matrices: ArrayTypes,
+    input_fock_states: list,
+    output_fock_states: list,
+) -> ArrayTypes:
+    """
+    This function determines the Fock state transition probability amplitudes for a stack of implemented unitaries,
+    such as the ``(n_configs, n_out, n_in)`` tensor returned by ``calculate_switch_unitaries_batched``. The Fock state
+    basis tables and the subunitary selections are only composed once for all the unitaries.
+
+    Args:
+        unitary_matrices (ArrayTypes): The stack of implemented unitaries.
+        input_fock_states (list): The list of input Fock states.
+        output_fock_states (list): The list of output Fock states.
+
+    Returns:
+        ArrayTypes: The ``(n_unitaries, n_input_states, n_output_states)`` transition probability amplitudes.
+    """
+    return fock_transition_probability_amplitude_matrix(
+        unitary_matrices=unitary_matrices,
+        input_fock_states=input_fock_states,
+        output_fock_states=output_fock_states,
+    )
+
+
 def compose_network_matrix_from_models(
     circuit_component: PhotonicCircuitComponent,
     models: dict,
@@ -256,6 +612,8 @@ def compose_network_matrix_from_models(
     top_level_instance_prefix: str = "component_lattice_generic",
     target_component_prefix: str = "mzi",
     netlist_function: Optional[Callable] = None,
+    circuit_cache: Optional[SaxCircuitCache] = None,
+    chunk_size: int = 1024,
     **kwargs,
 ):
     """
@@ -263,6 +621,12 @@ def compose_network_matrix_from_models(
     composing the switch functions, then composing the switch matrix, then composing the network matrix. It returns
     the network matrix and the switch matrix.
 
+    The netlist and the compiled circuit are retrieved through ``circuit_cache``. If no cache is provided, a cache
+    local to this call is used so that the component is only netlisted once. The phase configurations of the switches
+    are evaluated ``chunk_size`` at a time, which bounds the circuit evaluation memory, but every configuration is
+    still returned, so the returned dictionaries hold ``len(switch_states) ** switch_amount`` entries. Use
+    ``stream_network_matrix_from_models`` to process the configurations without holding them all in memory.
+
     Args:
         circuit_component (gf.Component): The circuit.
         models (dict): The models dictionary.
@@ -270,10 +634,15 @@ def compose_network_matrix_from_models(
         top_level_instance_prefix (str): The top level instance prefix.
         target_component_prefix (str): The target component prefix.
         netlist_function (Optional[Callable]): The netlist function.
+        circuit_cache (Optional[SaxCircuitCache]): The netlist and compiled circuit cache.
+        chunk_size (int): The maximum amount of phase configurations evaluated at once. Defaults to 1024.
 
     Returns:
         network_matrix (np.ndarray): The network matrix.
     """
+    if circuit_cache is None:
+        circuit_cache = SaxCircuitCache()
+
     # Compose the netlists as functions
     (
         switch_fabric_circuit,
@@ -282,11 +651,12 @@ def compose_network_matrix_from_models(
         circuit=circuit_component,
         models=models,
         netlist_function=netlist_function,
+        circuit_cache=circuit_cache,
     )
 
     if netlist_function is None:
         # Generate the netlist recursively
-        netlist = circuit_component.get_netlist_recursive(allow_multiple=True)
+        netlist = circuit_cache.get_netlist(component=circuit_component)
 
         switch_instance_list_i = get_matched_model_recursive_netlist_instances(
             recursive_netlist=netlist,
@@ -295,29 +665,42 @@ def compose_network_matrix_from_models(
             models=models,
         )
 
-        # Compute corresponding phases onto each switch and determine the output
+        # Compute corresponding phases onto each switch and determine the output chunk by chunk, so that only
+        # ``chunk_size`` configurations are evaluated by the circuit at once.
         switch_fabric_switch_phase_configurations = dict()
-        switch_amount = len(switch_instance_list_i)
-        switch_instance_valid_phase_configurations_i = []
-        for phase_configuration_i in product(switch_states, repeat=switch_amount):
-            switch_instance_valid_phase_configurations_i.append(phase_configuration_i)
-
-        # Apply corresponding phases onto switches
-        switch_fabric_switch_phase_address_state = compose_phase_address_state(
-            switch_instance_map=switch_instance_list_i,
-            switch_phase_permutation_map=switch_instance_valid_phase_configurations_i,
-        )
-
-        switch_fabric_switch_function_parameter_state = (
-            compose_switch_function_parameter_state(
-                switch_phase_address_state=switch_fabric_switch_phase_address_state
+        switch_fabric_switch_phase_address_state = dict()
+        switch_fabric_switch_function_parameter_state = dict()
+        switch_fabric_switch_unitaries = dict()
+        configuration_offset = 0
+        for phase_configurations_chunk in compose_phase_configuration_chunks(
+            switch_states=switch_states,
+            switch_amount=len(switch_instance_list_i),
+            chunk_size=chunk_size,
+        ):
+            # Apply corresponding phases onto switches
+            phase_address_state_chunk = compose_phase_address_state(
+                switch_instance_map=switch_instance_list_i,
+                switch_phase_permutation_map=phase_configurations_chunk,
             )
-        )
-
-        switch_fabric_switch_unitaries = calculate_switch_unitaries(
-            circuit=switch_fabric_circuit,
-            switch_function_parameter_state=switch_fabric_switch_function_parameter_state,
-        )
+            function_parameter_state_chunk = compose_switch_function_parameter_state(
+                switch_phase_address_state=phase_address_state_chunk
+            )
+            unitaries_chunk, ports_order = calculate_switch_unitaries_batched(
+                circuit=switch_fabric_circuit,
+                switch_function_parameter_state=function_parameter_state_chunk,
+            )
+            for id_i in range(len(phase_configurations_chunk)):
+                switch_fabric_switch_phase_address_state[
+                    configuration_offset + id_i
+                ] = phase_address_state_chunk[id_i]
+                switch_fabric_switch_function_parameter_state[
+                    configuration_offset + id_i
+                ] = function_parameter_state_chunk[id_i]
+                switch_fabric_switch_unitaries[configuration_offset + id_i] = (
+                    unitaries_chunk[id_i],
+                    ports_order,
+                )
+            configuration_offset += len(phase_configurations_chunk)
 
     else:
         # TODO fix this hack.
@@ -325,20 +708,27 @@ def compose_network_matrix_from_models(
         switch_fabric_switch_phase_address_state = list()
         switch_fabric_switch_phase_configurations = dict()
         switch_instance_list_i = list()
-        switch_fabric_switch_unitaries = dict()
 
         id_i = 0
         # TODO check this
         for switch_state_i in switch_states:
-            switch_fabric_switch_unitaries[id_i] = sax_to_s_parameters_standard_matrix(
-                switch_fabric_circuit(sxt={"active_phase_rad": switch_state_i}),
-                input_ports_order=("o2", "o1"),
-            )
+            switch_fabric_switch_function_parameter_state[id_i] = {
+                "sxt": {"active_phase_rad": switch_state_i}
+            }
             switch_fabric_switch_phase_address_state.append(
                 {"active_phase_rad": switch_state_i}
             )
             id_i += 1
 
+        unitaries, ports_order = calculate_switch_unitaries_batched(
+            circuit=switch_fabric_circuit,
+            switch_function_parameter_state=switch_fabric_switch_function_parameter_state,
+            input_ports_order=("o2", "o1"),
+        )
+        switch_fabric_switch_unitaries = {
+            id_i: (unitaries[id_i], ports_order) for id_i in range(len(unitaries))
+        }
+
     return (
         switch_fabric_switch_unitaries,
         switch_fabric_switch_function_parameter_state,
@@ -350,6 +740,72 @@ def compose_network_matrix_from_models(
     )
 
 
+def stream_network_matrix_from_models(
+    circuit_component: PhotonicCircuitComponent,
+    models: dict,
+    switch_states: list,
+    top_level_instance_prefix: str = "component_lattice_generic",
+    target_component_prefix: str = "mzi",
+    circuit_cache: Optional[SaxCircuitCache] = None,
+    chunk_size: int = 1024,
+) -> Iterator[tuple[dict, ArrayTypes, PortsTuple]]:
+    """
+    This function is the streaming counterpart of ``compose_network_matrix_from_models``. It composes the circuit and
+    the switch instances of the ``circuit_component`` in the same way, but yields the switch unitaries chunk by chunk
+    rather than returning every phase configuration, so the memory usage is bounded by ``chunk_size`` rather than by
+    ``len(switch_states) ** switch_amount``. The configuration ids match the keys returned by
+    ``compose_network_matrix_from_models``.
+
+    Args:
+        circuit_component (gf.Component): The circuit.
+        models (dict): The models dictionary.
+        switch_states (list): The list of switch states.
+        top_level_instance_prefix (str): The top level instance prefix.
+        target_component_prefix (str): The target component prefix.
+        circuit_cache (Optional[SaxCircuitCache]): The netlist and compiled circuit cache.
+        chunk_size (int): The maximum amount of phase configurations evaluated at once. Defaults to 1024.
+
+    Yields:
+        tuple: The chunk phase address state keyed by the configuration id, the ``(chunk_size, n_out, n_in)`` unitary
+        tensor and the ports order.
+    """
+    if circuit_cache is None:
+        circuit_cache = SaxCircuitCache()
+
+    switch_fabric_circuit, _ = generate_s_parameter_circuit_from_photonic_circuit(
+        circuit=circuit_component,
+        models=models,
+        circuit_cache=circuit_cache,
+    )
+    switch_instance_list_i = get_matched_model_recursive_netlist_instances(
+        recursive_netlist=circuit_cache.get_netlist(component=circuit_component),
+        top_level_instance_prefix=top_level_instance_prefix,
+        target_component_prefix=target_component_prefix,
+        models=models,
+    )
+
+    configuration_offset = 0
+    for phase_configurations_chunk, unitaries, ports_order in stream_switch_unitaries(
+        circuit=switch_fabric_circuit,
+        switch_instance_list=switch_instance_list_i,
+        switch_states=switch_states,
+        chunk_size=chunk_size,
+    ):
+        phase_address_state_chunk = compose_phase_address_state(
+            switch_instance_map=switch_instance_list_i,
+            switch_phase_permutation_map=phase_configurations_chunk,
+        )
+        yield (
+            {
+                configuration_offset + id_i: phase_address_state_i
+                for id_i, phase_address_state_i in phase_address_state_chunk.items()
+            },
+            unitaries,
+            ports_order,
+        )
+        configuration_offset += len(phase_configurations_chunk)
+
+
 def extract_phase_from_fock_state_transitions(
     optical_state_transitions: OpticalStateTransitions,
     transition_type: PhaseTransitionTypes = "cross",
@@ -441,14 +897,28 @@ def generate_s_parameter_circuit_from_photonic_circuit(
     circuit: gf.Component,
     models: sax.ModelFactory = None,
     netlist_function: Optional[Callable] = None,
+    circuit_cache: Optional[SaxCircuitCache] = None,
+    cache_passive_subcircuits: bool = False,
+    backend: Optional[str] = None,
 ) -> tuple[any, any]:
     """
     Generates the S-parameters and related information for a given circuit using SAX and custom models.
 
+    If ``cache_passive_subcircuits`` is set, the circuit is composed with ``compose_passive_cached_circuit``, so the
+    passive part of every repeated cell is evaluated once and shared by all its instances, eg. the ``mzi`` instances
+    of a lattice, which then only vary through their active phase. This speeds up repeated circuit evaluations at the
+    expense of a longer first compilation.
+
     Args:
         circuit (gf.Component): The circuit for which the S-parameters are to be generated.
         models (sax.ModelFactory, optional): The models to be used for the S-parameter generation. Defaults to None.
         netlist_function (Callable, optional): The function to generate the netlist. Defaults to None.
+        circuit_cache (SaxCircuitCache, optional): The cache to retrieve the netlist and the compiled circuit
+            from. Defaults to None, in which case nothing is cached.
+        cache_passive_subcircuits (bool): Whether to evaluate the passive part of every repeated cell once, rather
+            than composing the circuit with ``sax.circuit``. Defaults to False.
+        backend (Optional[str]): The ``sax`` circuit backend, used with and without ``cache_passive_subcircuits``.
+            Defaults to None, in which case the default backend of ``sax.circuit`` is used.
 
     Returns:
         tuple[any, any]: The S-parameters circuit and related information.
@@ -457,19 +927,41 @@ def generate_s_parameter_circuit_from_photonic_circuit(
     if models is None:
         models = get_default_models()
 
-    if netlist_function is None:
+    if circuit_cache is not None:
+        netlist = circuit_cache.get_netlist(
+            component=circuit, netlist_function=netlist_function
+        )
+    elif netlist_function is None:
         # Step 2: Generate the netlist recursively
         netlist = circuit.get_netlist_recursive(allow_multiple=True)
     else:
         netlist = netlist_function(circuit)
 
+    circuit_kwargs = {"ignore_missing_ports": True}
+    if backend is not None:
+        circuit_kwargs["backend"] = backend
+
     try:
         # Step 7: Compute the S-parameters using the custom library and netlist
-        s_parameters, s_parameters_info = sax.circuit(
-            netlist=netlist,
-            models=models,
-            ignore_missing_ports=True,
-        )
+        if circuit_cache is not None:
+            s_parameters, s_parameters_info = circuit_cache.get_circuit(
+                netlist=netlist,
+                models=models,
+                cache_passive_subcircuits=cache_passive_subcircuits,
+                **circuit_kwargs,
+            )
+        elif cache_passive_subcircuits:
+            s_parameters, s_parameters_info = compose_passive_cached_circuit(
+                netlist=netlist,
+                models=models,
+                **circuit_kwargs,
+            )
+        else:
+            s_parameters, s_parameters_info = sax.circuit(
+                netlist=netlist,
+                models=models,
+                **circuit_kwargs,
+            )
     except Exception as e:
         """
         Custom exception mapping.
@@ -559,7 +1051,6 @@ def get_state_phase_transitions(
             output_type="jax",
         )
 
-    output_states = list()
 
     _ = (
         circuit_unitaries,
@@ -577,42 +1068,90 @@ def get_state_phase_transitions(
         **kwargs,
     )
 
-    id_i = 0
-    for unitary_i, _ in circuit_unitaries.values():
-        data_i = calculate_classical_transition_probability_amplitudes(
-            unitary_matrix=unitary_i,
-            input_fock_states=input_fock_states,
-            target_mode_index=target_mode_index,
-            determine_ideal_mode_function=determine_ideal_mode_function,
+    circuit_unitaries_tensor = jnp.stack(
+        [unitary_i for unitary_i, _ in circuit_unitaries.values()]
+    )
+
+    if target_mode_index is None and determine_ideal_mode_function is None:
+        print(
+            ValueError(
+                "No target mode index provided and no method to determine it. Will continue."
+            )
         )
 
-        for id_i_i, _ in data_i.items():
-            output_state_i = format_electro_optic_fock_transition(
-                switch_state_array=extract_phase_tuple_from_phase_address_state(
-                    circuit_phase_address_state[id_i]
-                ),
-                input_fock_state_array=data_i[id_i_i]["input_fock_state"],
-                raw_output_state=data_i[id_i_i][
-                    "classical_transition_mode_probability"
-                ],
-                target_mode_output=int(
-                    data_i[id_i_i]["classical_transition_target_mode_probability"]
-                )
-                if data_i[id_i_i]["classical_transition_target_mode_probability"]
-                is not None
-                else None,  # set if available otherwise None,
-                raw_output=data_i[id_i_i]["classical_transition_mode_probability"]
-                if data_i[id_i_i]["classical_transition_mode_probability"] is not None
-                else None,
-                unitary=unitary_i,
+    classical_transitions = calculate_classical_transition_probability_amplitude_matrix(
+        unitary_matrix=circuit_unitaries_tensor,
+        input_fock_states=input_fock_states,
+        target_mode_index=target_mode_index,
+    )
+    # Index host arrays rather than dispatching a device slice per transition.
+    mode_transformations = np.asarray(classical_transitions["mode_transformation"])
+    mode_probabilities = np.asarray(
+        classical_transitions["classical_transition_mode_probability"]
+    )
+    target_mode_probabilities = classical_transitions[
+        "classical_transition_target_mode_probability"
+    ]
+    if target_mode_probabilities is not None:
+        target_mode_probabilities = np.asarray(target_mode_probabilities)
+
+    input_fock_state_table = np.asarray(
+        compose_fock_state_matrix(input_fock_states)
+    ).T.astype(int)
+    configuration_amount = mode_probabilities.shape[0]
+    input_state_amount = input_fock_state_table.shape[0]
+
+    phase_table = np.asarray(
+        [
+            extract_phase_tuple_from_phase_address_state(
+                circuit_phase_address_state[id_i]
             )
-            output_states.append(output_state_i)
-        id_i += 1
+            for id_i in range(configuration_amount)
+        ]
+    )
+
+    if target_mode_probabilities is None and determine_ideal_mode_function is not None:
+        # Determine the ideal mode from the first input state transformation of each unitary
+        target_mode_probabilities = np.stack(
+            [
+                mode_probabilities[
+                    id_i,
+                    determine_ideal_mode_function(mode_transformations[id_i, :, 0:1]),
+                    :,
+                ]
+                for id_i in range(configuration_amount)
+            ]
+        )
+
+    # Transitions are ordered by phase configuration, then by input state. The unitaries are stored once per
+    # configuration and referenced through the configuration index.
+    configuration_index_array = np.repeat(
+        np.arange(configuration_amount), input_state_amount
+    )
+    raw_output_array = np.swapaxes(mode_probabilities, 1, 2).reshape(
+        configuration_amount * input_state_amount, -1
+    )
+    output_fock_state_array = np.asarray(
+        absolute_to_threshold(raw_output_array, output_array_type="numpy")
+    )
+    target_mode_output_array = None
+    if target_mode_probabilities is not None:
+        target_mode_output_array = (
+            np.asarray(target_mode_probabilities).astype(int).reshape(-1)
+        )
 
     output_optical_state_transitions = OpticalStateTransitions(
         mode_amount=mode_amount,
         target_mode_index=target_mode_index,
-        transmission_data=output_states,
+        phase_array=phase_table[configuration_index_array],
+        input_fock_state_array=np.tile(
+            input_fock_state_table, (configuration_amount, 1)
+        ),
+        output_fock_state_array=output_fock_state_array,
+        target_mode_output_array=target_mode_output_array,
+        raw_output_array=raw_output_array,
+        configuration_index_array=configuration_index_array,
+        unitary_array=np.asarray(circuit_unitaries_tensor),
     )
 
     return output_optical_state_transitions
@@ -668,3 +1207,201 @@ def get_state_to_phase_map(
         state_phase_transition_list, transition_type="bar"
     )
     return bar_phase, cross_phase
+
+
+def calculate_target_mode_transmission(
+    unitary_matrix: ArrayTypes,
+    input_fock_state_matrix: ArrayTypes,
+    output_fock_state_matrix: ArrayTypes,
+) -> ArrayTypes:
+    """
+    Returns the classical fraction of the input power that is transmitted into the occupied modes of the target
+    output states, :math:`\\sum_{j \\in out} |(U s)_j|^2 / \\sum_i |s_i|^2`. For single-photon states, this is the
+    transition probability between the input and the output modes.
+
+    Args:
+        unitary_matrix (ArrayTypes): The ``(..., n_out, n_in)`` unitaries.
+        input_fock_state_matrix (ArrayTypes): The ``(..., n_in)`` input Fock states.
+        output_fock_state_matrix (ArrayTypes): The ``(..., n_out)`` target output Fock states.
+
+    Returns:
+        ArrayTypes: The ``(...)`` target mode transmissions.
+    """
+    input_fock_state_matrix = jnp.asarray(input_fock_state_matrix)
+    output_field = jnp.einsum(
+        "...oi,...i->...o", unitary_matrix, input_fock_state_matrix
+    )
+    output_power = jnp.abs(output_field) ** 2
+    target_power = jnp.sum(
+        jnp.where(jnp.asarray(output_fock_state_matrix) > 0, output_power, 0), axis=-1
+    )
+    return target_power / jnp.sum(jnp.abs(input_fock_state_matrix) ** 2, axis=-1)
+
+
+def solve_transition_phases(
+    unitary_function: Callable,
+    switch_amount: int,
+    target_transition_list: list[tuple[ArrayTypes, ArrayTypes]],
+    start_amount: int = 8,
+    iteration_amount: int = 200,
+    learning_rate: float = 0.1,
+    tolerance: float = 1e-8,
+    initial_phases: Optional[ArrayTypes] = None,
+    seed: int = 0,
+) -> list[dict]:
+    """
+    Solves, for each requested ``(input_fock_state, output_fock_state)`` transition, the switch phases that maximize
+    the target mode transmission (see ``calculate_target_mode_transmission``) with gradient ascent, rather than
+    enumerating a discrete list of switch states. All the transitions and all the starts of the multi-start search are
+    optimized together as a single batch of shape ``(n_transitions, start_amount, switch_amount)``, using the Adam
+    update rule. The gradients are composed from one forward-mode ``jax.jvp`` per switch over the whole batch, which
+    supports the ``sax`` circuits whose solvers do not support reverse-mode or vectorized differentiation.
+
+    The ``unitary_function`` maps ``(..., switch_amount)`` phases to ``(..., n_out, n_in)`` unitaries. It can be
+    composed from a ``sax`` circuit with ``compose_switch_phase_unitary_function``, or from an ideal lattice with
+    ``compose_lattice_unitary_function``.
+
+    .. code-block:: python
+
+        unitary_function, _ = compose_switch_phase_unitary_function(
+            circuit=circuit, switch_instance_list=switch_instance_list
+        )
+        solutions = solve_transition_phases(
+            unitary_function=unitary_function,
+            switch_amount=len(switch_instance_list),
+            target_transition_list=[((1, 0, 0), (0, 0, 1))],
+        )
+        solutions[0]["phase"], solutions[0]["transmission"]
+
+    A start is converged when the increase of its transmission between iterations is below ``tolerance``, and the
+    optimization stops early once all the starts are converged.
+
+    Args:
+        unitary_function (Callable): The batched function from switch phases to unitaries.
+        switch_amount (int): The amount of switch phases.
+        target_transition_list (list[tuple]): The ``(input_fock_state, output_fock_state)`` transitions to solve.
+        start_amount (int): The amount of random starts per transition. Defaults to 8.
+        iteration_amount (int): The maximum amount of iterations. Defaults to 200.
+        learning_rate (float): The Adam learning rate. Defaults to 0.1.
+        tolerance (float): The transmission convergence tolerance. Defaults to 1e-8.
+        initial_phases (Optional[ArrayTypes]): The ``(start_amount, switch_amount)`` initial phases, shared by all
+            transitions. Defaults to uniformly random phases in :math:`[0, 2\\pi)`.
+        seed (int): The random initial phases seed. Defaults to 0.
+
+    Returns:
+        list[dict]: For each transition, the ``input_fock_state``, ``output_fock_state``, best ``phase`` wrapped
+        to :math:`[0, 2\\pi)`, its ``transmission``, the final ``start_transmissions`` of every start, the
+        ``iterations`` performed, whether the best start ``converged``, and the final ``gradient_norm`` of the best
+        start.
+    """
+    input_fock_state_matrix = jnp.asarray(
+        [
+            np.asarray(input_fock_state_i).reshape(-1)
+            for input_fock_state_i, _ in target_transition_list
+        ],
+        dtype=float,
+    )[:, None, :]
+    output_fock_state_matrix = jnp.asarray(
+        [
+            np.asarray(output_fock_state_i).reshape(-1)
+            for _, output_fock_state_i in target_transition_list
+        ],
+        dtype=float,
+    )[:, None, :]
+    transition_amount = len(target_transition_list)
+
+    if initial_phases is None:
+        initial_phases = jax.random.uniform(
+            jax.random.PRNGKey(seed),
+            (start_amount, switch_amount),
+            maxval=2 * jnp.pi,
+        )
+    initial_phases = jnp.asarray(initial_phases, dtype=float)
+    if initial_phases.shape != (start_amount, switch_amount):
+        raise ValueError(
+            f"Expected initial phases of shape {(start_amount, switch_amount)}, got {initial_phases.shape}."
+        )
+    phases = jnp.broadcast_to(
+        initial_phases, (transition_amount, start_amount, switch_amount)
+    )
+
+    def transmission_function(phases_i):
+        return calculate_target_mode_transmission(
+            unitary_matrix=unitary_function(phases_i),
+            input_fock_state_matrix=input_fock_state_matrix,
+            output_fock_state_matrix=output_fock_state_matrix,
+        )
+
+    switch_tangents = jnp.eye(switch_amount)
+
+    @jax.jit
+    def transmission_and_gradient(phases_i):
+        # Each switch tangent yields the derivative of every independent transmission in the batch.
+        transmission_i = transmission_function(phases_i)
+        gradient_i = jnp.stack(
+            [
+                jax.jvp(
+                    transmission_function,
+                    (phases_i,),
+                    (jnp.broadcast_to(switch_tangents[k], phases_i.shape),),
+                )[1]
+                for k in range(switch_amount)
+            ],
+            axis=-1,
+        )
+        return transmission_i, gradient_i
+
+    first_moment = jnp.zeros_like(phases)
+    second_moment = jnp.zeros_like(phases)
+    previous_transmission = jnp.full((transition_amount, start_amount), -jnp.inf)
+    converged = jnp.zeros((transition_amount, start_amount), dtype=bool)
+    beta_1, beta_2, epsilon = 0.9, 0.999, 1e-12
+    iteration_i = 0
+    for iteration_i in range(1, iteration_amount + 1):
+        transmission, gradient = transmission_and_gradient(phases)
+        converged = converged | (
+            jnp.abs(transmission - previous_transmission) < tolerance
+        )
+        if bool(jnp.all(converged)):
+            break
+        previous_transmission = transmission
+
+        first_moment = beta_1 * first_moment + (1 - beta_1) * gradient
+        second_moment = beta_2 * second_moment + (1 - beta_2) * gradient**2
+        step = (
+            learning_rate
+            * (first_moment / (1 - beta_1**iteration_i))
+            / (jnp.sqrt(second_moment / (1 - beta_2**iteration_i)) + epsilon)
+        )
+        # Converged starts are frozen, gradient ascent maximizes the transmission.
+        phases = phases + jnp.where(converged[..., None], 0, step)
+
+    transmission, gradient = transmission_and_gradient(phases)
+    best_start = np.asarray(jnp.argmax(transmission, axis=-1))
+    phases = np.asarray(jnp.mod(phases, 2 * jnp.pi))
+    transmission = np.asarray(transmission)
+    gradient_norm = np.asarray(jnp.linalg.norm(gradient, axis=-1))
+    converged = np.asarray(converged)
+
+    solution_list = list()
+    for transition_id_i, (input_fock_state_i, output_fock_state_i) in enumerate(
+        target_transition_list
+    ):
+        best_start_i = best_start[transition_id_i]
+        solution_list.append(
+            {
+                "input_fock_state": tuple(
+                    int(i) for i in np.asarray(input_fock_state_i).reshape(-1)
+                ),
+                "output_fock_state": tuple(
+                    int(i) for i in np.asarray(output_fock_state_i).reshape(-1)
+                ),
+                "phase": tuple(phases[transition_id_i, best_start_i].tolist()),
+                "transmission": float(transmission[transition_id_i, best_start_i]),
+                "start_transmissions": transmission[transition_id_i],
+                "iterations": iteration_i,
+                "converged": bool(converged[transition_id_i, best_start_i]),
+                "gradient_norm": float(gradient_norm[transition_id_i, best_start_i]),
+            }
+        )
+    return solution_list
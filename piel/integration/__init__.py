@@ -6,5 +6,9 @@ from .hdl21_gdsfactory import *  # TODO merge the two together
 from .cocotb_sax import *
 from .sax_thewalrus import *
 from .sax_qutip import *
-from .thewalrus_qutip import fock_transition_probability_amplitude
+from .thewalrus_qutip import (
+    fock_transition_probability_amplitude,
+    fock_transition_probability_amplitude_matrix,
+    fock_space_unitary_operator,
+)
 
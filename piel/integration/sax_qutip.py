@@ -1,6 +1,6 @@
 import qutip  # NOQA : F401
 import sax
-from ..tools.qutip.unitary import matrix_to_qutip_qobj
+from ..tools.qutip.unitary import matrix_to_qutip_qobj, verify_matrix_is_unitary
 from piel.tools.sax.utils import sax_to_s_parameters_standard_matrix
 
 __all__ = [
@@ -61,17 +61,20 @@ def sax_to_ideal_qutip_unitary(
 
 
 def verify_sax_model_is_unitary(
-    model: sax.SType, input_ports_order: tuple | None = None
+    model: sax.SType, input_ports_order: tuple | None = None, atol: float = 1e-6
 ) -> bool:
     """
-    Verify that the model is unitary.
+    Verify that the model is unitary within an elementwise tolerance, without constructing a ``qutip.Qobj``.
 
     Args:
         model (dict): The model to verify.
         input_ports_order (tuple | None): The order of the input ports. If None, the default order is used.
+        atol (float): The elementwise unitarity tolerance. Defaults to 1e-6.
 
     Returns:
         bool: True if the model is unitary, False otherwise.
     """
-    qobj = sax_to_ideal_qutip_unitary(model, input_ports_order=input_ports_order)
-    return qobj.check_isunitary()
+    s_parameters_standard_matrix, _ = sax_to_s_parameters_standard_matrix(
+        sax_input=model, input_ports_order=input_ports_order
+    )
+    return verify_matrix_is_unitary(s_parameters_standard_matrix, atol=atol)
@@ -1,8 +1,21 @@
 import jax.numpy as jnp
+import numpy as np
 import qutip
+from scipy.sparse import csr_matrix
+from scipy.special import factorial
+from typing import Literal
 
-from ..tools.thewalrus import unitary_permanent
+from ..tools.thewalrus import (
+    unitary_permanent,
+    unitary_permanent_batch,
+    unitary_permanent_repeated,
+    output_transition_amplitudes,
+)
 from ..tools.qutip import (
+    convert_qobj_to_jax,
+    fock_basis_from_photon_number,
+    fock_basis_size,
+    fock_state_rank,
     fock_state_nonzero_indexes,
     fock_state_to_photon_number_factorial,
     subunitary_selection_on_index,
@@ -34,6 +47,10 @@ def fock_transition_probability_amplitude(
     .. math ::
         a(\ket{f_1} \to \ket{f_2}) = \frac{\text{per}(U_{f_1}^{f_2})}{\sqrt{(j_1! j_2! ... j_N!)(j_1^{'}! j_2^{'}! ... j_N^{'}!)}}
 
+    When a mode is occupied by several photons, its row or column is repeated by its occupation in the subunitary.
+    Bunched transitions are computed with the multiplicity-aware ``unitary_permanent_repeated`` rather than by
+    expanding the subunitary, and transitions between states of different photon numbers have a zero amplitude.
+
     Args:
         initial_fock_state (qutip.Qobj | jnp.ndarray): The initial Fock state.
         final_fock_state (qutip.Qobj | jnp.ndarray): The final Fock state.
@@ -44,6 +61,11 @@ def fock_transition_probability_amplitude(
     """
     columns_indices = fock_state_nonzero_indexes(initial_fock_state)
     rows_indices = fock_state_nonzero_indexes(final_fock_state)
+    initial_fock_state_occupation, final_fock_state_occupation = (
+        compose_fock_state_table([initial_fock_state, final_fock_state])
+    )
+    if initial_fock_state_occupation.sum() != final_fock_state_occupation.sum():
+        return 0.0
 
     initial_fock_state_photon_number_factorial = fock_state_to_photon_number_factorial(
         initial_fock_state
@@ -58,10 +80,209 @@ def fock_transition_probability_amplitude(
         columns_index=columns_indices,
     )
 
-    transition_probability_amplitude = unitary_permanent(subunitary_selection)[0] / (
+    if (
+        initial_fock_state_photon_number_factorial == 1
+        and final_fock_state_photon_number_factorial == 1
+    ):
+        transition_permanent = unitary_permanent(subunitary_selection)[0]
+    else:
+        transition_permanent = unitary_permanent_repeated(
+            subunitary_selection,
+            rows_multiplicity=final_fock_state_occupation[list(rows_indices)],
+            columns_multiplicity=initial_fock_state_occupation[list(columns_indices)],
+        )
+
+    transition_probability_amplitude = transition_permanent / (
         jnp.sqrt(
             initial_fock_state_photon_number_factorial
             * final_fock_state_photon_number_factorial
         )
     )
     return transition_probability_amplitude
+
+
+def compose_fock_state_table(
+    fock_states: list[qutip.Qobj | jnp.ndarray],
+) -> np.ndarray:
+    """
+    Stacks a list of Fock states into a single integer array of shape ``(n_states, n_modes)``.
+
+    Args:
+        fock_states (list[qutip.Qobj | jnp.ndarray]): The list of Fock states.
+
+    Returns:
+        np.ndarray: The Fock state table.
+    """
+    fock_state_rows = list()
+    for fock_state in fock_states:
+        if isinstance(fock_state, qutip.Qobj):
+            fock_state = convert_qobj_to_jax(fock_state)
+        fock_state_rows.append(np.ravel(np.real(np.asarray(fock_state))))
+    return np.rint(np.array(fock_state_rows, dtype=float)).astype(int)
+
+
+def fock_transition_probability_amplitude_matrix(
+    unitary_matrices: jnp.ndarray,
+    input_fock_states: list[qutip.Qobj | jnp.ndarray],
+    output_fock_states: list[qutip.Qobj | jnp.ndarray],
+) -> np.ndarray:
+    """
+    Computes the transition probability amplitudes, as in ``fock_transition_probability_amplitude``, between every
+    input and output Fock state for one or a stack of unitaries at once.
+
+    The subunitary selection indexes, the occupation multiplicities and the photon number factorials of each Fock
+    state are computed once for the whole basis. Identical subunitary selections are deduplicated, so that each
+    distinct permanent is only computed once per unitary, and the permanents of all the selections that share the
+    same multiplicities are computed in a single batched call for all the unitaries. Selections without bunched modes
+    use ``unitary_permanent_batch``, and bunched selections use the multiplicity-aware
+    ``unitary_permanent_repeated``. Transitions between states of different photon numbers have zero amplitude.
+
+    Args:
+        unitary_matrices (jnp.ndarray): A unitary of shape ``(n, n)`` or a stack of unitaries of shape ``(..., n, n)``.
+        input_fock_states (list[qutip.Qobj | jnp.ndarray]): The list of input Fock states.
+        output_fock_states (list[qutip.Qobj | jnp.ndarray]): The list of output Fock states.
+
+    Returns:
+        np.ndarray: The amplitudes of shape ``(..., n_input_states, n_output_states)``.
+    """
+    unitary_matrices = np.asarray(unitary_matrices)
+    batch_shape = unitary_matrices.shape[:-2]
+    input_fock_state_table = compose_fock_state_table(input_fock_states)
+    output_fock_state_table = compose_fock_state_table(output_fock_states)
+
+    # The columns are selected from the input state and the rows from the output state, alongside their
+    # occupation multiplicities.
+    columns_selections = [
+        (tuple(np.flatnonzero(state)), tuple(state[np.flatnonzero(state)]))
+        for state in input_fock_state_table
+    ]
+    rows_selections = [
+        (tuple(np.flatnonzero(state)), tuple(state[np.flatnonzero(state)]))
+        for state in output_fock_state_table
+    ]
+    input_photon_amounts = input_fock_state_table.sum(axis=1)
+    output_photon_amounts = output_fock_state_table.sum(axis=1)
+    normalisation = np.sqrt(
+        np.prod(factorial(input_fock_state_table), axis=1)[:, None]
+        * np.prod(factorial(output_fock_state_table), axis=1)[None, :]
+    )
+
+    # Group the distinct subunitary selections by their multiplicities.
+    selection_transitions = dict()
+    for input_index, columns_selection in enumerate(columns_selections):
+        for output_index, rows_selection in enumerate(rows_selections):
+            if input_photon_amounts[input_index] != output_photon_amounts[output_index]:
+                continue
+            selection_transitions.setdefault(
+                (rows_selection, columns_selection), list()
+            ).append((input_index, output_index))
+
+    selections_by_multiplicity = dict()
+    for selection in selection_transitions:
+        (_, rows_multiplicity), (_, columns_multiplicity) = selection
+        selections_by_multiplicity.setdefault(
+            (rows_multiplicity, columns_multiplicity), list()
+        ).append(selection)
+
+    permanents = np.zeros(
+        (*batch_shape, len(input_fock_state_table), len(output_fock_state_table)),
+        dtype=complex,
+    )
+    for (
+        rows_multiplicity,
+        columns_multiplicity,
+    ), selections in selections_by_multiplicity.items():
+        rows = np.array(
+            [selection[0][0] for selection in selections], dtype=int
+        ).reshape(len(selections), len(rows_multiplicity))
+        columns = np.array(
+            [selection[1][0] for selection in selections], dtype=int
+        ).reshape(len(selections), len(columns_multiplicity))
+        subunitaries = unitary_matrices[..., rows[:, :, None], columns[:, None, :]]
+        if all(multiplicity == 1 for multiplicity in rows_multiplicity) and all(
+            multiplicity == 1 for multiplicity in columns_multiplicity
+        ):
+            selection_permanents = unitary_permanent_batch(subunitaries)
+        else:
+            selection_permanents = unitary_permanent_repeated(
+                subunitaries,
+                rows_multiplicity=rows_multiplicity,
+                columns_multiplicity=columns_multiplicity,
+            )
+        for selection_index, selection in enumerate(selections):
+            input_indexes, output_indexes = zip(
+                *selection_transitions[selection], strict=True
+            )
+            permanents[..., input_indexes, output_indexes] = selection_permanents[
+                ..., selection_index, None
+            ]
+
+    return permanents / normalisation
+
+
+def fock_space_unitary_operator(
+    unitary_matrix: jnp.ndarray,
+    photon_amount: int,
+    output_type: Literal["scipy", "qutip"] = "scipy",
+    atol: float = 1e-12,
+) -> csr_matrix | qutip.Qobj:
+    """
+    Lifts a ``(M, M)`` mode unitary to its sparse operator on the ``photon_amount`` photon symmetric Fock space, so that
+    the evolution of a whole multi-photon state is a single sparse matrix-vector product.
+
+    The Fock space basis follows the ``fock_basis_from_photon_number`` ordering, and the element ``[j, i]`` of the
+    operator is the transition probability amplitude from the basis state ``i`` to the basis state ``j``. A photon in
+    an input mode can only reach the output modes its unitary column connects to, so each column of the operator is
+    only computed over the output states built from these reachable modes with ``output_transition_amplitudes``, and
+    the amplitudes below ``atol`` are dropped. The memory hence scales with the amount of nonzero transitions rather
+    than with the squared basis size.
+
+    Args:
+        unitary_matrix (jnp.ndarray): The ``(M, M)`` mode unitary.
+        photon_amount (int): The total amount of photons.
+        output_type (Literal["scipy", "qutip"]): Whether to return a ``scipy.sparse.csr_matrix`` or a sparse
+            ``qutip.Qobj``. Defaults to "scipy".
+        atol (float): The magnitude below which the unitary elements and amplitudes are treated as zero. Defaults to
+            1e-12.
+
+    Returns:
+        csr_matrix | qutip.Qobj: The ``(n_states, n_states)`` Fock space operator.
+    """
+    unitary_matrix = np.asarray(unitary_matrix, dtype=complex)
+    mode_amount = unitary_matrix.shape[0]
+    state_amount = fock_basis_size(mode_amount, photon_amount)
+
+    operator_rows, operator_columns, operator_data = list(), list(), list()
+    for input_rank, input_fock_state in enumerate(
+        fock_basis_from_photon_number(mode_amount, photon_amount)
+    ):
+        reachable_modes = np.flatnonzero(
+            np.any(np.abs(unitary_matrix[:, input_fock_state > 0]) > atol, axis=1)
+        )
+        reachable_fock_states = fock_basis_from_photon_number(
+            len(reachable_modes), photon_amount
+        )
+        output_fock_states = np.zeros(
+            (len(reachable_fock_states), mode_amount), dtype=int
+        )
+        output_fock_states[:, reachable_modes] = reachable_fock_states
+        _, amplitudes = output_transition_amplitudes(
+            unitary_matrix, input_fock_state, output_fock_states
+        )
+        nonzero_amplitudes = np.abs(amplitudes) > atol
+        operator_rows.append(fock_state_rank(output_fock_states[nonzero_amplitudes]))
+        operator_columns.append(
+            np.full(np.count_nonzero(nonzero_amplitudes), input_rank)
+        )
+        operator_data.append(amplitudes[nonzero_amplitudes])
+
+    operator = csr_matrix(
+        (
+            np.concatenate(operator_data),
+            (np.concatenate(operator_rows), np.concatenate(operator_columns)),
+        ),
+        shape=(state_amount, state_amount),
+    )
+    if output_type == "qutip":
+        return qutip.Qobj(operator)
+    return operator
@@ -1 +1,9 @@
 from .switch_lattice import compose_switch_position_list
+from .lattice_unitary import (
+    IncrementalLatticeUnitary,
+    calculate_lattice_unitary,
+    compose_lattice_element_list,
+    compose_lattice_unitary_function,
+    crossing_2x2_transfer_matrix,
+    ideal_mzi_2x2_transfer_matrix,
+)
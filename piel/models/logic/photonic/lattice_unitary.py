@@ -0,0 +1,506 @@
+"""
+This module implements the unitary of a switch lattice, as described by the ``network`` matrix of
+``component_lattice_generic``, as an ordered product of stages of embedded 2x2 transfer blocks. Each stage ``j``
+corresponds to ``network[j]``, and an element at ``network[j][i]`` couples the modes ``i`` and ``i + 1``.
+
+The 2x2 transfer blocks follow the ``component_lattice_generic`` routing, in which the ``o2`` and ``o1`` ports of an
+element connect to the modes ``i`` and ``i + 1`` at its input, and the ``o3`` and ``o4`` ports to the modes ``i`` and
+``i + 1`` at its output.
+"""
+
+from typing import Callable, Optional
+import jax
+import jax.numpy as jnp
+import numpy as np
+from .switch_lattice import compose_switch_position_list
+from ....types import ArrayTypes
+
+__all__ = [
+    "IncrementalLatticeUnitary",
+    "calculate_lattice_unitary",
+    "compose_lattice_element_list",
+    "compose_lattice_unitary_function",
+    "crossing_2x2_transfer_matrix",
+    "ideal_mzi_2x2_transfer_matrix",
+]
+
+crossing_2x2_transfer_matrix = np.array([[0, 1], [1, 0]], dtype=complex)
+"""
+crossing_2x2_transfer_matrix (np.ndarray): The transfer matrix of an ideal waveguide crossing between two modes.
+"""
+
+
+def ideal_mzi_2x2_transfer_matrix(phase: ArrayTypes) -> ArrayTypes:
+    """
+    Returns the 2x2 transfer matrix of an ideal lossless Mach-Zehnder interferometer with two 50:50 couplers and a
+    phase shifter on one arm. It matches the ``mzi2x2_2x2_phase_shifter`` component evaluated with the
+    ``optical_logic_verification`` models: it crosses at a phase of 0 and bars at a phase of :math:`\\pi`.
+
+    .. math::
+
+        T(\\phi) = \\frac{1}{2} \\begin{bmatrix}
+            1 - e^{-i\\phi} & i (1 + e^{-i\\phi}) \\\\
+            i (1 + e^{-i\\phi}) & -(1 - e^{-i\\phi}) \\\\
+        \\end{bmatrix}
+
+    The matrices are computed with ``jax.numpy`` for ``jax`` inputs, so that they can be traced and differentiated,
+    and with ``numpy`` otherwise, to avoid the dispatch overhead on small host arrays.
+
+    Args:
+        phase (ArrayTypes): The phase applied to the phase shifter, of any shape.
+
+    Returns:
+        ArrayTypes: The ``(..., 2, 2)`` transfer matrices.
+    """
+    array_module = jnp if isinstance(phase, jax.Array) else np
+    phasor = array_module.exp(-1j * array_module.asarray(phase))
+    bar = (1 - phasor) / 2
+    cross = 1j * (1 + phasor) / 2
+    return array_module.stack(
+        [
+            array_module.stack([bar, cross], axis=-1),
+            array_module.stack([cross, -bar], axis=-1),
+        ],
+        axis=-2,
+    )
+
+
+def compose_lattice_element_list(
+    network: ArrayTypes | list[list],
+    gap_elements: list = None,
+    cross_elements: list = None,
+) -> tuple[int, int, list[tuple[int, int]], list[tuple[int, int]]]:
+    """
+    Decomposes a lattice ``network`` matrix into the positions of its switches and of its crossings. Integer zeros
+    are treated as gap elements, so that the ``network`` of ``component_lattice_generic`` can be used directly.
+
+    Args:
+        network (ArrayTypes | list[list]): The network matrix, indexed as ``network[stage][mode]``.
+        gap_elements (list, optional): The gap elements in the network. Defaults to ``["0"]``.
+        cross_elements (list, optional): The cross elements in the network. Defaults to ``["-"]``.
+
+    Returns:
+        tuple: The amount of modes, the amount of stages, the ``(stage, mode)`` switch positions, and the
+        ``(stage, mode)`` crossing positions.
+    """
+    if cross_elements is None:
+        cross_elements = ["-"]
+    if gap_elements is None:
+        gap_elements = ["0"]
+
+    network = np.array(
+        [
+            [
+                value if isinstance(value, str) else ("0" if value == 0 else "X")
+                for value in stage
+            ]
+            for stage in network
+        ]
+    )
+    if network.ndim != 2:
+        raise AttributeError(
+            "Physical network dimensions don't work."
+            "Check the dimensional structure of your network matrix."
+        )
+
+    switch_position_list = [
+        position
+        for _, position in compose_switch_position_list(
+            network=network,
+            gap_elements=gap_elements,
+            cross_elements=cross_elements,
+        )
+    ]
+    crossing_position_list = [
+        (stage, mode)
+        for stage, stage_values in enumerate(network)
+        for mode, value in enumerate(stage_values)
+        if value == cross_elements[0]
+    ]
+    stage_amount, mode_amount = network.shape[0], network.shape[1] + 1
+    return mode_amount, stage_amount, switch_position_list, crossing_position_list
+
+
+class IncrementalLatticeUnitary:
+    """
+    Maintains the unitary of a switch lattice as an ordered product of stage transfer matrices
+    :math:`U = C_{J-1} \\cdots C_1 C_0`, so that changing the phase of a single switch in stage :math:`j` is a
+    rank-2 update :math:`U \\leftarrow U + S_{j+1}[:, i:i+2] \\, \\Delta T \\, P_j[i:i+2, :]` with the prefix
+    :math:`P_j = C_{j-1} \\cdots C_0` and the suffix :math:`S_{j+1} = C_{J-1} \\cdots C_{j+1}`, which costs
+    :math:`O(N^2)` rather than a full circuit evaluation.
+
+    The prefix and suffix products are cached and only the ones invalidated by an update are recomputed, one stage at
+    a time, when they are next required. Sweeping the switches in stage order, as in coordinate-descent calibration
+    loops, hence costs :math:`O(N^2)` per update. Rank-2 updates accumulate rounding errors, which ``refresh``
+    clears by recomputing the full product.
+
+    .. code-block:: python
+
+        lattice = IncrementalLatticeUnitary(network=[["X", 0], [0, "X"]])
+        lattice.set_switch_phase(0, np.pi)
+        lattice.unitary
+        # Evaluate candidate phases of a switch without committing them
+        candidates = lattice.evaluate_switch_phases(1, np.linspace(0, np.pi, 16))
+    """
+
+    def __init__(
+        self,
+        network: ArrayTypes | list[list],
+        switch_phases: Optional[ArrayTypes] = None,
+        switch_transfer_function: Callable = ideal_mzi_2x2_transfer_matrix,
+        gap_elements: list = None,
+        cross_elements: list = None,
+    ):
+        """
+        Args:
+            network (ArrayTypes | list[list]): The network matrix, indexed as ``network[stage][mode]``.
+            switch_phases (Optional[ArrayTypes]): The initial phase of each switch, in ``compose_switch_position_list``
+                order. Defaults to zeros.
+            switch_transfer_function (Callable): Maps an array of phases to their ``(..., 2, 2)`` switch transfer
+                matrices. Defaults to ``ideal_mzi_2x2_transfer_matrix``.
+            gap_elements (list, optional): The gap elements in the network. Defaults to ``["0"]``.
+            cross_elements (list, optional): The cross elements in the network. Defaults to ``["-"]``.
+        """
+        (
+            self.mode_amount,
+            self.stage_amount,
+            self.switch_position_list,
+            crossing_position_list,
+        ) = compose_lattice_element_list(
+            network=network,
+            gap_elements=gap_elements,
+            cross_elements=cross_elements,
+        )
+        self.switch_transfer_function = switch_transfer_function
+
+        # Fixed crossings are stored alongside the switch blocks, keyed by their stage and mode position.
+        self._blocks: dict[tuple[int, int], np.ndarray] = {
+            position: crossing_2x2_transfer_matrix
+            for position in crossing_position_list
+        }
+        self._stage_positions: list[list[tuple[int, int]]] = [
+            [] for _ in range(self.stage_amount)
+        ]
+        for position in sorted(
+            list(self._blocks.keys()) + list(self.switch_position_list)
+        ):
+            self._stage_positions[position[0]].append(position)
+
+        if switch_phases is None:
+            switch_phases = np.zeros(len(self.switch_position_list))
+        self.set_switch_phases(switch_phases)
+
+    @property
+    def unitary(self) -> np.ndarray:
+        """
+        Returns the current lattice unitary, with rows indexing the output modes and columns the input modes.
+
+        Returns:
+            np.ndarray: The ``(N, N)`` unitary.
+        """
+        return self._unitary.copy()
+
+    @property
+    def switch_phases(self) -> np.ndarray:
+        """
+        Returns the current phase of each switch, in ``compose_switch_position_list`` order.
+
+        Returns:
+            np.ndarray: The switch phases.
+        """
+        return self._switch_phases.copy()
+
+    def _switch_block(self, phase: float) -> np.ndarray:
+        return np.asarray(self.switch_transfer_function(phase), dtype=complex)
+
+    def _apply_stage_left(self, stage: int, matrix: np.ndarray) -> np.ndarray:
+        # Returns C_stage @ matrix by only mixing the rows of each block.
+        output = matrix.copy()
+        for position in self._stage_positions[stage]:
+            mode = position[1]
+            output[mode : mode + 2] = self._blocks[position] @ matrix[mode : mode + 2]
+        return output
+
+    def _apply_stage_right(self, matrix: np.ndarray, stage: int) -> np.ndarray:
+        # Returns matrix @ C_stage by only mixing the columns of each block.
+        output = matrix.copy()
+        for position in self._stage_positions[stage]:
+            mode = position[1]
+            output[:, mode : mode + 2] = (
+                matrix[:, mode : mode + 2] @ self._blocks[position]
+            )
+        return output
+
+    def _prefix_product(self, stage: int) -> np.ndarray:
+        for stage_i in range(self._prefix_valid, stage):
+            self._prefix[stage_i + 1] = self._apply_stage_left(
+                stage_i, self._prefix[stage_i]
+            )
+        self._prefix_valid = max(self._prefix_valid, stage)
+        return self._prefix[stage]
+
+    def _suffix_product(self, stage: int) -> np.ndarray:
+        for stage_i in range(self._suffix_valid - 1, stage - 1, -1):
+            self._suffix[stage_i] = self._apply_stage_right(
+                self._suffix[stage_i + 1], stage_i
+            )
+        self._suffix_valid = min(self._suffix_valid, stage)
+        return self._suffix[stage]
+
+    def refresh(self) -> np.ndarray:
+        """
+        Recomputes the cached products and the unitary from the stage transfer matrices.
+
+        Returns:
+            np.ndarray: The ``(N, N)`` unitary.
+        """
+        identity = np.eye(self.mode_amount, dtype=complex)
+        self._prefix = [identity] + [None] * self.stage_amount
+        self._suffix = [None] * self.stage_amount + [identity]
+        self._prefix_valid = 0
+        self._suffix_valid = self.stage_amount
+        self._unitary = self._prefix_product(self.stage_amount).copy()
+        return self.unitary
+
+    def set_switch_phases(self, switch_phases: ArrayTypes) -> np.ndarray:
+        """
+        Sets the phase of all the switches and recomputes the unitary.
+
+        Args:
+            switch_phases (ArrayTypes): The phase of each switch, in ``compose_switch_position_list`` order.
+
+        Returns:
+            np.ndarray: The ``(N, N)`` unitary.
+        """
+        switch_phases = np.asarray(switch_phases, dtype=float)
+        if switch_phases.shape != (len(self.switch_position_list),):
+            raise ValueError(
+                f"Expected {len(self.switch_position_list)} switch phases, got shape {switch_phases.shape}."
+            )
+        switch_blocks = np.asarray(
+            self.switch_transfer_function(switch_phases), dtype=complex
+        ).reshape(-1, 2, 2)
+        for position, switch_block in zip(self.switch_position_list, switch_blocks):
+            self._blocks[position] = switch_block
+        self._switch_phases = switch_phases
+        return self.refresh()
+
+    def set_switch_phase(self, switch_index: int, phase: float) -> np.ndarray:
+        """
+        Sets the phase of a single switch and updates the unitary in :math:`O(N^2)`.
+
+        Args:
+            switch_index (int): The index of the switch, in ``compose_switch_position_list`` order.
+            phase (float): The new phase of the switch.
+
+        Returns:
+            np.ndarray: The ``(N, N)`` unitary.
+        """
+        position = self.switch_position_list[switch_index]
+        stage, mode = position
+        switch_block = self._switch_block(phase)
+        prefix = self._prefix_product(stage)
+        suffix = self._suffix_product(stage + 1)
+
+        self._unitary += suffix[:, mode : mode + 2] @ (
+            (switch_block - self._blocks[position]) @ prefix[mode : mode + 2]
+        )
+        self._blocks[position] = switch_block
+        self._switch_phases[switch_index] = phase
+
+        # The products that include this stage are now stale.
+        self._prefix_valid = min(self._prefix_valid, stage)
+        self._suffix_valid = max(self._suffix_valid, stage + 1)
+        return self.unitary
+
+    def evaluate_switch_phases(
+        self, switch_index: int, phases: ArrayTypes
+    ) -> np.ndarray:
+        """
+        Returns the unitaries obtained by setting a single switch to each of the candidate phases, without changing
+        the state of the lattice.
+
+        Args:
+            switch_index (int): The index of the switch, in ``compose_switch_position_list`` order.
+            phases (ArrayTypes): The candidate phases, of shape ``(n_phases,)``.
+
+        Returns:
+            np.ndarray: The ``(n_phases, N, N)`` unitaries.
+        """
+        position = self.switch_position_list[switch_index]
+        stage, mode = position
+        switch_blocks = np.asarray(
+            self.switch_transfer_function(np.asarray(phases, dtype=float)),
+            dtype=complex,
+        ).reshape(-1, 2, 2)
+        prefix = self._prefix_product(stage)
+        suffix = self._suffix_product(stage + 1)
+
+        block_differences = switch_blocks - self._blocks[position]
+        return self._unitary + np.einsum(
+            "ik,nkl,lj->nij",
+            suffix[:, mode : mode + 2],
+            block_differences,
+            prefix[mode : mode + 2],
+        )
+
+
+def compose_lattice_unitary_function(
+    network: ArrayTypes | list[list],
+    switch_transfer_function: Callable = ideal_mzi_2x2_transfer_matrix,
+    gap_elements: list = None,
+    cross_elements: list = None,
+    jit: bool = True,
+) -> Callable:
+    """
+    Composes a function that maps the switch phases of a lattice to its unitary directly, without netlisting or
+    compiling the lattice circuit. The lattice description is resolved once into the per-stage block positions, and
+    each stage is applied by mixing only the rows of its blocks, so a lattice of ``J`` stages costs
+    :math:`O(J N^2)` per phase configuration. The returned function is vectorized over any leading batch dimensions
+    and can be differentiated with ``jax.grad``.
+
+    .. code-block:: python
+
+        lattice_unitary = compose_lattice_unitary_function(network=[["X", 0], [0, "X"]])
+        lattice_unitary(jnp.array([[0, 0], [0, jnp.pi]]))  # (2, 3, 3)
+
+    Args:
+        network (ArrayTypes | list[list]): The network matrix, indexed as ``network[stage][mode]``.
+        switch_transfer_function (Callable): Maps an array of phases to their ``(..., 2, 2)`` switch transfer
+            matrices. Defaults to ``ideal_mzi_2x2_transfer_matrix``.
+        gap_elements (list, optional): The gap elements in the network. Defaults to ``["0"]``.
+        cross_elements (list, optional): The cross elements in the network. Defaults to ``["-"]``.
+        jit (bool): Whether to ``jax.jit`` compile the returned function. Defaults to True.
+
+    Returns:
+        Callable: A function mapping ``(..., n_switches)`` phases to ``(..., N, N)`` unitaries, with rows indexing the
+        output modes and columns the input modes.
+    """
+    (
+        mode_amount,
+        stage_amount,
+        switch_position_list,
+        crossing_position_list,
+    ) = compose_lattice_element_list(
+        network=network,
+        gap_elements=gap_elements,
+        cross_elements=cross_elements,
+    )
+    switch_amount = len(switch_position_list)
+
+    # Resolve the static layout of every stage once. Each output row of a stage is a combination of its own input row,
+    # weighted by a diagonal coefficient, and of the other row of its block, weighted by an off-diagonal coefficient.
+    row_partner = np.tile(np.arange(mode_amount), (stage_amount, 1))
+    row_switch_index = np.full((stage_amount, mode_amount), -1)
+    row_block_index = np.zeros((stage_amount, mode_amount), dtype=int)
+    constant_diagonal = np.ones((stage_amount, mode_amount), dtype=complex)
+    constant_off_diagonal = np.zeros((stage_amount, mode_amount), dtype=complex)
+    element_list = [
+        (position, switch_index)
+        for switch_index, position in enumerate(switch_position_list)
+    ] + [(position, -1) for position in crossing_position_list]
+    for (stage, mode), switch_index in element_list:
+        if row_partner[stage, mode] != mode or row_partner[stage, mode + 1] != mode + 1:
+            raise ValueError(
+                f"The elements of stage {stage} overlap at mode {mode}, they must couple disjoint mode pairs."
+            )
+        row_partner[stage, mode], row_partner[stage, mode + 1] = mode + 1, mode
+        row_block_index[stage, mode + 1] = 1
+        if switch_index >= 0:
+            row_switch_index[stage, mode : mode + 2] = switch_index
+        else:
+            constant_diagonal[stage, mode] = crossing_2x2_transfer_matrix[0, 0]
+            constant_diagonal[stage, mode + 1] = crossing_2x2_transfer_matrix[1, 1]
+            constant_off_diagonal[stage, mode] = crossing_2x2_transfer_matrix[0, 1]
+            constant_off_diagonal[stage, mode + 1] = crossing_2x2_transfer_matrix[1, 0]
+    row_is_switch = row_switch_index >= 0
+    row_switch_index = np.maximum(row_switch_index, 0)
+
+    def lattice_unitary(switch_phases: ArrayTypes) -> jnp.ndarray:
+        switch_phases = jnp.asarray(switch_phases)
+        if switch_phases.shape[-1] != switch_amount:
+            raise ValueError(
+                f"Expected {switch_amount} switch phases, got shape {switch_phases.shape}."
+            )
+        batch_shape = switch_phases.shape[:-1]
+
+        # Gather the (..., stage, mode) row coefficients from all the switch blocks at once.
+        diagonal = jnp.broadcast_to(
+            constant_diagonal, batch_shape + constant_diagonal.shape
+        )
+        off_diagonal = jnp.broadcast_to(
+            constant_off_diagonal, batch_shape + constant_off_diagonal.shape
+        )
+        if switch_amount:
+            switch_blocks = switch_transfer_function(switch_phases)
+            diagonal = jnp.where(
+                row_is_switch,
+                switch_blocks[..., row_switch_index, row_block_index, row_block_index],
+                diagonal,
+            )
+            off_diagonal = jnp.where(
+                row_is_switch,
+                switch_blocks[
+                    ..., row_switch_index, row_block_index, 1 - row_block_index
+                ],
+                off_diagonal,
+            )
+
+        def apply_stage(unitary, stage_coefficients):
+            diagonal_i, off_diagonal_i, partner_i = stage_coefficients
+            unitary = (
+                diagonal_i[..., None] * unitary
+                + off_diagonal_i[..., None] * unitary[..., partner_i, :]
+            )
+            return unitary, None
+
+        unitary = jnp.broadcast_to(
+            jnp.eye(mode_amount, dtype=complex),
+            batch_shape + (mode_amount, mode_amount),
+        )
+        unitary, _ = jax.lax.scan(
+            apply_stage,
+            unitary,
+            (
+                jnp.moveaxis(diagonal, -2, 0),
+                jnp.moveaxis(off_diagonal, -2, 0),
+                jnp.asarray(row_partner),
+            ),
+        )
+        return unitary
+
+    if jit:
+        return jax.jit(lattice_unitary)
+    return lattice_unitary
+
+
+def calculate_lattice_unitary(
+    network: ArrayTypes | list[list],
+    switch_phases: ArrayTypes,
+    switch_transfer_function: Callable = ideal_mzi_2x2_transfer_matrix,
+    gap_elements: list = None,
+    cross_elements: list = None,
+) -> jnp.ndarray:
+    """
+    Returns the unitaries of a lattice for one or a batch of switch phase configurations, see
+    ``compose_lattice_unitary_function``.
+
+    Args:
+        network (ArrayTypes | list[list]): The network matrix, indexed as ``network[stage][mode]``.
+        switch_phases (ArrayTypes): The ``(..., n_switches)`` switch phases, in ``compose_switch_position_list`` order.
+        switch_transfer_function (Callable): Maps an array of phases to their ``(..., 2, 2)`` switch transfer
+            matrices. Defaults to ``ideal_mzi_2x2_transfer_matrix``.
+        gap_elements (list, optional): The gap elements in the network. Defaults to ``["0"]``.
+        cross_elements (list, optional): The cross elements in the network. Defaults to ``["-"]``.
+
+    Returns:
+        jnp.ndarray: The ``(..., N, N)`` unitaries.
+    """
+    lattice_unitary = compose_lattice_unitary_function(
+        network=network,
+        switch_transfer_function=switch_transfer_function,
+        gap_elements=gap_elements,
+        cross_elements=cross_elements,
+        jit=False,
+    )
+    return lattice_unitary(switch_phases)
@@ -1,3 +1,4 @@
 from .construct import construct_amaranth_module_from_truth_table
+from .minimize import compose_amaranth_sum_of_products, minimize_truth_table
 from .export import generate_verilog_from_amaranth_truth_table
 from .verify import verify_amaranth_truth_table
@@ -9,17 +9,56 @@ The supported implementation types are:
 """
 
 import amaranth as am
-from ...types.digital import TruthTable, LogicImplementationType
+import numpy as np
+from .minimize import compose_amaranth_sum_of_products, minimize_truth_table
+from ...types.digital import (
+    TruthTable,
+    LogicImplementationType,
+    LogicMinimizationMethodType,
+)
+
+
+def _compose_memory_init(truth_table: TruthTable) -> list[int]:
+    # Each memory word concatenates the outputs of an input address, from the first output at the least significant
+    # bits as in ``am.Cat``. The first row of a repeated input wins as in a ``Switch``, and unlisted inputs are zero.
+    integer_dictionary = truth_table.integer_dictionary
+    bit_width_dictionary = truth_table.bit_width_dictionary
+    input_port = truth_table.input_ports[0]
+    inputs, first_rows = np.unique(
+        integer_dictionary[input_port].astype(np.int64), return_index=True
+    )
+    words = np.zeros(len(inputs), dtype=object)
+    bit_offset = 0
+    for output_port in truth_table.output_ports:
+        outputs = integer_dictionary[output_port][first_rows].astype(object)
+        words += outputs * (1 << bit_offset)
+        bit_offset += bit_width_dictionary[output_port]
+    memory_init = [0] * (1 << bit_width_dictionary[input_port])
+    for input_value, word in zip(inputs.tolist(), words.tolist()):
+        memory_init[input_value] = int(word)
+    return memory_init
 
 
 def construct_amaranth_module_from_truth_table(
     truth_table: TruthTable,
     logic_implementation_type: LogicImplementationType = "combinatorial",
+    minimize: bool = False,
+    minimization_method: LogicMinimizationMethodType = "auto",
 ):
     """
     Constructs an Amaranth module based on the provided truth table.
     # TODO implementation type
 
+    A "memory" module implements the truth table as a read-only ``am.Memory`` addressed by the input port, with a
+    word per input value that concatenates the outputs, and unlisted inputs read as zero outputs. It scales to wide
+    inputs better than a ``Switch``, as it synthesizes into a ROM. The memory is read synchronously, so the outputs
+    are valid on the ``sync`` clock cycle after the input is applied.
+
+    A "combinatorial" module can optionally be minimized with ``minimize_truth_table``, in which case each output
+    bit is implemented as a sum-of-products of the input bits rather than with one ``Case`` per row. The inputs that
+    are not listed in the truth table are then don't-cares rather than zero outputs. The minimization, including its
+    term and literal counts, is stored in the ``minimization`` attribute of the module.
+
     Args:
         truth_table (TruthTable): The truth table to be implemented as a TruthTable object.
         logic_implementation_type (Literal["combinatorial", "sequential", "memory"], optional): The type of implementation.
@@ -27,6 +66,10 @@ def construct_amaranth_module_from_truth_table(
             - "sequential": Implements the truth table as sequential logic.
             - "memory": Implements the truth table using memory elements.
             Defaults to "combinatorial".
+        minimize (bool, optional): Whether to implement a "combinatorial" module as minimized sums-of-products.
+            Defaults to False.
+        minimization_method (LogicMinimizationMethodType, optional): The ``minimize_truth_table`` method. Defaults
+            to "auto".
 
     Returns:
         am.Module: An Amaranth module implementing the given truth table.
@@ -49,6 +92,15 @@ def construct_amaranth_module_from_truth_table(
     outputs = truth_table.output_ports
     truth_table_dict = truth_table.implementation_dictionary
 
+    minimization = None
+    if minimize:
+        if logic_implementation_type != "combinatorial":
+            raise ValueError(
+                "Only combinatorial truth tables can be minimized, not "
+                + str(logic_implementation_type)
+            )
+        minimization = minimize_truth_table(truth_table, method=minimization_method)
+
     if logic_implementation_type == "combinatorial":
 
         class TruthTableModule(am.Elaboratable):
@@ -61,6 +113,7 @@ def construct_amaranth_module_from_truth_table(
                 inputs_names (list): A list of input port names.
                 outputs_names (list): A list of output port names.
                 truth_table (dict): The truth table dictionary with inputs and outputs.
+                minimization (dict): The ``minimize_truth_table`` minimization, or None if it is not minimized.
             """
 
             def __init__(self, truth_table_dict: dict, inputs: list, outputs: list):
@@ -95,6 +148,7 @@ def construct_amaranth_module_from_truth_table(
                 self.inputs_names = inputs
                 self.outputs_names = outputs
                 self.truth_table = truth_table_dict
+                self.minimization = minimization
 
             def elaborate(self, platform):
                 """
@@ -108,6 +162,23 @@ def construct_amaranth_module_from_truth_table(
                 """
                 m = am.Module()
 
+                if self.minimization is not None:
+                    # Each output bit is the sum-of-products of its minimized implicants
+                    for output in self.outputs_names:
+                        m.d.comb += self.output_signals[output].eq(
+                            am.Cat(
+                                *[
+                                    compose_amaranth_sum_of_products(
+                                        self.input_signal, bit_implicants
+                                    )
+                                    for bit_implicants in self.minimization[
+                                        "sum_of_products"
+                                    ][output]
+                                ]
+                            )
+                        )
+                    return m
+
                 # Assume the truth table entries are consistent and iterate over them
                 with m.Switch(self.input_signal):
                     for i in range(len(self.truth_table[self.inputs_names[0]])):
@@ -181,4 +252,71 @@ def construct_amaranth_module_from_truth_table(
 
                 return m
 
+    elif logic_implementation_type == "memory":
+        memory_init = _compose_memory_init(truth_table)
+
+        class TruthTableModule(am.Elaboratable):
+            """
+            A class representing an Amaranth read-only memory generated from a truth table.
+
+            Attributes:
+                input_signal (am.Signal): The signal corresponding to the input port of the truth table, which
+                    addresses the memory.
+                output_signals (dict): A dictionary mapping output port names to their corresponding signals.
+                inputs_names (list): A list of input port names.
+                outputs_names (list): A list of output port names.
+                truth_table (dict): The truth table dictionary with inputs and outputs.
+                memory (am.Memory): The memory with a word of concatenated outputs per input value.
+                read_port (am.ReadPort): The synchronous read port of the memory.
+            """
+
+            def __init__(self, truth_table_dict: dict, inputs: list, outputs: list):
+                super(TruthTableModule, self).__init__()
+
+                if len(truth_table_dict[inputs[0]]) == 0:
+                    raise ValueError("No truth table inputs provided: " + str(inputs))
+
+                bit_width_dictionary = truth_table.bit_width_dictionary
+                self.input_signal = am.Signal(
+                    bit_width_dictionary[inputs[0]], name=inputs[0]
+                )
+                self.output_signals = {
+                    output: am.Signal(bit_width_dictionary[output], name=output)
+                    for output in outputs
+                }
+
+                setattr(self, inputs[0], self.input_signal)
+                for output in outputs:
+                    setattr(self, output, self.output_signals[output])
+
+                self.inputs_names = inputs
+                self.outputs_names = outputs
+                self.truth_table = truth_table_dict
+
+                self.memory = am.Memory(
+                    width=sum(bit_width_dictionary[output] for output in outputs),
+                    depth=len(memory_init),
+                    init=memory_init,
+                    name="truth_table_memory",
+                )
+                # The read port is created once, as each read port is added to the memory
+                self.read_port = self.memory.read_port(domain="sync", transparent=False)
+
+            def elaborate(self, platform):
+                m = am.Module()
+
+                m.submodules.read_port = self.read_port
+                m.d.comb += self.read_port.addr.eq(self.input_signal)
+                # The memory word is split into the output signals
+                m.d.comb += am.Cat(
+                    *[self.output_signals[output] for output in self.outputs_names]
+                ).eq(self.read_port.data)
+
+                return m
+
+    else:
+        raise ValueError(
+            f"Invalid logic implementation type: {logic_implementation_type}"
+        )
+
     return TruthTableModule(truth_table_dict, inputs, outputs)
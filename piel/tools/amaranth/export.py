@@ -24,7 +24,9 @@ def generate_verilog_from_amaranth_truth_table(
 
     This function converts an Amaranth elaboratable class to Verilog using the specified backend
     and writes the generated code to a file in the target directory. It supports both direct paths
-    and paths defined by the project's module structure.
+    and paths defined by the project's module structure. The clock and reset of the modules with a ``sync`` domain,
+    such as the "memory" implementation of ``construct_amaranth_module_from_truth_table``, are exported as the
+    ``clk`` and ``rst`` ports.
 
     Args:
         amaranth_module (amaranth.Elaboratable): The Amaranth module to be converted.
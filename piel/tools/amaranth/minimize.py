@@ -0,0 +1,233 @@
+"""
+This module minimizes each output bit of a truth table into a two-level sum-of-products, so that a truth table can be
+implemented as a few logic terms rather than as a case statement with one case per row.
+
+Each product term is an implicant ``(value, care_mask)`` over the input bits, which is true for an input ``x`` when
+``x & care_mask == value``. Its literals are the bits set in ``care_mask``.
+"""
+
+import functools
+import operator
+from typing import Optional
+import amaranth as am
+import numpy as np
+from ...types.digital import LogicMinimizationMethodType, TruthTable
+
+__all__ = [
+    "compose_amaranth_sum_of_products",
+    "minimize_truth_table",
+]
+
+Implicant = tuple[int, int]
+
+
+def _count_literals(implicants: list[Implicant]) -> int:
+    return sum(bin(care_mask).count("1") for _, care_mask in implicants)
+
+
+def _compose_prime_implicants(minterms: np.ndarray, bit_width: int) -> list[Implicant]:
+    # Quine-McCluskey: cubes ``(value, dash_mask)`` that differ in a single bit are merged until no merge is possible.
+    cubes = {(int(minterm), 0) for minterm in minterms}
+    prime_implicants = set()
+    while len(cubes) != 0:
+        merged_cubes = set()
+        used_cubes = set()
+        for value, dash_mask in cubes:
+            for bit_i in range(bit_width):
+                bit = 1 << bit_i
+                if (value | dash_mask) & bit:
+                    continue
+                if (value | bit, dash_mask) in cubes:
+                    merged_cubes.add((value, dash_mask | bit))
+                    used_cubes.add((value, dash_mask))
+                    used_cubes.add((value | bit, dash_mask))
+        prime_implicants |= cubes - used_cubes
+        cubes = merged_cubes
+    full_mask = (1 << bit_width) - 1
+    return [
+        (value, full_mask & ~dash_mask) for value, dash_mask in sorted(prime_implicants)
+    ]
+
+
+def _expand_implicants(
+    on_set: np.ndarray, off_set: np.ndarray, bit_width: int
+) -> list[Implicant]:
+    # Espresso-style expansion: every on-set minterm not yet covered is grown by dropping literals, from the most
+    # significant bit, as long as the cube does not intersect the off-set.
+    implicants = list()
+    covered = np.zeros(len(on_set), dtype=bool)
+    for minterm_i, minterm in enumerate(on_set):
+        if covered[minterm_i]:
+            continue
+        value, care_mask = int(minterm), (1 << bit_width) - 1
+        for bit_i in reversed(range(bit_width)):
+            expanded_care_mask = care_mask & ~(1 << bit_i)
+            expanded_value = value & expanded_care_mask
+            if not np.any((off_set & expanded_care_mask) == expanded_value):
+                value, care_mask = expanded_value, expanded_care_mask
+        implicants.append((value, care_mask))
+        covered |= (on_set & care_mask) == value
+    return implicants
+
+
+def _select_cover(implicants: list[Implicant], on_set: np.ndarray) -> list[Implicant]:
+    # The essential implicants are selected first, and the remaining on-set is covered greedily by the implicants
+    # that cover the most minterms, with the fewest literals.
+    if len(on_set) == 0:
+        return []
+    values = np.array([value for value, _ in implicants], dtype=np.int64)
+    care_masks = np.array([care_mask for _, care_mask in implicants], dtype=np.int64)
+    literal_amounts = np.array(
+        [bin(care_mask).count("1") for _, care_mask in implicants]
+    )
+    coverage = (on_set[None, :] & care_masks[:, None]) == values[:, None]
+
+    single_cover_minterms = coverage.sum(axis=0) == 1
+    selected = set(np.argmax(coverage[:, single_cover_minterms], axis=0).tolist())
+    uncovered = ~np.any(coverage[sorted(selected)], axis=0)
+    while np.any(uncovered):
+        gains = coverage[:, uncovered].sum(axis=1)
+        implicant_i = int(np.lexsort((literal_amounts, -gains))[0])
+        selected.add(implicant_i)
+        uncovered &= ~coverage[implicant_i]
+    return [implicants[implicant_i] for implicant_i in sorted(selected)]
+
+
+def minimize_truth_table(
+    truth_table: TruthTable,
+    method: LogicMinimizationMethodType = "auto",
+    dont_care_unlisted_inputs: bool = True,
+    maximum_exact_input_bits: int = 8,
+) -> dict:
+    """
+    Minimizes every output bit of a truth table into a sum-of-products of the input port bits.
+
+    The on-set of an output bit are the inputs for which it is 1, and its off-set the inputs for which it is 0. The
+    inputs that are not listed in the truth table are don't-cares unless ``dont_care_unlisted_inputs`` is False, in
+    which case they belong to the off-set, as in the default case of ``construct_amaranth_module_from_truth_table``.
+    A repeated input keeps its first row, as in a ``Switch``. Two methods are available:
+
+    - ``"quine_mccluskey"`` computes all the prime implicants of the on-set and the don't-cares, and selects the
+      essential ones before covering the rest of the on-set greedily. It enumerates the don't-cares, so it is
+      intended for small inputs.
+    - ``"espresso"`` expands each on-set minterm into a large implicant that does not intersect the off-set, and
+      selects an irredundant cover of these implicants. It scales with the amount of listed rows.
+
+    ``"auto"`` uses ``"quine_mccluskey"`` for inputs of up to ``maximum_exact_input_bits`` bits, and ``"espresso"``
+    otherwise.
+
+    Args:
+        truth_table (TruthTable): The truth table with a single input port.
+        method (LogicMinimizationMethodType): The minimization method. Defaults to "auto".
+        dont_care_unlisted_inputs (bool): Whether the unlisted inputs are don't-cares. Defaults to True.
+        maximum_exact_input_bits (int): The largest input bit width minimized with ``"quine_mccluskey"`` by ``"auto"``.
+            Defaults to 8.
+
+    Returns:
+        dict: The minimization, with the ``input_port`` name, its ``input_bit_width``, the ``method`` used, the
+        ``sum_of_products`` implicants of each output port as a list per output bit from the least significant one,
+        and the ``metrics`` comparing the ``term_amount`` and ``literal_amount`` of the sum-of-products to the
+        ``case_amount`` rows and the ``unminimized_term_amount`` and ``unminimized_literal_amount`` of the minterms.
+
+    Examples:
+        >>> truth_table = TruthTable(
+        >>>     input_ports=["detector_in"],
+        >>>     output_ports=["phase_map_out"],
+        >>>     detector_in=["00", "01", "10", "11"],
+        >>>     phase_map_out=["00", "10", "11", "11"],
+        >>> )
+        >>> minimize_truth_table(truth_table)["metrics"]["literal_amount"]
+        3
+    """
+    if method not in ("auto", "quine_mccluskey", "espresso"):
+        raise ValueError(f"Invalid minimization method: {method}")
+    if len(truth_table.input_ports) != 1:
+        raise ValueError(
+            "Only truth tables with a single input port can be minimized: "
+            + str(truth_table.input_ports)
+        )
+
+    input_port = truth_table.input_ports[0]
+    input_bit_width = truth_table.bit_width_dictionary[input_port]
+    integer_dictionary = truth_table.integer_dictionary
+    inputs, first_rows = np.unique(
+        integer_dictionary[input_port].astype(np.int64), return_index=True
+    )
+    if method == "auto":
+        method = (
+            "quine_mccluskey"
+            if input_bit_width <= maximum_exact_input_bits
+            else "espresso"
+        )
+
+    unlisted_inputs: Optional[np.ndarray] = None
+    if dont_care_unlisted_inputs == (method == "quine_mccluskey"):
+        # Quine-McCluskey merges the don't-cares whereas Espresso expands against the off-set.
+        unlisted_inputs = np.setdiff1d(
+            np.arange(1 << input_bit_width, dtype=np.int64), inputs
+        )
+
+    sum_of_products = dict()
+    minterm_amount = 0
+    for output_port in truth_table.output_ports:
+        outputs = integer_dictionary[output_port].astype(np.int64)[first_rows]
+        output_implicants = list()
+        for bit_i in range(truth_table.bit_width_dictionary[output_port]):
+            output_bits = (outputs >> bit_i) & 1 == 1
+            on_set, off_set = inputs[output_bits], inputs[~output_bits]
+            minterm_amount += len(on_set)
+            if method == "quine_mccluskey":
+                care_set = on_set
+                if unlisted_inputs is not None:
+                    care_set = np.concatenate([on_set, unlisted_inputs])
+                implicants = _compose_prime_implicants(care_set, input_bit_width)
+            else:
+                if unlisted_inputs is not None:
+                    off_set = np.concatenate([off_set, unlisted_inputs])
+                implicants = _expand_implicants(on_set, off_set, input_bit_width)
+            output_implicants.append(_select_cover(implicants, on_set))
+        sum_of_products[output_port] = output_implicants
+
+    all_implicants = [
+        implicant
+        for output_implicants in sum_of_products.values()
+        for bit_implicants in output_implicants
+        for implicant in bit_implicants
+    ]
+    return {
+        "input_port": input_port,
+        "input_bit_width": input_bit_width,
+        "method": method,
+        "sum_of_products": sum_of_products,
+        "metrics": {
+            "case_amount": len(inputs),
+            "unminimized_term_amount": minterm_amount,
+            "unminimized_literal_amount": minterm_amount * input_bit_width,
+            "term_amount": len(all_implicants),
+            "literal_amount": _count_literals(all_implicants),
+        },
+    }
+
+
+def compose_amaranth_sum_of_products(
+    input_signal: am.Value, implicants: list[Implicant]
+) -> am.Value:
+    """
+    Composes the Amaranth expression of a sum-of-products of implicants ``(value, care_mask)`` of an input signal.
+
+    Args:
+        input_signal (am.Value): The input signal.
+        implicants (list[tuple[int, int]]): The implicants of the sum-of-products.
+
+    Returns:
+        am.Value: The single bit expression, which is constant if there are no implicants or an implicant without
+        literals.
+    """
+    if len(implicants) == 0:
+        return am.Const(0, 1)
+    if any(care_mask == 0 for _, care_mask in implicants):
+        return am.Const(1, 1)
+    return functools.reduce(
+        operator.or_,
+        [(input_signal & care_mask) == value for value, care_mask in implicants],
+    )
@@ -1,5 +1,5 @@
 import amaranth as am
-from amaranth.sim import Simulator, Delay
+from amaranth.sim import Simulator, Delay, Settle, Tick
 import types
 from typing import Literal
 
@@ -32,7 +32,8 @@ def verify_amaranth_truth_table(
         vcd_file_name (str): The name of the VCD file to generate for the simulation.
         target_directory (PathTypes): The directory where the VCD file will be saved. Can be a direct path or a module type path.
         implementation_type (Literal["combinatorial", "sequential", "memory"], optional):
-            The type of implementation to simulate. Defaults to "combinatorial".
+            The type of implementation to simulate. A "memory" implementation is simulated with a ``sync`` clock, and
+            its outputs are checked on the clock cycle after each input. Defaults to "combinatorial".
 
     Returns:
         None
@@ -53,7 +54,21 @@ def verify_amaranth_truth_table(
     """
     inputs = truth_table.input_ports
     outputs = truth_table.output_ports
-    truth_table_df = truth_table.dataframe
+    truth_table_integers = truth_table.integer_dictionary
+    truth_table_bits = truth_table.implementation_dictionary
+
+    def verify_outputs(i: int):
+        """
+        Checks the output signals against the expected values of the truth table row ``i``.
+        """
+        for output_port in outputs:
+            output_port_signal = getattr(truth_table_amaranth_module, output_port)
+            expected_output_value = int(truth_table_integers[output_port][i])
+            assert (yield output_port_signal) == expected_output_value, (
+                f"Expected output {expected_output_value} on {output_port} for input "
+                f"{truth_table_bits[inputs[0]][i]} "
+                f"but got {(yield output_port_signal)}."
+            )
 
     def verify_logic():
         """
@@ -64,21 +79,26 @@ def verify_amaranth_truth_table(
         """
         input_port_signal = getattr(truth_table_amaranth_module, inputs[0]).eq
 
-        for i, input_value_i in enumerate(truth_table_df[inputs[0]]):
-            # Apply input value
-            yield input_port_signal(
-                int(input_value_i, 2)
-            )  # Convert input value to integer (assuming binary string)
+        for i, input_value_i in enumerate(truth_table_integers[inputs[0]]):
+            # Apply the packed integer input value
+            yield input_port_signal(int(input_value_i))
             yield Delay(1e-6)  # Delay for combinatorial logic simulation
+            yield from verify_outputs(i)
 
-            # Check each output signal
-            for output_port in outputs:
-                output_port_signal = getattr(truth_table_amaranth_module, output_port)
-                expected_output_value = int(truth_table_df[output_port].iloc[i], 2)
-                assert (yield output_port_signal) == expected_output_value, (
-                    f"Expected output {expected_output_value} on {output_port} for input {input_value_i} "
-                    f"but got {(yield output_port_signal)}."
-                )
+    def verify_clocked_logic():
+        """
+        Implements the logic verification for a clocked Amaranth module, such as a synchronously read memory.
+
+        This generator function sets the input signals and checks the output signals against the expected values
+        from the truth table after the following clock edge.
+        """
+        input_port_signal = getattr(truth_table_amaranth_module, inputs[0]).eq
+
+        for i, input_value_i in enumerate(truth_table_integers[inputs[0]]):
+            yield input_port_signal(int(input_value_i))
+            yield Tick()  # The input is registered on the clock edge
+            yield Settle()
+            yield from verify_outputs(i)
 
     # Determine the output files files directory
     if isinstance(target_directory, types.ModuleType):
@@ -94,18 +114,26 @@ def verify_amaranth_truth_table(
     output_vcd_file = target_directory / vcd_file_name
 
     # Set up the simulator for the Amaranth module
-    simulation = Simulator(truth_table_amaranth_module)
-    simulation.add_process(verify_logic)
+    if implementation_type == "memory":
+        # The sync clock domain is declared explicitly, so that modules without one can also be clocked
+        simulated_module = am.Module()
+        simulated_module.domains.sync = am.ClockDomain("sync")
+        simulated_module.submodules.truth_table = truth_table_amaranth_module
+    else:
+        simulated_module = truth_table_amaranth_module
+    simulation = Simulator(simulated_module)
 
     if implementation_type == "sequential":
+        simulation.add_process(verify_logic)
         simulation.add_clock(1e-6)  # Add a clock for sequential logic
         simulation.add_sync_process(verify_logic)  # Sync process for sequential logic
     elif implementation_type == "combinatorial":
         # No clock is needed for combinatorial logic
-        pass
+        simulation.add_process(verify_logic)
     elif implementation_type == "memory":
-        # Add specific handling for memory-based implementations if needed
-        pass
+        # The memory is read synchronously, so each row is checked on the clock cycle after its input
+        simulation.add_clock(1e-6)
+        simulation.add_process(verify_clocked_logic)
 
     # Run the simulation and write VCD output for verification
     with simulation.write_vcd(str(output_vcd_file)):
@@ -3,12 +3,17 @@ from .fock import (
     all_fock_states_from_photon_number,
     convert_qobj_to_jax,
     convert_output_type,
+    fock_basis_from_photon_number,
+    fock_basis_size,
     fock_state_nonzero_indexes,
     fock_state_to_photon_number_factorial,
     fock_states_at_mode_index,
     fock_states_only_individual_modes,
+    fock_state_rank,
+    fock_state_unrank,
 )
 from .unitary import (
+    calculate_unitarity_metrics,
     standard_s_parameters_to_qutip_qobj,
     verify_matrix_is_unitary,
     subunitary_selection_on_range,
@@ -1,8 +1,8 @@
-from itertools import product
+from itertools import chain, combinations_with_replacement, islice, product
 import math
 import numpy as np
 import jax.numpy as jnp
-from typing import Optional, Literal
+from typing import Iterator, Optional, Literal
 from piel.types.type_conversion import convert_array_type
 import qutip
 
@@ -15,6 +15,9 @@ def all_fock_states_from_photon_number(
     """
     For a specific amount of modes, we can generate all the possible Fock states for whatever amount of input photons we desire. This returns a list of all corresponding Fock states.
 
+    Note that each mode holds up to ``photon_amount`` photons, so the total photon number varies between the states. Use
+    ``fock_basis_from_photon_number`` for the basis with a fixed total photon number as a single integer array.
+
     Args:
         mode_amount (int): The amount of modes in the system.
         photon_amount (int, optional): The amount of photons in the system. Defaults to 1.
@@ -23,15 +26,185 @@ def all_fock_states_from_photon_number(
     Returns:
         list: A list of all the Fock states.
     """
-    photon_numbers = [[i] for i in range(photon_amount + 1)]
     states = []
-    for photon_number in product(photon_numbers, repeat=mode_amount):
-        state_values = np.array(photon_number).reshape(mode_amount, 1)
-        state = convert_output_type(state_values, output_type)
-        states.append(state)
+    for states_chunk in _iterate_photon_number_products(
+        [range(photon_amount + 1)] * mode_amount
+    ):
+        for state_values in states_chunk:
+            state = convert_output_type(
+                state_values.reshape(mode_amount, 1), output_type
+            )
+            states.append(state)
+    return states
+
+
+def _iterate_photon_number_products(
+    mode_photon_numbers: list[range], chunk_size: int = 4096
+) -> Iterator[np.ndarray]:
+    # Lazily yields the cartesian product of the per-mode photon numbers in ``itertools.product`` order, as integer
+    # arrays of up to ``chunk_size`` states, so that the full product is never held in memory at once.
+    mode_amount = len(mode_photon_numbers)
+    photon_number_products = product(*mode_photon_numbers)
+    while True:
+        chunk = np.fromiter(
+            chain.from_iterable(islice(photon_number_products, chunk_size)),
+            dtype=int,
+        )
+        if mode_amount == 0:
+            yield np.zeros((1, 0), dtype=int)
+            return
+        if len(chunk) == 0:
+            return
+        yield chunk.reshape(-1, mode_amount)
+
+
+def fock_basis_size(mode_amount: int, photon_amount: int) -> int:
+    """
+    Returns the amount of Fock states with exactly ``photon_amount`` photons distributed over ``mode_amount`` modes,
+    which by stars and bars is :math:`\\binom{N + M - 1}{N}`.
+
+    Args:
+        mode_amount (int): The amount of modes in the system.
+        photon_amount (int): The total amount of photons in the system.
+
+    Returns:
+        int: The size of the fixed photon number Fock basis.
+    """
+    if mode_amount == 0:
+        return int(photon_amount == 0)
+    return math.comb(photon_amount + mode_amount - 1, photon_amount)
+
+
+def fock_basis_from_photon_number(
+    mode_amount: int,
+    photon_amount: int = 1,
+) -> np.ndarray:
+    """
+    Generates the Fock basis with exactly ``photon_amount`` photons distributed over ``mode_amount`` modes directly,
+    rather than filtering all the per-mode photon number combinations. Each state corresponds to a multiset of the
+    occupied modes, so the basis is generated from the combinations with replacement of the modes, and the states are
+    returned in descending lexicographic order, ie. ``[N, 0, ..., 0]`` first and ``[0, ..., 0, N]`` last. This is the
+    order indexed by ``fock_state_rank`` and ``fock_state_unrank``.
+
+    Args:
+        mode_amount (int): The amount of modes in the system.
+        photon_amount (int, optional): The total amount of photons in the system. Defaults to 1.
+
+    Returns:
+        np.ndarray: The ``(n_states, mode_amount)`` integer array of the Fock states.
+    """
+    state_amount = fock_basis_size(mode_amount, photon_amount)
+    occupied_modes = np.fromiter(
+        (
+            mode
+            for modes in combinations_with_replacement(
+                range(mode_amount), photon_amount
+            )
+            for mode in modes
+        ),
+        dtype=int,
+        count=state_amount * photon_amount,
+    ).reshape(state_amount, photon_amount)
+    states = np.zeros((state_amount, mode_amount), dtype=int)
+    np.add.at(
+        states,
+        (np.repeat(np.arange(state_amount), photon_amount), occupied_modes.ravel()),
+        1,
+    )
     return states
 
 
+# Exact binomial coefficients of integer arrays, as object arrays of Python integers, since the ranks of large bases
+# exceed both the float mantissa and int64.
+_exact_comb = np.frompyfunc(math.comb, 2, 1)
+
+
+def _compose_rank_array(ranks: np.ndarray) -> np.ndarray:
+    # The ranks are returned as int64 whenever they fit in it.
+    if ranks.size == 0 or max(ranks.flat) <= np.iinfo(np.int64).max:
+        return ranks.astype(np.int64)
+    return ranks
+
+
+def fock_state_rank(fock_states: np.ndarray) -> np.ndarray | int:
+    """
+    Returns the index of one or many Fock states in the fixed photon number basis of ``fock_basis_from_photon_number``
+    in :math:`O(M)` per state. A state is preceded by all the states that share its first ``i`` occupations but hold
+    more photons in mode ``i``, and by the hockey-stick identity these amount to
+    :math:`\\binom{r_i - n_i - 1 + m_i}{m_i}`, where :math:`r_i` are the photons left for modes ``i`` onwards and
+    :math:`m_i` the amount of modes after ``i``.
+
+    Args:
+        fock_states (np.ndarray): A ``(mode_amount,)`` Fock state or a ``(..., mode_amount)`` array of Fock states.
+
+    Returns:
+        np.ndarray | int: The rank of each of the Fock states. The ranks are computed exactly, and are returned as an
+        object array of Python integers if they do not fit in int64.
+    """
+    fock_states = np.asarray(fock_states, dtype=int)
+    mode_amount = fock_states.shape[-1]
+    remaining_photons = (
+        fock_states.sum(axis=-1, keepdims=True)
+        - np.cumsum(fock_states, axis=-1)
+        + fock_states
+    )
+    following_modes = np.arange(mode_amount - 1, -1, -1)
+    preceding_states = np.where(
+        fock_states < remaining_photons,
+        _exact_comb(
+            np.maximum(remaining_photons - fock_states - 1 + following_modes, 0),
+            following_modes,
+        ),
+        0,
+    )
+    ranks = np.asarray(preceding_states.sum(axis=-1), dtype=object)
+    return int(ranks) if ranks.ndim == 0 else _compose_rank_array(ranks)
+
+
+def fock_state_unrank(
+    ranks: np.ndarray | int,
+    mode_amount: int,
+    photon_amount: int,
+) -> np.ndarray:
+    """
+    Returns the Fock states at the given indexes of the fixed photon number basis of
+    ``fock_basis_from_photon_number``, without generating the basis. This is the inverse of ``fock_state_rank``.
+
+    Args:
+        ranks (np.ndarray | int): The index or ``(...,)`` indexes of the Fock states. Indexes beyond int64 can be
+            provided as Python integers.
+        mode_amount (int): The amount of modes in the system.
+        photon_amount (int): The total amount of photons in the system.
+
+    Returns:
+        np.ndarray: The ``(..., mode_amount)`` integer array of the Fock states.
+    """
+    ranks = np.array(ranks, dtype=object)
+    if np.any((ranks < 0) | (ranks >= fock_basis_size(mode_amount, photon_amount))):
+        raise ValueError(
+            f"The Fock state ranks must be within the {fock_basis_size(mode_amount, photon_amount)} states of the basis."
+        )
+    fock_states = np.zeros(ranks.shape + (mode_amount,), dtype=int)
+    remaining_photons = np.full(ranks.shape, photon_amount)
+    for mode_index in range(mode_amount - 1):
+        following_modes = mode_amount - mode_index - 1
+        photon_number = remaining_photons.copy()
+        # Step down from the most occupied option while the rank skips past all the states that start with it.
+        states_with_photon_number = np.ones(ranks.shape, dtype=int)
+        while np.any(skip := ranks >= states_with_photon_number):
+            ranks = np.where(skip, ranks - states_with_photon_number, ranks)
+            photon_number = np.where(skip, photon_number - 1, photon_number)
+            states_with_photon_number = _exact_comb(
+                remaining_photons - photon_number + following_modes - 1,
+                following_modes - 1,
+            )
+        fock_states[..., mode_index] = photon_number
+        remaining_photons = remaining_photons - photon_number
+    if mode_amount > 0:
+        fock_states[..., -1] = remaining_photons
+    return fock_states
+
+
 def convert_qobj_to_jax(qobj: qutip.Qobj) -> jnp.ndarray:
     return jnp.array(qobj.data.todense())
 
@@ -113,25 +286,19 @@ def fock_states_at_mode_index(
     Returns:
         list: A list of all the Fock states.
     """
+    if not 0 <= target_mode_index < mode_amount:
+        # Index out of range.
+        return []
 
-    def check_photon_number_at_mode(state_value: np.ndarray) -> bool:
-        # Check if mode_index is valid
-        if target_mode_index < len(state_value):
-            # Return comparison result
-            return (state_value[target_mode_index][0] <= maximum_photon_amount) and (
-                state_value[target_mode_index][0] > 0
-            )
-        else:
-            # Index out of range.
-            return False
-
-    photon_numbers = [[i] for i in range(maximum_photon_amount + 1)]
+    # The target mode holds between one and the maximum photons, so it is constrained directly rather than filtered.
+    mode_photon_numbers = [range(maximum_photon_amount + 1)] * mode_amount
+    mode_photon_numbers[target_mode_index] = range(1, maximum_photon_amount + 1)
     states = []
-
-    for photon_number in product(photon_numbers, repeat=mode_amount):
-        state_values = np.array(photon_number).reshape(mode_amount, 1)
-        if check_photon_number_at_mode(state_values):
-            state = convert_output_type(state_values, output_type)
+    for states_chunk in _iterate_photon_number_products(mode_photon_numbers):
+        for state_values in states_chunk:
+            state = convert_output_type(
+                state_values.reshape(mode_amount, 1), output_type
+            )
             states.append(state)
     return states
 
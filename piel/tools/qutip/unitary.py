@@ -63,7 +63,7 @@ def subunitary_selection_on_index(
         rows_index = jnp.asarray(rows_index)
 
     if type(columns_index) is tuple:
-        rows_index = jnp.asarray(columns_index)
+        columns_index = jnp.asarray(columns_index)
 
     unitary_matrix_row_selection = unitary_matrix.at[rows_index, :].get()
     unitary_matrix_row_column_selection = unitary_matrix_row_selection.at[
@@ -97,18 +97,68 @@ def subunitary_selection_on_range(
     return unitary_matrix_row_column_selection
 
 
-def verify_matrix_is_unitary(matrix: jnp.ndarray) -> bool:
+def calculate_unitarity_metrics(
+    matrices: jnp.ndarray,
+    atol: float = 1e-6,
+) -> dict[str, jnp.ndarray]:
     """
-    Verify that the matrix is unitary.
+    Computes the unitarity and loss metrics of a stack of matrices in a single vectorized call, without constructing any
+    ``qutip.Qobj``. This is intended to validate the many matrices of a parameter or wavelength sweep at once.
+
+    The non-unitarity of a matrix :math:`U` is measured as the largest element deviation of :math:`U^\\dagger U` from the
+    identity, which is the same elementwise criterion as ``qutip.Qobj.check_isunitary``, together with its Frobenius
+    norm. For non-square ``(n_out, n_in)`` matrices the deviation measures whether the input columns are orthonormal,
+    but such isometries are never ``is_unitary``. The insertion loss of each input is the power lost over all the outputs, :math:`-10 \\log_{10} \\sum_o |U_{oi}|^2`.
 
     Args:
-        matrix (jnp.ndarray): The matrix to verify.
+        matrices (jnp.ndarray): A ``(n_out, n_in)`` matrix or a ``(..., n_out, n_in)`` stack of matrices.
+        atol (float): The elementwise unitarity tolerance. Defaults to 1e-6.
 
     Returns:
-        bool: True if the matrix is unitary, False otherwise.
+        dict[str, jnp.ndarray]: The ``(...)`` ``unitarity_deviation`` maximum elementwise deviations, the ``(...)``
+        ``unitarity_deviation_norm`` Frobenius norms of the deviations, the ``(..., n_in)`` ``insertion_loss_dB`` per
+        input, and the ``(...)`` ``is_unitary`` flags, which are False for non-square matrices.
+    """
+    matrices = jnp.asarray(matrices)
+    gram_matrices = jnp.einsum("...oi,...oj->...ij", jnp.conj(matrices), matrices)
+    deviation = gram_matrices - jnp.eye(matrices.shape[-1])
+    unitarity_deviation = jnp.max(jnp.abs(deviation), axis=(-2, -1))
+    input_transmission = jnp.real(jnp.diagonal(gram_matrices, axis1=-2, axis2=-1))
+    return {
+        "unitarity_deviation": unitarity_deviation,
+        "unitarity_deviation_norm": jnp.linalg.norm(deviation, axis=(-2, -1)),
+        "insertion_loss_dB": -10 * jnp.log10(input_transmission),
+        "is_unitary": (unitarity_deviation <= atol)
+        & (matrices.shape[-2] == matrices.shape[-1]),
+    }
+
+
+def verify_matrix_is_unitary(
+    matrix: jnp.ndarray,
+    atol: float = 1e-6,
+) -> bool | np.ndarray:
     """
-    qobj = matrix_to_qutip_qobj(matrix)
-    return qobj.check_isunitary()
+    Verify that the matrix is unitary within an elementwise tolerance. See ``calculate_unitarity_metrics``.
+
+    Args:
+        matrix (jnp.ndarray): The ``(n, n)`` matrix or ``(..., n, n)`` stack of matrices to verify.
+        atol (float): The elementwise unitarity tolerance. Defaults to 1e-6.
+
+    Returns:
+        bool | np.ndarray: True if the matrix is unitary, False otherwise. A stack of matrices returns a boolean array.
+
+    Raises:
+        ValueError: If the matrices are not square.
+    """
+    matrix_shape = np.shape(matrix)
+    if len(matrix_shape) < 2 or matrix_shape[-2] != matrix_shape[-1]:
+        raise ValueError(
+            f"A unitary matrix must be square, not of shape {matrix_shape}."
+        )
+    is_unitary = np.asarray(
+        calculate_unitarity_metrics(matrix, atol=atol)["is_unitary"]
+    )
+    return bool(is_unitary) if is_unitary.ndim == 0 else is_unitary
 
 
 standard_s_parameters_to_qutip_qobj = matrix_to_qutip_qobj
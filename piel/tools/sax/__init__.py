@@ -1,8 +1,22 @@
+from .cache import SaxCircuitCache
 from .netlist import (
+    RecursiveNetlistIndex,
+    compose_recursive_netlist_index,
     address_value_dictionary_to_function_parameter_dictionary,
+    compose_recursive_instance_addresses,
     compose_recursive_instance_location,
+    compose_recursive_netlist_dependency_graph,
     get_component_instances,
     get_netlist_instances_by_prefix,
     get_matched_model_recursive_netlist_instances,
 )
-from .utils import get_sdense_ports_index, sax_to_s_parameters_standard_matrix, snet
+from .subcircuit import compose_cached_model, compose_passive_cached_circuit
+from .utils import (
+    SParameterPortPlan,
+    calculate_wavelength_sweep_s_parameters,
+    compose_switch_phase_executable,
+    compose_switch_phase_unitary_function,
+    get_sdense_ports_index,
+    sax_to_s_parameters_standard_matrix,
+    snet,
+)
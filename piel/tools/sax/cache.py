@@ -0,0 +1,378 @@
+"""
+This module provides a content-addressed cache for the recursive netlists, the compiled ``sax`` circuits and the
+compiled switch phase executables generated from ``gdsfactory`` components, so that the same component is not
+netlisted and compiled again within a sweep.
+"""
+
+import hashlib
+import json
+import pathlib
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+import sax
+from .subcircuit import compose_passive_cached_circuit
+from .utils import compose_switch_phase_executable
+from ...types import PathTypes, PhotonicCircuitComponent, PortsTuple, RecursiveNetlist
+
+__all__ = [
+    "SaxCircuitCache",
+    "compose_callable_key",
+    "compose_models_key",
+    "compose_netlist_key",
+]
+
+
+def compose_callable_key(function: Optional[Callable]) -> str:
+    """
+    Returns a stable string identifier for a callable, based on its module and qualified name. ``functools.partial``
+    objects are resolved to the function they wrap alongside their keywords.
+
+    Args:
+        function (Optional[Callable]): The callable to identify.
+
+    Returns:
+        str: The callable identifier.
+    """
+    if function is None:
+        return "None"
+    if hasattr(function, "func"):
+        keywords = getattr(function, "keywords", {})
+        return (
+            compose_callable_key(function.func)
+            + "("
+            + json.dumps(keywords, sort_keys=True, default=str)
+            + ")"
+        )
+    module = getattr(function, "__module__", type(function).__module__)
+    name = getattr(function, "__qualname__", type(function).__qualname__)
+    return f"{module}.{name}"
+
+
+def compose_models_key(models: dict, stable: bool = False) -> str:
+    """
+    Returns a hash of a models dictionary. By default, the hash is based on the model names and the identity of each
+    model callable, so replacing a model invalidates the key. If ``stable`` is set, the hash is based on the model
+    names and the callable module and qualified names instead, so it is stable across interpreter sessions.
+
+    Args:
+        models (dict): The models dictionary.
+        stable (bool): Whether to compose a key that is stable across interpreter sessions.
+
+    Returns:
+        str: The models hash.
+    """
+    if stable:
+        models_identity = [
+            (name, compose_callable_key(model)) for name, model in models.items()
+        ]
+    else:
+        models_identity = [(name, id(model)) for name, model in models.items()]
+    models_identity.sort()
+    return hashlib.sha256(repr(models_identity).encode()).hexdigest()
+
+
+def compose_netlist_key(netlist: RecursiveNetlist) -> str:
+    """
+    Returns a stable hash of a (recursive) netlist dictionary.
+
+    Args:
+        netlist (RecursiveNetlist): The netlist dictionary.
+
+    Returns:
+        str: The netlist hash.
+    """
+    netlist_json = json.dumps(netlist, sort_keys=True, default=str)
+    return hashlib.sha256(netlist_json.encode()).hexdigest()
+
+
+def _encode_netlist_value(value: Any) -> Any:
+    # JSON has no tuples, so they are tagged to be restored when the netlist is read back from disk.
+    if isinstance(value, tuple):
+        return {"__tuple__": [_encode_netlist_value(item) for item in value]}
+    if isinstance(value, list):
+        return [_encode_netlist_value(item) for item in value]
+    if isinstance(value, dict):
+        for key in value:
+            if not isinstance(key, str):
+                raise TypeError(
+                    f"Netlist keys must be strings to be stored on disk, got {key!r}."
+                )
+        return {key: _encode_netlist_value(item) for key, item in value.items()}
+    return value
+
+
+def _decode_netlist_object(value: dict) -> Any:
+    if value.keys() == {"__tuple__"}:
+        return tuple(value["__tuple__"])
+    return value
+
+
+class SaxCircuitCache:
+    """
+    An in-memory least-recently-used cache of the recursive netlists, compiled ``sax`` circuits and ``jax.jit``
+    compiled switch phase executables of ``gdsfactory`` components, with an optional on-disk cache for the netlists.
+
+    Netlists are keyed by the component name, geometry hash and the netlist function used to generate them. Compiled
+    circuits are keyed by the hash of the netlist and of the models dictionary identity. The compiled circuits are
+    closures over the models and are not serializable, so only the netlists are stored on disk. Switch phase
+    executables are keyed by the circuit key, the switch instance list and the input ports order.
+
+    .. code-block:: python
+
+        cache = SaxCircuitCache(maxsize=64)
+        circuit, info = cache.get_circuit_from_component(component, models=models)
+        cache.statistics
+        # {"netlist_hits": 0, "netlist_misses": 1, "circuit_hits": 0, "circuit_misses": 1, ...}
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 128,
+        cache_directory: Optional[PathTypes] = None,
+    ):
+        """
+        Args:
+            maxsize (int): The maximum amount of netlists, circuits and executables kept in memory.
+            cache_directory (Optional[PathTypes]): The directory where the netlists are stored. Disabled if None.
+        """
+        if maxsize < 1:
+            raise ValueError("maxsize must be a positive integer.")
+        self.maxsize = maxsize
+        self.cache_directory = (
+            pathlib.Path(cache_directory) if cache_directory is not None else None
+        )
+        if self.cache_directory is not None:
+            self.cache_directory.mkdir(parents=True, exist_ok=True)
+        self._netlists: OrderedDict[str, RecursiveNetlist] = OrderedDict()
+        self._circuits: OrderedDict[str, tuple[Any, Any]] = OrderedDict()
+        self._executables: OrderedDict[str, tuple[Callable, PortsTuple]] = OrderedDict()
+        self.netlist_hits = 0
+        self.netlist_misses = 0
+        self.circuit_hits = 0
+        self.circuit_misses = 0
+        self.executable_hits = 0
+        self.executable_misses = 0
+
+    @property
+    def statistics(self) -> dict[str, int]:
+        """
+        Returns the hit and miss counters of the netlist, circuit and executable caches.
+
+        Returns:
+            dict[str, int]: The cache counters.
+        """
+        return {
+            "netlist_hits": self.netlist_hits,
+            "netlist_misses": self.netlist_misses,
+            "circuit_hits": self.circuit_hits,
+            "circuit_misses": self.circuit_misses,
+            "executable_hits": self.executable_hits,
+            "executable_misses": self.executable_misses,
+        }
+
+    def clear(self) -> None:
+        """
+        Clears the in-memory caches and resets the counters. The on-disk netlists are kept.
+        """
+        self._netlists.clear()
+        self._circuits.clear()
+        self._executables.clear()
+        self.netlist_hits = 0
+        self.netlist_misses = 0
+        self.circuit_hits = 0
+        self.circuit_misses = 0
+        self.executable_hits = 0
+        self.executable_misses = 0
+
+    def _store(self, cache: OrderedDict, key: str, value: Any) -> None:
+        cache[key] = value
+        cache.move_to_end(key)
+        if len(cache) > self.maxsize:
+            cache.popitem(last=False)
+
+    def get_netlist(
+        self,
+        component: PhotonicCircuitComponent,
+        netlist_function: Optional[Callable] = None,
+    ) -> RecursiveNetlist:
+        """
+        Returns the netlist of a component, generating it only on a cache miss. If no ``netlist_function`` is
+        provided, the recursive netlist is generated with ``get_netlist_recursive(allow_multiple=True)``. Netlists
+        stored on disk are read back unchanged, including their tuples.
+
+        Args:
+            component (PhotonicCircuitComponent): The component to netlist.
+            netlist_function (Optional[Callable]): The function to generate the netlist. Defaults to None.
+
+        Returns:
+            RecursiveNetlist: The component netlist.
+
+        Raises:
+            TypeError: If the netlist is stored on disk and is not JSON serializable.
+        """
+        key = hashlib.sha256(
+            "|".join(
+                [
+                    component.name,
+                    component.hash_geometry(),
+                    compose_callable_key(netlist_function),
+                ]
+            ).encode()
+        ).hexdigest()
+
+        if key in self._netlists:
+            self.netlist_hits += 1
+            self._netlists.move_to_end(key)
+            return self._netlists[key]
+
+        netlist_file = (
+            self.cache_directory / f"{key}.json"
+            if self.cache_directory is not None
+            else None
+        )
+        if netlist_file is not None and netlist_file.exists():
+            self.netlist_hits += 1
+            netlist = json.loads(
+                netlist_file.read_text(), object_hook=_decode_netlist_object
+            )
+        else:
+            self.netlist_misses += 1
+            if netlist_function is None:
+                netlist = component.get_netlist_recursive(allow_multiple=True)
+            else:
+                netlist = netlist_function(component)
+            if netlist_file is not None:
+                # Raises a TypeError before writing if the netlist is not JSON serializable.
+                netlist_file.write_text(json.dumps(_encode_netlist_value(netlist)))
+
+        self._store(self._netlists, key, netlist)
+        return netlist
+
+    @staticmethod
+    def _compose_circuit_key(netlist: RecursiveNetlist, models: dict, **kwargs) -> str:
+        return hashlib.sha256(
+            "|".join(
+                [
+                    compose_netlist_key(netlist),
+                    compose_models_key(models),
+                    json.dumps(kwargs, sort_keys=True, default=str),
+                ]
+            ).encode()
+        ).hexdigest()
+
+    def get_circuit(
+        self,
+        netlist: RecursiveNetlist,
+        models: dict,
+        cache_passive_subcircuits: bool = False,
+        **kwargs,
+    ) -> tuple[Any, Any]:
+        """
+        Returns the compiled ``sax`` circuit of a netlist, compiling it only on a cache miss.
+
+        Args:
+            netlist (RecursiveNetlist): The netlist to compile.
+            models (dict): The models dictionary.
+            cache_passive_subcircuits (bool): Whether to compile the circuit with ``compose_passive_cached_circuit``
+                rather than ``sax.circuit``. Defaults to False.
+            **kwargs: Additional keyword arguments passed to ``sax.circuit``.
+
+        Returns:
+            tuple[Any, Any]: The ``sax`` circuit and its related information.
+        """
+        key = self._compose_circuit_key(
+            netlist=netlist,
+            models=models,
+            cache_passive_subcircuits=cache_passive_subcircuits,
+            **kwargs,
+        )
+
+        if key in self._circuits:
+            self.circuit_hits += 1
+            self._circuits.move_to_end(key)
+            return self._circuits[key]
+
+        self.circuit_misses += 1
+        if cache_passive_subcircuits:
+            circuit = compose_passive_cached_circuit(
+                netlist=netlist, models=models, **kwargs
+            )
+        else:
+            circuit = sax.circuit(netlist=netlist, models=models, **kwargs)
+        self._store(self._circuits, key, circuit)
+        return circuit
+
+    def get_circuit_from_component(
+        self,
+        component: PhotonicCircuitComponent,
+        models: dict,
+        netlist_function: Optional[Callable] = None,
+        **kwargs,
+    ) -> tuple[Any, Any]:
+        """
+        Returns the compiled ``sax`` circuit of a component through both the netlist and the circuit caches.
+
+        Args:
+            component (PhotonicCircuitComponent): The component to compile.
+            models (dict): The models dictionary.
+            netlist_function (Optional[Callable]): The function to generate the netlist. Defaults to None.
+            **kwargs: Additional keyword arguments passed to ``sax.circuit``.
+
+        Returns:
+            tuple[Any, Any]: The ``sax`` circuit and its related information.
+        """
+        netlist = self.get_netlist(
+            component=component, netlist_function=netlist_function
+        )
+        return self.get_circuit(netlist=netlist, models=models, **kwargs)
+
+    def get_switch_phase_executable(
+        self,
+        netlist: RecursiveNetlist,
+        models: dict,
+        switch_instance_list: list[tuple],
+        input_ports_order: tuple[str] | None = None,
+        parameter_key: str = "active_phase_rad",
+        **kwargs,
+    ) -> tuple[Callable, PortsTuple]:
+        """
+        Returns the ``jax.jit`` compiled switch phase executable of a netlist, see
+        ``compose_switch_phase_executable``. The executable is only composed and compiled on a cache miss.
+
+        Args:
+            netlist (RecursiveNetlist): The netlist to compile.
+            models (dict): The models dictionary.
+            switch_instance_list (list[tuple]): The list of switch instance addresses that define the phase order.
+            input_ports_order (tuple): The ports order tuple containing the names and order of the input ports.
+            parameter_key (str): The phase parameter name of the switch models.
+            **kwargs: Additional keyword arguments passed to ``sax.circuit``.
+
+        Returns:
+            tuple[Callable, PortsTuple]: The compiled executable and the input ports order.
+        """
+        key = hashlib.sha256(
+            "|".join(
+                [
+                    self._compose_circuit_key(netlist=netlist, models=models, **kwargs),
+                    repr(list(switch_instance_list)),
+                    repr(input_ports_order),
+                    parameter_key,
+                ]
+            ).encode()
+        ).hexdigest()
+
+        if key in self._executables:
+            self.executable_hits += 1
+            self._executables.move_to_end(key)
+            return self._executables[key]
+
+        self.executable_misses += 1
+        circuit, _ = self.get_circuit(netlist=netlist, models=models, **kwargs)
+        executable = compose_switch_phase_executable(
+            circuit=circuit,
+            switch_instance_list=switch_instance_list,
+            input_ports_order=input_ports_order,
+            parameter_key=parameter_key,
+        )
+        self._store(self._executables, key, executable)
+        return executable
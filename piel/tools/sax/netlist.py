@@ -1,20 +1,268 @@
 """
 This module aims to extend sax from standard netlist operations to include more complex operations that enable connectivity.
 """
+
+from bisect import bisect_left
+import networkx as nx
 import sax
 from typing import Optional
 from ...models.frequency import get_default_models
 
 
+def _get_sorted_prefix_matches(sorted_names: list[str], prefix: str) -> list[str]:
+    # The names that start with the prefix are contiguous in a sorted list, starting at its bisection point.
+    matched_names = []
+    for name in sorted_names[bisect_left(sorted_names, prefix) :]:
+        if not name.startswith(prefix):
+            break
+        matched_names.append(name)
+    return matched_names
+
+
+class RecursiveNetlistIndex:
+    """
+    Parses a recursive netlist with ``sax.netlist`` once and indexes its cells, so that the recursive netlist helpers
+    query the index rather than parsing the netlist again on every call.
+
+    The index provides the parsed cells, a prefix lookup over the sorted cell names, and per cell, the instance to
+    component map and the component to instances map.
+
+    .. code-block:: python
+
+        netlist_index = RecursiveNetlistIndex(recursive_netlist)
+        netlist_index.get_cell_by_prefix("component_lattice_generic")
+        # "component_lattice_generic_545e9440"
+        netlist_index.get_component_instances(
+            "component_lattice_generic_545e9440", component_name_prefix="mzi"
+        )
+        # ["mzi_1", "mzi_2", "mzi_3"]
+
+    Args:
+        recursive_netlist (dict): The hierarchical netlist dictionary.
+    """
+
+    def __init__(self, recursive_netlist: dict):
+        self.recursive_netlist: dict = recursive_netlist
+        recursive_netlist_root = sax.netlist(recursive_netlist).dict()["__root__"]
+        self.cells: dict[str, dict] = recursive_netlist_root
+        self.cell_names: list[str] = sorted(recursive_netlist_root.keys())
+        self.instance_components: dict[str, dict[str, str]] = {
+            cell_name: {
+                instance_name: instance["component"]
+                for instance_name, instance in cell["instances"].items()
+            }
+            for cell_name, cell in recursive_netlist_root.items()
+        }
+        self.component_instances: dict[str, dict[str, list[str]]] = dict()
+        for cell_name, instance_components in self.instance_components.items():
+            component_instances = self.component_instances.setdefault(cell_name, {})
+            for instance_name, component_name in instance_components.items():
+                component_instances.setdefault(component_name, []).append(instance_name)
+        self.component_names: dict[str, list[str]] = {
+            cell_name: sorted(component_instances)
+            for cell_name, component_instances in self.component_instances.items()
+        }
+
+    def get_cells_by_prefix(self, cell_prefix: str) -> list[str]:
+        """
+        Returns the names of all the cells that start with a given prefix.
+
+        Args:
+            cell_prefix (str): The prefix of the cell names.
+
+        Returns:
+            list[str]: The sorted matched cell names.
+        """
+        return _get_sorted_prefix_matches(self.cell_names, cell_prefix)
+
+    def get_cell_by_prefix(self, cell_prefix: str) -> str:
+        """
+        Returns the name of the single cell that starts with a given prefix.
+
+        Args:
+            cell_prefix (str): The prefix of the cell name.
+
+        Returns:
+            str: The name of the matched cell.
+
+        Raises:
+            ValueError: If no cell or more than one cell matches the given prefix.
+        """
+        result = self.get_cells_by_prefix(cell_prefix)
+        if len(result) == 1:
+            return result[0]
+        elif len(result) == 0:
+            raise ValueError(
+                "No instances with prefix: "
+                + cell_prefix
+                + " found. These are the available instances: "
+                + str(self.cell_names)
+            )
+        else:
+            raise ValueError(
+                "More than one instance with prefix: "
+                + cell_prefix
+                + "found. These are the matched "
+                "instances: " + str(result)
+            )
+
+    def get_component_instances(
+        self,
+        cell_name: str,
+        component_name_prefix: str,
+    ) -> list[str]:
+        """
+        Returns the names of the instances of a cell whose component starts with a given prefix, in the cell instance
+        order.
+
+        Args:
+            cell_name (str): The name of the cell.
+            component_name_prefix (str): The prefix of the component names.
+
+        Returns:
+            list[str]: The matched instance names.
+        """
+        matched_component_names = _get_sorted_prefix_matches(
+            self.component_names[cell_name], component_name_prefix
+        )
+        if len(matched_component_names) == 1:
+            return list(self.component_instances[cell_name][matched_component_names[0]])
+        return [
+            instance_name
+            for instance_name, component_name in self.instance_components[
+                cell_name
+            ].items()
+            if component_name.startswith(component_name_prefix)
+        ]
+
+
+def compose_recursive_netlist_index(
+    recursive_netlist: dict | RecursiveNetlistIndex,
+) -> RecursiveNetlistIndex:
+    """
+    Returns the ``RecursiveNetlistIndex`` of a recursive netlist, or the index itself if it has already been composed.
+
+    Args:
+        recursive_netlist (dict | RecursiveNetlistIndex): The hierarchical netlist dictionary or its index.
+
+    Returns:
+        RecursiveNetlistIndex: The recursive netlist index.
+    """
+    if isinstance(recursive_netlist, RecursiveNetlistIndex):
+        return recursive_netlist
+    return RecursiveNetlistIndex(recursive_netlist)
+
+
+def compose_recursive_netlist_dependency_graph(
+    recursive_netlist: dict | RecursiveNetlistIndex,
+    models: Optional[dict] = None,
+) -> nx.DiGraph:
+    """
+    Returns the dependency directed acyclic graph of the cells of a recursive netlist. Every cell and component is a
+    node, and every cell has an edge to each of the components of its instances. The ``instances`` edge attribute
+    contains the corresponding instance names in the cell instance order. Components that are provided in ``models``
+    are leaves of the graph, even if they are also composed in the recursive netlist.
+
+    Args:
+        recursive_netlist (dict | RecursiveNetlistIndex): The hierarchical netlist dictionary or its index.
+        models (Optional[dict]): The provided component models. Defaults to None.
+
+    Returns:
+        nx.DiGraph: The dependency directed acyclic graph.
+
+    Raises:
+        ValueError: If the recursive netlist cells have a circular dependency.
+    """
+    netlist_index = compose_recursive_netlist_index(recursive_netlist)
+    models = models or {}
+    dependency_graph = nx.DiGraph()
+    for cell_name, instance_components in netlist_index.instance_components.items():
+        if cell_name in models:
+            continue
+        dependency_graph.add_node(cell_name)
+        for instance_name, component_name in instance_components.items():
+            if not dependency_graph.has_edge(cell_name, component_name):
+                dependency_graph.add_edge(cell_name, component_name, instances=[])
+            dependency_graph.edges[cell_name, component_name]["instances"].append(
+                instance_name
+            )
+    if not nx.is_directed_acyclic_graph(dependency_graph):
+        raise ValueError(
+            "The recursive netlist has circular cell dependencies: "
+            + str(nx.find_cycle(dependency_graph))
+        )
+    return dependency_graph
+
+
+def compose_recursive_instance_addresses(
+    recursive_netlist: dict | RecursiveNetlistIndex,
+    top_level_instance_name: str,
+    target_component_prefix: str,
+    models: Optional[dict] = None,
+) -> list[tuple]:
+    """
+    Returns the instance addresses of all the components that start with ``target_component_prefix`` at any depth
+    under a top-level cell of a recursive netlist. An address is the tuple of the top-level cell name followed by the
+    instance names from the top-level cell down to the matched instance, eg.
+    ``("component_lattice_gener_fb8c4da8", "mzi_1")``. The search does not continue inside a matched component.
+
+    The dependency graph is traversed once in post-order from the top-level cell, and the addresses relative to every
+    cell are memoized, so that a cell instanced multiple times is only resolved once. Within every cell, the addresses
+    are grouped by component in the order in which the components first appear in the cell, as the required models
+    of ``sax.get_required_circuit_models``, and the instances of a component are in the cell instance order. For a
+    lattice of two switch variants, the instances of the first variant hence precede those of the second one, which
+    defines the order of the switch phases.
+
+    Args:
+        recursive_netlist (dict | RecursiveNetlistIndex): The hierarchical netlist dictionary or its index.
+        top_level_instance_name (str): The name of the top-level cell to search under.
+        target_component_prefix (str): The prefix of the target component to find.
+        models (Optional[dict]): The provided component models, which are not searched inside. Defaults to None.
+
+    Returns:
+        list[tuple]: The instance addresses of the matched components.
+    """
+    netlist_index = compose_recursive_netlist_index(recursive_netlist)
+    dependency_graph = compose_recursive_netlist_dependency_graph(
+        netlist_index, models=models
+    )
+    relative_addresses: dict[str, list[tuple]] = dict()
+    for cell_name in nx.dfs_postorder_nodes(
+        dependency_graph, source=top_level_instance_name
+    ):
+        if dependency_graph.out_degree(cell_name) == 0:
+            # Leaf models do not contain any instances.
+            relative_addresses[cell_name] = []
+            continue
+        cell_addresses = []
+        for component_name, instance_names in netlist_index.component_instances[
+            cell_name
+        ].items():
+            for instance_name in instance_names:
+                if component_name.startswith(target_component_prefix):
+                    cell_addresses.append((instance_name,))
+                else:
+                    cell_addresses.extend(
+                        (instance_name, *address)
+                        for address in relative_addresses[component_name]
+                    )
+        relative_addresses[cell_name] = cell_addresses
+    return [
+        (top_level_instance_name, *address)
+        for address in relative_addresses[top_level_instance_name]
+    ]
+
+
 def address_value_dictionary_to_function_parameter_dictionary(
     address_value_dictionary: dict,
     parameter_key: str,
 ):
     """
-    Converts a dictionary of address-value pairs to a dictionary of function parameters.
+    Converts a dictionary of address-value pairs to a dictionary of function parameters. The addresses can have any
+    depth of hierarchy, and the intermediate instances are nested accordingly.
 
     Args:
-        address_value_dictionary (dict): Dictionary where the key is a tuple of (component, instance, parameter) and the value is the parameter's value.
+        address_value_dictionary (dict): Dictionary where the key is a tuple of (component, instance, ..., parameter) and the value is the parameter's value.
         parameter_key (str): The key under which the parameter value will be stored in the output dictionary.
 
     Returns:
@@ -32,46 +280,30 @@ def address_value_dictionary_to_function_parameter_dictionary(
     This function processes a dictionary of component addresses and parameter values, converting it into a nested dictionary format that is suitable for use as function parameters.
     """
     result = {}
-    for (_, instance, param), value in address_value_dictionary.items():
-        if instance not in result:
-            result[instance] = {}
-        result[instance][param] = {parameter_key: value}
+    for (_, *instances, param), value in address_value_dictionary.items():
+        instance_parameters = result
+        for instance in instances:
+            instance_parameters = instance_parameters.setdefault(instance, {})
+        instance_parameters[param] = {parameter_key: value}
     return result
 
 
 def compose_recursive_instance_location(
-    recursive_netlist: dict,
+    recursive_netlist: dict | RecursiveNetlistIndex,
     top_level_instance_name: str,
-    required_models: list,
+    required_models: Optional[list],
     target_component_prefix: str,
     models: dict,
 ):
     """
     This function returns the recursive location of any matching ``target_component_prefix`` instances within the
     ``recursive_netlist``. A function that returns the mapping of the ``matched_component`` in the corresponding
-    netlist at any particular level of recursion. This function iterates over a particular level of recursion of a
-    netlist. It returns a list of the missing required components, and updates a dictionary of models that contains a
-    particular matching component. It returns the corresponding list of instances of a particular component at that
-    level of recursion, so that it can be appended upon in order to construct the location of the corresponding
-    matching elements.
-
-       If ``required_models`` is an empty list, it means no recursion is required and the function is complete. If a
-       ``required_model_i`` in ``required_models`` matches ``target_component_prefix``, then no more recursion is
-       required down the component function.
+    netlist at any particular level of recursion.
 
        The ``recursive_netlist`` should contain all the missing composed models that are not provided in the main
-       models dictionary. If not, then we need to require the user to input the missing model that cannot be
-       extracted from the composed netlist. We know when a model is composed, and when it is already provided at
-       every level of recursion based on the ``models`` dictionary that gets updated at each level of recursion with
-       the corresponding models of that level, and the ``required_models`` down itself.
-
-       However, a main question appears on how to do the recursion. There needs to be a flag that determines that the
-       recursion is complete. However, this is only valid for every particular component in the ``required_models``
-       list. Every component might have missing component. This means that this recursion begins component by
-       component, updating the ``required_models`` list until all of them have been composed from the recursion or it
-       is determined that is it missing fully.
-
-       It would be ideal to access the particular component that needs to be implemented.
+       models dictionary. The dependency graph of the cells (see ``compose_recursive_netlist_dependency_graph``) is
+       traversed once from the ``required_models`` of the top-level cell, and every required composed model is
+       visited a single time at any depth. The search does not continue inside a matching target component.
 
        Returns a tuple of ``model_composition_mapping, instance_composition_mapping, target_component_mapping`` in the form of
 
@@ -80,9 +312,10 @@ def compose_recursive_instance_location(
              'mzi_d46c281f': ['mzi_2', 'mzi_3', 'mzi_4']})
 
        Args:
-        recursive_netlist (dict): The hierarchical netlist dictionary.
+        recursive_netlist (dict | RecursiveNetlistIndex): The hierarchical netlist dictionary or its index.
         top_level_instance_name (str): The name of the top-level instance to start the search from.
-        required_models (list): A list of models that need to be included in the recursion.
+        required_models (Optional[list]): The required models of the top-level instance to start the search from.
+            Defaults to all the models required by the top-level instance.
         target_component_prefix (str): The prefix of the component instances to locate.
         models (dict): A dictionary of models provided to aid in the recursion.
 
@@ -93,87 +326,43 @@ def compose_recursive_instance_location(
                 - target_component_mapping (dict): A mapping of target components to their parent components.
 
     """
+    netlist_index = compose_recursive_netlist_index(recursive_netlist)
+    dependency_graph = compose_recursive_netlist_dependency_graph(
+        netlist_index, models=models
+    )
     model_composition_mapping = dict()
     instance_composition_mapping = dict()
     target_component_mapping = dict()
-    i = 0
-
-    while len(required_models) != 0:
-        # if len(required_models) == 0:
-        #     pass
-        #     # Return the results as the recursive iteration is now complete.
-        # else:
-        # TODO Break if required_models cannot be composed and needs to be provided by the user.
-        # This means that the model inside the top_level required model also has a required model that should be
-        # inside the recursive netlist and we need to find it. We iterate over each of the required model names to
-        # see if they match our active component name.
-        for required_model_name_i in required_models:
-            # Appends required_models_i from subcomponent to the required_models input based on the models provided.
-
-            try:
-                required_models_i = sax.get_required_circuit_models(
-                    recursive_netlist[required_model_name_i],
-                    # TODO make this recursive so it can search inside? This will never have to be 2D as all models
-                    #  outside.
-                    models={**models, **model_composition_mapping},
-                )  # eg. ["straight_heater_metal_s_ad3c1693"]
-            except Exception as e:
-                required_models_i = []
-                print(e)
-
-            # Check if required_model_name_i already composed.
-
-            # Check that the model composition mapping has not already fulfilled this model.
-            if len(required_models_i) != 0:
-                if required_model_name_i in model_composition_mapping:
-                    required_models.remove(required_model_name_i)
-                else:
-                    required_models.extend(required_models_i)
-                    model_composition_mapping[required_model_name_i] = required_models_i
-            elif len(required_models_i) == 0:
-                # Remove from ``required_models`` to complete the recursion
-                required_models.remove(required_model_name_i)
-
-            # Get the corresponding instances of this model at this level of recursion.
-            # Implement a function that matches all the potential corresponding matched instances on the top_level
-            instance_composition_mapping_i = get_component_instances(
-                recursive_netlist=recursive_netlist,
-                top_level_prefix=top_level_instance_name,
-                component_name_prefix=required_model_name_i,
-            )  # {'mzi_214beef3': ['mzi_1', 'mzi_5']}
-            instance_composition_mapping.update(instance_composition_mapping_i)
-
-            # This model is now at a particular level of recursion, let's check if this is the model we want in the
-            # required composed models.
-            for required_model_name_i_i in required_models_i:
-                if required_model_name_i_i.startswith(target_component_prefix):
-                    # Yes, this is the model we want. Can we compose the instance location?
-                    target_component_mapping.update(
-                        {required_model_name_i_i: required_model_name_i}
-                    )
-                    # This means we need to check whether the components is our matched component, and if not,
-                    # then we need to check if this other required component recursively also requires our active
-                    # component. Implement the search again recursively from the unmatched components.
-
-            # If the target_component has the corresponding mapping in the recursive_netlist then we can access the
-            # lowest component element
-            if required_model_name_i.startswith(target_component_prefix):
-                if required_model_name_i in target_component_mapping:
-                    instance_composition_mapping_i = get_component_instances(
-                        recursive_netlist=recursive_netlist,
-                        top_level_prefix=target_component_mapping[
-                            required_model_name_i
-                        ],
-                        component_name_prefix=required_model_name_i,
-                    )  # {'mzi_214beef3': ['mzi_1', 'mzi_5']}
-                    instance_composition_mapping.update(instance_composition_mapping_i)
-
-                # Assuming this always occurs at this highest level of hierarchy
-                target_component_mapping.update(
-                    {required_model_name_i: top_level_instance_name}
-                )
-
-        i += 1
+
+    def get_required_components(cell_name: str) -> list[str]:
+        return [
+            component_name
+            for component_name in dependency_graph.successors(cell_name)
+            if component_name not in models
+        ]
+
+    if required_models is None:
+        required_models = get_required_components(top_level_instance_name)
+    parent_cells = {
+        required_model: top_level_instance_name for required_model in required_models
+    }
+    # Breadth-first, so every required model is composed from its shallowest parent cell.
+    pending_models = list(parent_cells)
+    for required_model in pending_models:
+        parent_cell = parent_cells[required_model]
+        instance_composition_mapping[required_model] = dependency_graph.edges[
+            parent_cell, required_model
+        ]["instances"]
+        if required_model.startswith(target_component_prefix):
+            target_component_mapping[required_model] = parent_cell
+            continue
+        required_models_i = get_required_components(required_model)
+        if len(required_models_i) != 0:
+            model_composition_mapping[required_model] = required_models_i
+        for required_model_i in required_models_i:
+            if required_model_i not in parent_cells:
+                parent_cells[required_model_i] = required_model
+                pending_models.append(required_model_i)
 
     return (
         model_composition_mapping,
@@ -183,7 +372,7 @@ def compose_recursive_instance_location(
 
 
 def get_component_instances(
-    recursive_netlist: dict,
+    recursive_netlist: dict | RecursiveNetlistIndex,
     top_level_prefix: str,
     component_name_prefix: str,
 ):
@@ -191,38 +380,33 @@ def get_component_instances(
     Returns a dictionary of all instances of a given component in a recursive netlist.
 
      Args:
-        recursive_netlist (dict): The hierarchical netlist dictionary.
+        recursive_netlist (dict | RecursiveNetlistIndex): The hierarchical netlist dictionary or its index.
         top_level_prefix (str): The prefix of the top-level instance to search under.
         component_name_prefix (str): The prefix of the component instances to find.
 
      Returns:
         dict: A dictionary mapping the component prefix to a list of instance names that match the prefix.
     """
-    # TODO interim function until Floris merges.
-    recursive_netlist_sax = sax.netlist(recursive_netlist)
-    instance_names = []
-    recursive_netlist_root = recursive_netlist_sax.dict()["__root__"]
-    top_level_prefix = get_netlist_instances_by_prefix(
-        recursive_netlist, instance_prefix=top_level_prefix
+    netlist_index = compose_recursive_netlist_index(recursive_netlist)
+    top_level_name = netlist_index.get_cell_by_prefix(
+        top_level_prefix
     )  # Should only be one in a netlist-to-digraph. Can always be very specified.
-    for key in recursive_netlist_root[top_level_prefix]["instances"]:
-        if recursive_netlist_root[top_level_prefix]["instances"][key][
-            "component"
-        ].startswith(component_name_prefix):
-            # Note priority encoding on match.
-            instance_names.append(key)
+    # Note priority encoding on match.
+    instance_names = netlist_index.get_component_instances(
+        top_level_name, component_name_prefix=component_name_prefix
+    )
     return {component_name_prefix: instance_names}
 
 
 def get_netlist_instances_by_prefix(
-    recursive_netlist: dict,
+    recursive_netlist: dict | RecursiveNetlistIndex,
     instance_prefix: str,
 ) -> str:
     """
     Returns a list of all instances with a given prefix in a recursive netlist.
 
     Args:
-        recursive_netlist (dict): The hierarchical netlist dictionary.
+        recursive_netlist (dict | RecursiveNetlistIndex): The hierarchical netlist dictionary or its index.
         instance_prefix (str): The prefix to search for within the netlist instances.
 
     Returns:
@@ -232,35 +416,12 @@ def get_netlist_instances_by_prefix(
         ValueError: If no instance or more than one instance matches the given prefix.
 
     """
-    # TODO interim function until Floris merges.
-    recursive_netlist = sax.netlist(recursive_netlist)
-    recursive_netlist_root = recursive_netlist.dict()["__root__"]
-    result = []
-    for key in recursive_netlist_root.keys():
-        if key.startswith(instance_prefix):
-            result.append(key)
-
-    if len(result) == 1:
-        return result[0]
-    elif len(result) == 0:
-        raise ValueError(
-            "No instances with prefix: "
-            + instance_prefix
-            + " found. These are the available instances: "
-            + str(recursive_netlist_root.keys())
-        )
-    else:
-        print(len(result))
-        raise ValueError(
-            "More than one instance with prefix: "
-            + instance_prefix
-            + "found. These are the matched "
-            "instances: " + str(result)
-        )
+    netlist_index = compose_recursive_netlist_index(recursive_netlist)
+    return netlist_index.get_cell_by_prefix(instance_prefix)
 
 
 def get_matched_model_recursive_netlist_instances(
-    recursive_netlist: dict,
+    recursive_netlist: dict | RecursiveNetlistIndex,
     top_level_instance_prefix: str,
     target_component_prefix: str,
     models: Optional[dict] = None,
@@ -271,9 +432,9 @@ def get_matched_model_recursive_netlist_instances(
     """
     This function returns an active component list with a tuple mapping of the location of the active component
     within the recursive netlist and corresponding model. It will recursively look within a netlist to locate what
-    models use a particular component model. At each stage of recursion, it will compose a list of the elements that
-    implement this matching model in order to relate the model to the instance, and hence the netlist address of the
-    component that needs to be updated in order to functionally implement the model.
+    models use a particular component model, at any depth of hierarchy, in order to relate the model to the instance,
+    and hence the netlist address of the component that needs to be updated in order to functionally implement the
+    model.
 
     It takes in as a set of parameters the recursive_netlist generated by a ``gdsfactory`` netlist implementation.
 
@@ -282,85 +443,39 @@ def get_matched_model_recursive_netlist_instances(
     ("component_lattice_gener_fb8c4da8", "mzi_5", "sxt")] and these are our keys to our sax circuit decomposition.
 
     Args:
-        recursive_netlist (dict): The hierarchical netlist dictionary.
+        recursive_netlist (dict | RecursiveNetlistIndex): The hierarchical netlist dictionary or its index.
         top_level_instance_prefix (str): The prefix of the top-level instance to search under.
         target_component_prefix (str): The prefix of the target component to find.
         models (Optional[dict]): A dictionary of models to aid in the recursion. Defaults to None.
-        custom_subcomponent_instance (Optional[str]): The instance name for subcomponents, used for backwards compatibility.
+        custom_subcomponent_instance (Optional[str]): The instance name for subcomponents, used for backwards
+            compatibility. It is appended to every address that does not already end with it, unless it is None.
 
     Returns:
         list[tuple]: A list of tuples, each containing the hierarchical path to the matched component instances.
-        Each tuple has the form (parent_component, target_instance, custom_subcomponent_instance).
+        Each tuple has the form (top_level_component, *parent_instances, target_instance, custom_subcomponent_instance).
 
     """
-    matched_instance_list = []
     if models is None:
         models = get_default_models()
+    netlist_index = compose_recursive_netlist_index(recursive_netlist)
 
     # We need to input the top-level instance.
     top_level_instance_name = get_netlist_instances_by_prefix(
-        recursive_netlist=recursive_netlist,
+        recursive_netlist=netlist_index,
         instance_prefix=top_level_instance_prefix,
     )
 
-    # We need to input the prefix of the component of the straight metal heater.
-    top_level_required_models = sax.get_required_circuit_models(
-        recursive_netlist[top_level_instance_name],
-        models=models,
-    )
-
-    (
-        model_composition_mapping,
-        instance_composition_mapping,
-        target_component_mapping,
-    ) = compose_recursive_instance_location(
-        recursive_netlist=recursive_netlist,
+    matched_instance_list = compose_recursive_instance_addresses(
+        recursive_netlist=netlist_index,
         top_level_instance_name=top_level_instance_name,
-        required_models=top_level_required_models.copy(),
         target_component_prefix=target_component_prefix,
         models=models,
     )
-
-    # Now we have the raw files that creates the mapping of the components-to-instances, in order to create the
-    # corresponding instance address indexes that we can use to control our matching element parameters.
-    # Currently this onloy assumes up to three levels of hierarchy, TODO make recursive
-    if len(target_component_mapping.keys()) != 0:
-        # This means that the target_component has been mapped to a parent recursive_netlist cell.
-        for target_component_name_i in target_component_mapping.keys():
-            if target_component_name_i.startswith(target_component_prefix):
-                recursive_parent_component_i = target_component_mapping[
-                    target_component_name_i
-                ]  # Get the parent cell.
-
-                for target_instances_i in instance_composition_mapping[
-                    target_component_name_i
-                ]:
-                    matched_instance_list.append(
-                        (
-                            recursive_parent_component_i,
-                            target_instances_i,
-                            custom_subcomponent_instance,
-                        )
-                    )
-            else:
-                # Tells us the name of our component
-                recursive_parent_component_i = target_component_mapping[
-                    target_component_name_i
-                ]  # Get the parent cell.
-                for parent_instances_i in instance_composition_mapping[
-                    recursive_parent_component_i
-                ]:
-                    # TODO check parent_instances_i not in target_component_mapping to increase hierarchy.
-                    # TODO implement as another recursive problem. NMP right now.
-                    for target_instances_i in instance_composition_mapping[
-                        target_component_name_i
-                    ]:
-                        matched_instance_list.append(
-                            (
-                                top_level_instance_name,
-                                parent_instances_i,
-                                target_instances_i,
-                            )
-                        )
-
+    if custom_subcomponent_instance is not None:
+        matched_instance_list = [
+            address
+            if address[-1] == custom_subcomponent_instance
+            else (*address, custom_subcomponent_instance)
+            for address in matched_instance_list
+        ]
     return matched_instance_list
@@ -0,0 +1,251 @@
+"""
+This module composes ``sax`` circuits in which the passive part of every cell of a recursive netlist is evaluated
+once and reused, so that the many identical instances of a cell in a mesh only vary through their active models.
+"""
+
+import inspect
+from typing import Any, Callable, Optional
+import jax
+import networkx as nx
+import numpy as np
+import sax
+from .netlist import (
+    RecursiveNetlistIndex,
+    compose_recursive_netlist_dependency_graph,
+    compose_recursive_netlist_index,
+)
+
+__all__ = [
+    "compose_cached_model",
+    "compose_passive_cached_circuit",
+]
+
+
+def compose_cached_model(model: Callable) -> Callable:
+    """
+    Returns a model that evaluates the S-parameters of ``model`` with its default settings once, and returns these
+    cached S-parameters whenever it is called with settings equal to the defaults. Any other settings, including
+    traced ``jax`` values such as a swept wavelength, are evaluated by ``model``. The cached model has the same
+    signature as ``model``, so that ``sax`` forwards the same settings to it.
+
+    Args:
+        model (Callable): The ``sax`` model to cache.
+
+    Returns:
+        Callable: The cached ``sax`` model.
+    """
+    default_settings = sax.get_settings(model)
+    default_leaves, default_tree = jax.tree_util.tree_flatten(default_settings)
+    cached_s_parameters = model()
+
+    def cached_model(**settings):
+        settings_leaves, settings_tree = jax.tree_util.tree_flatten(
+            sax.merge_dicts(default_settings, settings)
+        )
+        if settings_tree == default_tree and all(
+            not isinstance(settings_leaf, jax.core.Tracer)
+            and np.array_equal(settings_leaf, default_leaf)
+            for settings_leaf, default_leaf in zip(settings_leaves, default_leaves)
+        ):
+            return cached_s_parameters
+        return model(**settings)
+
+    cached_model.__signature__ = inspect.signature(model)
+    return cached_model
+
+
+def _get_instance_component(instance: dict) -> str:
+    # ``sax`` prioritises the model name in the instance info over the component name.
+    info = instance.get("info") or {}
+    return str(info.get("model", instance["component"]))
+
+
+def _split_passive_netlist(
+    cell: dict,
+    active_instance_names: set[str],
+    passive_instance_name: str,
+    passive_model_name: str,
+) -> tuple[dict, dict]:
+    # The passive ports connected to active instances are exposed as ``<instance>__<port>`` passive netlist ports.
+    passive_netlist = {
+        "instances": {
+            instance_name: instance
+            for instance_name, instance in cell["instances"].items()
+            if instance_name not in active_instance_names
+        },
+        "connections": {},
+        "ports": {},
+    }
+    reduced_netlist = {
+        "instances": {
+            passive_instance_name: {"component": passive_model_name},
+            **{
+                instance_name: instance
+                for instance_name, instance in cell["instances"].items()
+                if instance_name in active_instance_names
+            },
+        },
+        "connections": {},
+        "ports": {},
+    }
+
+    def is_active(instance_port: str) -> bool:
+        return instance_port.split(",")[0] in active_instance_names
+
+    for instance_port_0, instance_port_1 in cell["connections"].items():
+        if not is_active(instance_port_0) and not is_active(instance_port_1):
+            passive_netlist["connections"][instance_port_0] = instance_port_1
+        elif is_active(instance_port_0) and is_active(instance_port_1):
+            reduced_netlist["connections"][instance_port_0] = instance_port_1
+        else:
+            passive_port, active_port = (
+                (instance_port_0, instance_port_1)
+                if is_active(instance_port_1)
+                else (instance_port_1, instance_port_0)
+            )
+            exposed_port = passive_port.replace(",", "__")
+            passive_netlist["ports"][exposed_port] = passive_port
+            reduced_netlist["connections"][
+                passive_instance_name + "," + exposed_port
+            ] = active_port
+
+    for port, instance_port in cell["ports"].items():
+        if is_active(instance_port):
+            reduced_netlist["ports"][port] = instance_port
+        else:
+            passive_netlist["ports"][port] = instance_port
+            reduced_netlist["ports"][port] = passive_instance_name + "," + port
+
+    return passive_netlist, reduced_netlist
+
+
+def compose_passive_cached_circuit(
+    netlist: dict | RecursiveNetlistIndex,
+    models: Optional[dict] = None,
+    parameter_key: str = "active_phase_rad",
+    backend: Optional[str] = None,
+    return_type: str = "sdict",
+    ignore_missing_ports: bool = False,
+) -> tuple[Callable, Any]:
+    """
+    Composes a ``sax`` circuit of a recursive netlist in which the passive part of every repeated cell is evaluated
+    once and shared by all the instances of that cell. It is a drop-in replacement of ``sax.circuit`` for meshes such
+    as lattices, in which many instances of the same ``mzi`` cell only differ through their ``parameter_key`` settings.
+
+    A model is active if it has a ``parameter_key`` setting, and a cell is active if any of its instances is active.
+    The cells are visited once in post-order of the dependency graph, and the cells instanced more than once within
+    the top-level cell, across all the hierarchy levels, are deduplicated:
+
+    - A passive cell is compiled and replaced by a ``compose_cached_model`` model, so all its instances share a
+      single evaluation.
+    - The passive instances of an active cell are split into a ``<cell>__passive`` cached model, and the cell is
+      reduced to this model connected to the active instances, which keep their names.
+
+    The active instance addresses and settings are hence the same as in ``sax.circuit``, eg.
+    ``{"mzi_1": {"sxt": {"active_phase_rad": 0}}}``, whereas the settings of the passive instances of a reduced cell
+    are nested under its ``passive`` instance. Every split cell is analysed by ``sax`` as two circuits, so the first
+    compilation is slower than with ``sax.circuit``, but the subsequent evaluations are faster.
+
+    Args:
+        netlist (dict | RecursiveNetlistIndex): The (recursive) netlist dictionary or its index. The first cell is
+            the top-level cell, as in ``sax.circuit``.
+        models (Optional[dict]): The models dictionary. Defaults to None.
+        parameter_key (str): The setting that identifies the active models. Defaults to "active_phase_rad".
+        backend (Optional[str]): The ``sax`` circuit backend. Defaults to None, in which case the default backend of
+            ``sax.circuit`` is used.
+        return_type (str): The ``sax`` circuit return type. Defaults to "sdict".
+        ignore_missing_ports (bool): Whether to ignore the netlist ports missing from the models. Defaults to False.
+
+    Returns:
+        tuple[Callable, Any]: The ``sax`` circuit and its related information.
+    """
+    if isinstance(netlist, dict) and "instances" in netlist:
+        # A flat netlist is the single top-level cell of a recursive netlist.
+        netlist = {"top_level": netlist}
+    netlist_index = compose_recursive_netlist_index(netlist)
+    composed_models = dict(models or {})
+    top_level_cell_name = next(iter(netlist_index.cells))
+    dependency_graph = compose_recursive_netlist_dependency_graph(
+        netlist_index, models=composed_models
+    )
+    circuit_kwargs = {"ignore_missing_ports": ignore_missing_ports}
+    if backend is not None:
+        circuit_kwargs["backend"] = backend
+
+    # The amount of times each cell is instanced within the top-level cell, across all the hierarchy levels.
+    instance_amounts = {top_level_cell_name: 1}
+    for cell_name in nx.topological_sort(
+        dependency_graph.subgraph(
+            {
+                top_level_cell_name,
+                *nx.descendants(dependency_graph, top_level_cell_name),
+            }
+        )
+    ):
+        for component_name, instance_names in dependency_graph[cell_name].items():
+            instance_amounts[component_name] = instance_amounts.get(
+                component_name, 0
+            ) + len(instance_names["instances"]) * instance_amounts.get(cell_name, 0)
+
+    active_components = {
+        model_name
+        for model_name, model in composed_models.items()
+        if parameter_key in sax.get_settings(model)
+    }
+    reduced_cells = dict()
+    for cell_name in nx.dfs_postorder_nodes(
+        dependency_graph, source=top_level_cell_name
+    ):
+        if cell_name in composed_models or cell_name not in netlist_index.cells:
+            # Leaf models are used as provided.
+            continue
+        cell = netlist_index.cells[cell_name]
+        active_instance_names = {
+            instance_name
+            for instance_name, instance in cell["instances"].items()
+            if _get_instance_component(instance) in active_components
+        }
+        if len(active_instance_names) != 0:
+            active_components.add(cell_name)
+
+        if instance_amounts[cell_name] < 2 or len(active_instance_names) == len(
+            cell["instances"]
+        ):
+            # Splitting a cell only pays off when its passive part is shared by several instances.
+            reduced_cells[cell_name] = cell
+            continue
+
+        if len(active_instance_names) == 0:
+            passive_circuit, _ = sax.circuit(
+                netlist=cell, models=composed_models, **circuit_kwargs
+            )
+            composed_models[cell_name] = compose_cached_model(passive_circuit)
+            continue
+
+        passive_instance_name = "passive"
+        while passive_instance_name in cell["instances"]:
+            passive_instance_name = "_" + passive_instance_name
+        passive_model_name = cell_name + "__passive"
+        passive_netlist, reduced_netlist = _split_passive_netlist(
+            cell,
+            active_instance_names=active_instance_names,
+            passive_instance_name=passive_instance_name,
+            passive_model_name=passive_model_name,
+        )
+        passive_circuit, _ = sax.circuit(
+            netlist=passive_netlist, models=composed_models, **circuit_kwargs
+        )
+        composed_models[passive_model_name] = compose_cached_model(passive_circuit)
+        reduced_cells[cell_name] = reduced_netlist
+
+    # The top-level cell is the first cell of the recursive netlist.
+    reduced_recursive_netlist = {
+        top_level_cell_name: reduced_cells.pop(top_level_cell_name),
+        **reduced_cells,
+    }
+    return sax.circuit(
+        netlist=reduced_recursive_netlist,
+        models=composed_models,
+        return_type=return_type,
+        **circuit_kwargs,
+    )
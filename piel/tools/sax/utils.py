@@ -1,12 +1,17 @@
 """
 This file provides a set of utilities that allow much easier integration between `sax` and the relevant tools that we use.
 """
+
+import functools
+import jax
 import jax.numpy as jnp
+import numpy as np
 import sax
+from .netlist import address_value_dictionary_to_function_parameter_dictionary
 from ..gdsfactory.netlist import get_matched_ports_tuple_index
 from ...utils import round_complex_array
-from ...types import SParameterMatrixTuple
-from typing import Optional  # NOQA : F401
+from ...types import OpticalTransmissionCircuit, PortsTuple, SParameterMatrixTuple
+from typing import Callable, Optional  # NOQA : F401
 
 
 def get_sdense_ports_index(input_ports_order: tuple, all_ports_index: dict) -> dict:
@@ -48,12 +53,139 @@ def get_sdense_ports_index(input_ports_order: tuple, all_ports_index: dict) -> d
     return input_ports_index
 
 
+@functools.partial(jax.jit, static_argnums=1)
+def _stack_s_parameter_entries(
+    entries: tuple, matrix_shape: tuple[int, int]
+) -> jnp.ndarray:
+    # Broadcasts and stacks the row-major matrix entries in a single dispatch.
+    entries = jnp.broadcast_arrays(*entries)
+    return jnp.stack(entries, axis=-1).reshape(entries[0].shape + matrix_shape)
+
+
+class SParameterPortPlan:
+    """
+    Precomputes the output and input port indexes that ``sax_to_s_parameters_standard_matrix`` selects from a ``sax``
+    S-parameter representation, so that the port selection is resolved once for a circuit and reused for all the
+    evaluations of a sweep, in which the port layout does not change.
+
+    .. code-block:: python
+
+        port_plan = SParameterPortPlan.from_sax_input(circuit())
+        s_parameters_standard_matrix = port_plan(circuit(wl=wavelength_array))
+
+    The plan selects the ports with the same rules as ``sax_to_s_parameters_standard_matrix``: the ``in`` and ``out``
+    prefixed ports sorted by name by default, or the ``input_ports_order`` inputs and all the remaining outputs in the
+    name order. Applying the plan is a single gather with static indexes, so it supports any leading batch
+    dimensions and can be traced within ``jax.jit``. ``SDict`` inputs are gathered directly from their entries without
+    composing the full dense matrix.
+
+    Args:
+        sdense_ports_index (dict): The ports index dictionary returned by ``sax.sdense``.
+        input_ports_order (tuple[str] | None): The ports order tuple containing the names and order of the input ports.
+    """
+
+    def __init__(
+        self,
+        sdense_ports_index: dict,
+        input_ports_order: tuple[str] | None = None,
+    ):
+        if input_ports_order is not None:
+            # The remaining ports are sorted by name, as with the prefix selection, so that the output ports order
+            # does not depend on the ``sax`` dictionary ordering.
+            output_ports_order = tuple(
+                sorted(
+                    port for port in sdense_ports_index if port not in input_ports_order
+                )
+            )
+            input_ports_index, input_ports_order = get_matched_ports_tuple_index(
+                ports_index=sdense_ports_index,
+                selected_ports_tuple=input_ports_order,
+                sorting_algorithm="selected_ports",
+            )
+            output_ports_index, output_ports_order = get_matched_ports_tuple_index(
+                ports_index=sdense_ports_index,
+                selected_ports_tuple=output_ports_order,
+                sorting_algorithm="selected_ports",
+            )
+        else:
+            input_ports_index, input_ports_order = get_matched_ports_tuple_index(
+                ports_index=sdense_ports_index, prefix="in"
+            )
+            output_ports_index, output_ports_order = get_matched_ports_tuple_index(
+                ports_index=sdense_ports_index, prefix="out"
+            )
+
+        if len(output_ports_index) == 0 or len(input_ports_index) == 0:
+            raise TypeError(
+                "Verify your network composition contains `out` keywords. This can be caused by the network topology. "
+                "Ports: " + str(tuple(sdense_ports_index))
+            )
+
+        self.sdense_ports_index: dict = dict(sdense_ports_index)
+        self.input_ports_order: PortsTuple = tuple(input_ports_order)
+        self.output_ports_order: PortsTuple = tuple(output_ports_order)
+        self.input_ports_index: np.ndarray = np.asarray(input_ports_index, dtype=int)
+        self.output_ports_index: np.ndarray = np.asarray(output_ports_index, dtype=int)
+
+    @classmethod
+    def from_sax_input(
+        cls,
+        sax_input: sax.SType,
+        input_ports_order: tuple[str] | None = None,
+    ) -> "SParameterPortPlan":
+        """
+        Composes the port plan from the ports of a ``sax`` S-parameter representation.
+
+        Args:
+            sax_input (sax.SType): The sax S-parameter representation.
+            input_ports_order (tuple[str] | None): The names and order of the input ports.
+
+        Returns:
+            SParameterPortPlan: The port plan.
+        """
+        if isinstance(sax_input, dict):
+            # The dense index of an ``SDict`` follows the first appearance of each port, so the matrix is not composed.
+            ports = dict.fromkeys(port for port_pair in sax_input for port in port_pair)
+            sdense_ports_index = {port: index for index, port in enumerate(ports)}
+        else:
+            _, sdense_ports_index = sax.sdense(sax_input)
+        return cls(sdense_ports_index, input_ports_order=input_ports_order)
+
+    def __call__(self, sax_input: sax.SType) -> jnp.ndarray:
+        """
+        Selects the ``(..., n_out, n_in)`` standard S-parameter matrix from a ``sax`` S-parameter representation with
+        the same port layout as the plan.
+
+        Args:
+            sax_input (sax.SType): The sax S-parameter representation, with any leading batch dimensions.
+
+        Returns:
+            jnp.ndarray: The standard S-parameter matrix.
+        """
+        if isinstance(sax_input, dict):
+            return _stack_s_parameter_entries(
+                tuple(
+                    sax_input.get((output_port, input_port), 0.0)
+                    for output_port in self.output_ports_order
+                    for input_port in self.input_ports_order
+                ),
+                (len(self.output_ports_order), len(self.input_ports_order)),
+            )
+        dense_s_parameter_matrix, _ = sax.sdense(sax_input)
+        return jnp.asarray(dense_s_parameter_matrix)[
+            ...,
+            self.output_ports_index[:, None],
+            self.input_ports_index[None, :],
+        ]
+
+
 def sax_to_s_parameters_standard_matrix(
     sax_input: sax.SType,
     input_ports_order: tuple[str] | None = None,
     round_int: bool | None = None,
+    port_plan: Optional["SParameterPortPlan"] = None,
     *args,
-    **kwargs
+    **kwargs,
 ) -> SParameterMatrixTuple:
     """
     A ``sax`` S-parameter SDict is provided as a dictionary of tuples with (port0, port1) as the key. This
@@ -144,73 +276,251 @@ def sax_to_s_parameters_standard_matrix(
         sax_input (sax.SType): The sax S-parameter dictionary.
         input_ports_order (tuple): The ports order tuple containing the names and order of the input ports.
         round_int (bool): Whether to round the complex numbers to integers.
+        port_plan (Optional[SParameterPortPlan]): A precomputed port plan to reuse across a sweep. Defaults to composing
+            one from the ``sax_input`` ports.
 
     Returns:
         tuple: The S-parameter matrix and the input ports index tuple in the standard S-parameter notation.
     """
-    dense_s_parameter_matrix, dense_s_parameter_index = sax.sdense(sax_input)
-    # print(dense_s_parameter_index)
-    all_ports_list = dense_s_parameter_index.keys()
-    # Now we get the indexes of the input ports that we care about to restructure the dense matrix with the columns
-    # we care about.
-    if input_ports_order is not None:
-        output_ports_order = tuple(set(all_ports_list) - set(input_ports_order))
-        (
-            input_ports_index_tuple_order,
-            input_matched_ports_name_tuple_order,
-        ) = get_matched_ports_tuple_index(
-            ports_index=dense_s_parameter_index,
-            selected_ports_tuple=input_ports_order,
-            sorting_algorithm="selected_ports",
+    if port_plan is None:
+        port_plan = SParameterPortPlan.from_sax_input(
+            sax_input, input_ports_order=input_ports_order
         )
-        (
-            output_ports_index_tuple_order,
-            output_matched_ports_name_tuple_order,
-        ) = get_matched_ports_tuple_index(
-            ports_index=dense_s_parameter_index,
-            selected_ports_tuple=output_ports_order,
-            sorting_algorithm="selected_ports",
+    # The SDense rows and columns that we care about are selected together in a single gather.
+    s_parameters_standard_matrix = port_plan(sax_input)
+
+    if round_int:
+        s_parameters_standard_matrix = round_complex_array(
+            s_parameters_standard_matrix, **kwargs
         )
-    else:
-        (
-            input_ports_index_tuple_order,
-            input_matched_ports_name_tuple_order,
-        ) = get_matched_ports_tuple_index(
-            ports_index=dense_s_parameter_index, prefix="in"
+
+    value = s_parameters_standard_matrix, port_plan.input_ports_order
+    return value
+
+
+snet = sax_to_s_parameters_standard_matrix
+
+
+def compose_switch_phase_executable(
+    circuit: OpticalTransmissionCircuit,
+    switch_instance_list: list[tuple],
+    input_ports_order: tuple[str] | None = None,
+    parameter_key: str = "active_phase_rad",
+) -> tuple[Callable, PortsTuple]:
+    """
+    Composes a ``jax.jit`` compiled function that maps a flat array of phases, in the order of the
+    ``switch_instance_list``, to the standard S-parameter matrix of the ``circuit``. The nested function parameter
+    dictionary is only composed while tracing, so subsequent calls with the same array shape do not re-trace the
+    circuit.
+
+    .. code-block:: python
+
+        switch_instance_list = [
+            ("component_lattice_gener_fb8c4da8", "mzi_1", "sxt"),
+            ("component_lattice_gener_fb8c4da8", "mzi_5", "sxt"),
+        ]
+        executable, ports_order = compose_switch_phase_executable(
+            circuit=circuit,
+            switch_instance_list=switch_instance_list,
+        )
+        s_parameters_standard_matrix = executable(jnp.array([0, jnp.pi]))
+
+    The ports order is determined by evaluating the executable once on zero phases, which also compiles it.
+
+    Args:
+        circuit (OpticalTransmissionCircuit): The ``sax`` circuit.
+        switch_instance_list (list[tuple]): The list of switch instance addresses that define the phase order.
+        input_ports_order (tuple): The ports order tuple containing the names and order of the input ports.
+        parameter_key (str): The phase parameter name of the switch models.
+
+    Returns:
+        tuple[Callable, PortsTuple]: The compiled executable and the input ports order.
+    """
+    switch_instance_list = list(switch_instance_list)
+    ports_order = list()
+
+    def switch_phase_function(phases):
+        function_parameter_dictionary = (
+            address_value_dictionary_to_function_parameter_dictionary(
+                address_value_dictionary={
+                    instance_address_i: phases[i]
+                    for i, instance_address_i in enumerate(switch_instance_list)
+                },
+                parameter_key=parameter_key,
+            )
         )
         (
-            output_ports_index_tuple_order,
-            output_matched_ports_name_tuple_order,
-        ) = get_matched_ports_tuple_index(
-            ports_index=dense_s_parameter_index, prefix="out"
+            s_parameters_standard_matrix,
+            ports_order_i,
+        ) = sax_to_s_parameters_standard_matrix(
+            circuit(**function_parameter_dictionary),
+            input_ports_order=input_ports_order,
         )
+        # The ports order is static, so it is recorded while tracing.
+        ports_order[:] = ports_order_i
+        return s_parameters_standard_matrix
+
+    executable = jax.jit(switch_phase_function)
+    executable(jnp.zeros(len(switch_instance_list)))
+    return executable, tuple(ports_order)
+
+
+def compose_switch_phase_unitary_function(
+    circuit: OpticalTransmissionCircuit,
+    switch_instance_list: list[tuple],
+    input_ports_order: tuple[str] | None = None,
+    parameter_key: str = "active_phase_rad",
+) -> tuple[Callable, PortsTuple]:
+    """
+    Composes a function that maps an array of phases of shape ``(..., n_switches)``, in the order of the
+    ``switch_instance_list``, to the ``(..., n_out, n_in)`` standard S-parameter matrices of the ``circuit``. Unlike
+    ``compose_switch_phase_executable``, any leading batch dimensions are evaluated in a single circuit call, relying on
+    the native ``sax`` broadcasting, and the matrix is gathered directly from the S-parameter dictionary entries. The
+    function can be differentiated in forward mode with ``jax.jvp``.
+
+    The ports are determined by evaluating the circuit once on zero phases.
 
-    output_ports_index_tuple_order_jax = jnp.asarray(output_ports_index_tuple_order)
-    input_ports_index_tuple_order_jax = jnp.asarray(input_ports_index_tuple_order)
-    # We now select the SDense columns that we care about.
-    try:
-        s_parameters_standard_matrix = dense_s_parameter_matrix.at[
-            output_ports_index_tuple_order_jax
-        ].get()
-    except TypeError:
-        print("sax_input: " + str(sax_input))
-        print("all_ports_list: " + str(all_ports_list))
-        print("output_ports_index_tuple_order: " + str(output_ports_index_tuple_order))
-        raise TypeError(
-            "Verify your network composition contains `out` keywords. This can be caused by the network topology."
+    Args:
+        circuit (OpticalTransmissionCircuit): The ``sax`` circuit.
+        switch_instance_list (list[tuple]): The list of switch instance addresses that define the phase order.
+        input_ports_order (tuple): The ports order tuple containing the names and order of the input ports.
+        parameter_key (str): The phase parameter name of the switch models.
+
+    Returns:
+        tuple[Callable, PortsTuple]: The batched function and the input ports order.
+    """
+    switch_instance_list = list(switch_instance_list)
+
+    def compose_function_parameter_dictionary(phases):
+        return address_value_dictionary_to_function_parameter_dictionary(
+            address_value_dictionary={
+                instance_address_i: phases[..., i]
+                for i, instance_address_i in enumerate(switch_instance_list)
+            },
+            parameter_key=parameter_key,
         )
-    s_parameters_standard_matrix = s_parameters_standard_matrix.at[
-        :, input_ports_index_tuple_order_jax
-    ].get()
-    # Now we select the SDense rows that we care about after transposing the matrix.
 
-    if round_int:
-        s_parameters_standard_matrix = round_complex_array(
-            s_parameters_standard_matrix, **kwargs
+    # The ports follow the same selection as ``sax_to_s_parameters_standard_matrix``.
+    port_plan = SParameterPortPlan.from_sax_input(
+        circuit(
+            **compose_function_parameter_dictionary(
+                jnp.zeros(len(switch_instance_list))
+            )
+        ),
+        input_ports_order=input_ports_order,
+    )
+
+    def switch_phase_unitary_function(phases):
+        phases = jnp.asarray(phases)
+        s_dictionary = sax.sdict(
+            circuit(**compose_function_parameter_dictionary(phases))
+        )
+        return jnp.broadcast_to(
+            port_plan(s_dictionary),
+            phases.shape[:-1]
+            + (len(port_plan.output_ports_order), len(port_plan.input_ports_order)),
         )
 
-    value = s_parameters_standard_matrix, input_matched_ports_name_tuple_order
-    return value
+    return switch_phase_unitary_function, port_plan.input_ports_order
 
 
-snet = sax_to_s_parameters_standard_matrix
+def calculate_wavelength_sweep_s_parameters(
+    circuit: OpticalTransmissionCircuit,
+    wavelength_array: jnp.ndarray,
+    switch_instance_list: list[tuple] | None = None,
+    switch_phase_array: jnp.ndarray | None = None,
+    input_ports_order: tuple[str] | None = None,
+    chunk_size: int | None = None,
+    parameter_key: str = "active_phase_rad",
+    wavelength_key: str = "wl",
+) -> SParameterMatrixTuple:
+    """
+    Evaluates the standard S-parameter matrices of a ``sax`` circuit over an array of wavelengths, and optionally over
+    an array of switch phase configurations, in vectorized circuit calls rather than a loop per wavelength.
+
+    .. code-block:: python
+
+        s_parameters_standard_matrices, ports_order = calculate_wavelength_sweep_s_parameters(
+            circuit=circuit,
+            wavelength_array=jnp.linspace(1.5, 1.6, 101),
+        )
+        # s_parameters_standard_matrices.shape == (101, n_out, n_in)
+
+    The wavelength is passed as the ``wavelength_key`` global setting of the circuit, which ``sax`` forwards to every
+    model that accepts it. The ``klu`` backend only supports a single batch dimension, so the wavelength and phase grid
+    is flattened into one batch axis, evaluated in chunks of at most ``chunk_size`` points to bound the device memory,
+    and converted with a single ``SParameterPortPlan``.
+
+    Args:
+        circuit (OpticalTransmissionCircuit): The ``sax`` circuit.
+        wavelength_array (jnp.ndarray): The ``(n_wl,)`` wavelengths.
+        switch_instance_list (list[tuple] | None): The switch instance addresses that define the phase order.
+        switch_phase_array (jnp.ndarray | None): The ``(n_configs, n_switches)`` phase configurations.
+        input_ports_order (tuple[str] | None): The ports order tuple containing the names and order of the input ports.
+        chunk_size (int | None): The maximum amount of grid points per circuit call. Defaults to a single call.
+        parameter_key (str): The phase parameter name of the switch models.
+        wavelength_key (str): The wavelength parameter name of the circuit.
+
+    Returns:
+        SParameterMatrixTuple: The ``(n_wl, n_out, n_in)`` matrices, or the ``(n_configs, n_wl, n_out, n_in)``
+        matrices when phase configurations are provided, and the input ports order.
+    """
+    wavelength_array = jnp.ravel(jnp.asarray(wavelength_array))
+    wavelength_amount = len(wavelength_array)
+    if switch_phase_array is None:
+        configuration_shape = ()
+        wavelength_grid = wavelength_array
+        phase_grid = None
+    else:
+        if switch_instance_list is None:
+            raise ValueError(
+                "A switch_instance_list is required to apply the switch_phase_array."
+            )
+        switch_phase_array = jnp.asarray(switch_phase_array).reshape(
+            -1, len(switch_instance_list)
+        )
+        configuration_shape = (len(switch_phase_array),)
+        # The wavelength varies fastest, so the flat grid reshapes to (n_configs, n_wl).
+        wavelength_grid = jnp.tile(wavelength_array, len(switch_phase_array))
+        phase_grid = jnp.repeat(switch_phase_array, wavelength_amount, axis=0)
+
+    grid_amount = len(wavelength_grid)
+    if chunk_size is None:
+        chunk_size = grid_amount
+
+    port_plan = None
+    s_parameters_standard_matrix_chunks = list()
+    for chunk_start in range(0, grid_amount, chunk_size):
+        chunk = slice(chunk_start, chunk_start + chunk_size)
+        function_parameter_dictionary = {wavelength_key: wavelength_grid[chunk]}
+        if phase_grid is not None:
+            function_parameter_dictionary.update(
+                address_value_dictionary_to_function_parameter_dictionary(
+                    address_value_dictionary={
+                        instance_address_i: phase_grid[chunk, i]
+                        for i, instance_address_i in enumerate(switch_instance_list)
+                    },
+                    parameter_key=parameter_key,
+                )
+            )
+        sax_s_parameters = circuit(**function_parameter_dictionary)
+        if port_plan is None:
+            port_plan = SParameterPortPlan.from_sax_input(
+                sax_s_parameters, input_ports_order=input_ports_order
+            )
+        s_parameters_standard_matrix_chunks.append(
+            jnp.broadcast_to(
+                port_plan(sax_s_parameters),
+                (len(wavelength_grid[chunk]),)
+                + (len(port_plan.output_ports_order), len(port_plan.input_ports_order)),
+            )
+        )
+
+    s_parameters_standard_matrices = jnp.concatenate(
+        s_parameters_standard_matrix_chunks, axis=0
+    ).reshape(
+        configuration_shape
+        + (wavelength_amount,)
+        + (len(port_plan.output_ports_order), len(port_plan.input_ports_order))
+    )
+    return s_parameters_standard_matrices, port_plan.input_ports_order
@@ -1 +1,11 @@
-from .operations import unitary_permanent
+from .operations import (
+    unitary_permanent,
+    unitary_permanent_batch,
+    unitary_permanent_repeated,
+)
+from .sampling import (
+    compose_gray_code_subset_row_sums,
+    output_probability_distribution,
+    output_transition_amplitudes,
+    sample_output_fock_states,
+)
@@ -2,6 +2,7 @@ import jax.numpy as jnp
 import time
 import thewalrus
 import numpy as np
+from scipy.special import comb
 
 
 def unitary_permanent(
@@ -31,3 +32,125 @@ def unitary_permanent(
     end_time = time.time()
     computed_time = end_time - start_time
     return circuit_permanent, computed_time
+
+
+def unitary_permanent_batch(
+    unitary_matrices: jnp.ndarray,
+    maximum_vectorized_size: int = 10,
+) -> np.ndarray:
+    """
+    Computes the permanents of a batch of square matrices of identical size with shape ``(..., n, n)``.
+
+    For ``n <= maximum_vectorized_size``, Ryser's formula is evaluated for the whole batch at once by enumerating all
+    the column subsets :math:`S` of the matrix:
+
+    .. math ::
+
+        \\text{per}(A) = (-1)^n \\sum_{S \\subseteq \\{1,\\dots,n\\}} (-1)^{|S|} \\prod_{i=1}^n \\sum_{j \\in S} a_{ij}
+
+    The subset row sums are shared by all the matrices in the batch, which requires :math:`O(b n 2^n)` memory for a
+    batch of :math:`b` matrices. Larger matrices are computed one by one with ``thewalrus.perm``.
+
+    Args:
+        unitary_matrices (jnp.ndarray): The batch of square matrices.
+        maximum_vectorized_size (int): The largest matrix size that is computed in the vectorized form.
+
+    Returns:
+        np.ndarray: The permanents with the batch shape of ``unitary_matrices``.
+    """
+    unitary_matrices = np.asarray(unitary_matrices, dtype=complex)
+    batch_shape = unitary_matrices.shape[:-2]
+    size = unitary_matrices.shape[-1]
+    if unitary_matrices.shape[-2] != size:
+        raise ValueError("The permanent is only defined for square matrices.")
+    if size == 0:
+        return np.ones(batch_shape, dtype=complex)
+
+    unitary_matrices = unitary_matrices.reshape(-1, size, size)
+    if size > maximum_vectorized_size:
+        permanents = np.array(
+            [thewalrus.perm(matrix) for matrix in unitary_matrices], dtype=complex
+        )
+        return permanents.reshape(batch_shape)
+
+    # Every non-empty column subset as a binary selection mask of shape (2**n - 1, n).
+    subsets = (np.arange(1, 2**size)[:, None] >> np.arange(size)) & 1
+    signs = (-1.0) ** (size - subsets.sum(axis=1))
+    subset_row_sums = unitary_matrices @ subsets.T
+    permanents = np.prod(subset_row_sums, axis=1) @ signs
+    return permanents.reshape(batch_shape)
+
+
+def unitary_permanent_repeated(
+    unitary_matrices: jnp.ndarray,
+    rows_multiplicity: tuple[int, ...],
+    columns_multiplicity: tuple[int, ...],
+) -> np.ndarray:
+    """
+    Computes the permanents of the matrices built by repeating the row :math:`r` of each ``(..., R, C)`` matrix
+    :math:`m_r` times and its column :math:`c` :math:`n_c` times, without expanding them. This is the permanent
+    required by the transition amplitudes between bunched Fock states, where the multiplicities are the mode
+    occupations, so :math:`\\sum_r m_r = \\sum_c n_c = N` photons.
+
+    Ryser's formula is evaluated over the multisets of the repeated columns, grouping the identical subsets:
+
+    .. math ::
+
+        \\text{per}(A_{m, n}) = (-1)^N \\sum_{k_1=0}^{n_1} \\dots \\sum_{k_C=0}^{n_C}
+            (-1)^{\\sum_c k_c} \\prod_{c=1}^C \\binom{n_c}{k_c}
+            \\prod_{r=1}^R \\left( \\sum_{c=1}^C k_c a_{rc} \\right)^{m_r}
+
+    which has :math:`\\prod_c (n_c + 1)` terms rather than the :math:`2^N` of the expanded matrix. As the permanent
+    is invariant under transposition, the sum runs over the rows instead whenever it has fewer terms. All the
+    matrices of the batch share the same multiplicities and are computed at once. ``thewalrus.permanent_repeated`` is
+    not used as it repeats the row and the column of the same index of a single square matrix equally, whereas the
+    transitions between different Fock states repeat the rows and columns by different occupations.
+
+    Args:
+        unitary_matrices (jnp.ndarray): The ``(..., R, C)`` matrices of the distinct rows and columns.
+        rows_multiplicity (tuple[int, ...]): The repetitions of each of the ``R`` rows.
+        columns_multiplicity (tuple[int, ...]): The repetitions of each of the ``C`` columns.
+
+    Returns:
+        np.ndarray: The permanents with the batch shape of ``unitary_matrices``.
+    """
+    unitary_matrices = np.asarray(unitary_matrices, dtype=complex)
+    rows_multiplicity = np.asarray(rows_multiplicity, dtype=int)
+    columns_multiplicity = np.asarray(columns_multiplicity, dtype=int)
+    if unitary_matrices.shape[-2:] != (
+        len(rows_multiplicity),
+        len(columns_multiplicity),
+    ):
+        raise ValueError(
+            "The matrix shape must match the amount of rows and columns multiplicities."
+        )
+    photon_amount = int(rows_multiplicity.sum())
+    if photon_amount != int(columns_multiplicity.sum()):
+        raise ValueError(
+            "The repeated matrix is only square if the rows and columns multiplicities have the same sum."
+        )
+    batch_shape = unitary_matrices.shape[:-2]
+    if photon_amount == 0:
+        return np.ones(batch_shape, dtype=complex)
+
+    if np.prod(rows_multiplicity + 1) < np.prod(columns_multiplicity + 1):
+        unitary_matrices = np.swapaxes(unitary_matrices, -1, -2)
+        rows_multiplicity, columns_multiplicity = (
+            columns_multiplicity,
+            rows_multiplicity,
+        )
+
+    # Every column multiset as its repetition counts of shape (prod(n_c + 1), C).
+    column_subsets = np.stack(
+        np.meshgrid(
+            *[np.arange(multiplicity + 1) for multiplicity in columns_multiplicity],
+            indexing="ij",
+        ),
+        axis=-1,
+    ).reshape(-1, len(columns_multiplicity))
+    coefficients = (-1.0) ** (photon_amount - column_subsets.sum(axis=1)) * np.prod(
+        comb(columns_multiplicity, column_subsets), axis=1
+    )
+    subset_row_sums = unitary_matrices @ column_subsets.T
+    subset_products = np.prod(subset_row_sums ** rows_multiplicity[:, None], axis=-2)
+    return subset_products @ coefficients
@@ -0,0 +1,228 @@
+"""
+This module computes the full output photon-number distribution of a linear optical unitary for a given input Fock
+state, and draws exact boson sampling output patterns without enumerating the output basis.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+import numpy as np
+from scipy.special import factorial
+from .operations import unitary_permanent_batch
+from ..qutip.fock import fock_basis_from_photon_number
+from ...types import ArrayTypes, SParameterMatrixTuple
+
+__all__ = [
+    "compose_gray_code_subset_row_sums",
+    "output_probability_distribution",
+    "output_transition_amplitudes",
+    "sample_output_fock_states",
+]
+
+
+def _compose_unitary_matrix(
+    unitary_matrix: ArrayTypes | SParameterMatrixTuple,
+) -> np.ndarray:
+    # Accept the (matrix, ports) tuple returned by ``sax_to_s_parameters_standard_matrix``.
+    if isinstance(unitary_matrix, tuple):
+        unitary_matrix = unitary_matrix[0]
+    return np.asarray(unitary_matrix, dtype=complex)
+
+
+def _compose_input_columns(input_fock_state: ArrayTypes) -> np.ndarray:
+    input_fock_state = np.rint(np.real(np.ravel(np.asarray(input_fock_state)))).astype(
+        int
+    )
+    return np.repeat(np.arange(len(input_fock_state)), input_fock_state)
+
+
+def compose_gray_code_subset_row_sums(
+    matrix: ArrayTypes,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Returns the row sums :math:`v_S = \\sum_{c \\in S} a_{:, c}` of every non-empty column subset :math:`S` of a
+    ``(M, N)`` matrix, enumerated in Gray-code order. Consecutive subsets differ by a single column, so all the row
+    sums are computed as a cumulative sum of signed columns in :math:`O(2^N M)` rather than :math:`O(2^N N M)`.
+
+    Args:
+        matrix (ArrayTypes): The ``(M, N)`` matrix.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: The ``(2^N - 1, M)`` subset row sums and the ``(2^N - 1,)`` subset sizes.
+    """
+    matrix = np.asarray(matrix, dtype=complex)
+    column_amount = matrix.shape[1]
+    gray_codes = np.arange(2**column_amount) ^ (np.arange(2**column_amount) >> 1)
+    # The column toggled between consecutive Gray codes, and whether it is added or removed.
+    toggled_bits = gray_codes[1:] ^ gray_codes[:-1]
+    toggled_columns = np.log2(toggled_bits).astype(int)
+    toggled_signs = np.where(gray_codes[1:] & toggled_bits, 1, -1)
+    subset_row_sums = np.cumsum(
+        toggled_signs[:, None] * matrix[:, toggled_columns].T, axis=0
+    )
+    subset_sizes = np.array(
+        [bin(gray_code).count("1") for gray_code in gray_codes[1:]], dtype=int
+    )
+    return subset_row_sums, subset_sizes
+
+
+def output_transition_amplitudes(
+    unitary_matrix: ArrayTypes | SParameterMatrixTuple,
+    input_fock_state: ArrayTypes,
+    output_fock_states: Optional[ArrayTypes] = None,
+    chunk_size: int = 4096,
+    worker_amount: Optional[int] = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Computes the transition probability amplitudes from a given input Fock state to all the output Fock states of a
+    unitary at once.
+
+    The input photons select the ``N`` (repeated) columns of the unitary, and the permanent of every output pattern
+    :math:`o` is expanded with Ryser's formula over the column subsets :math:`S` of these columns:
+
+    .. math ::
+
+        \\text{per}(U_{o, in}) = (-1)^N \\sum_{S} (-1)^{|S|} \\prod_{r=1}^{M} (v_S)_r^{o_r}
+
+    The subset row sums :math:`v_S` do not depend on the output pattern, so they are computed once in Gray-code order
+    (see ``compose_gray_code_subset_row_sums``) and shared by all the outputs. The subsets are processed in chunks of
+    ``chunk_size``, which are distributed over ``worker_amount`` threads when there is more than one chunk.
+
+    Args:
+        unitary_matrix (ArrayTypes | SParameterMatrixTuple): The ``(M, M)`` unitary, or the tuple returned by
+            ``sax_to_s_parameters_standard_matrix``.
+        input_fock_state (ArrayTypes): The input Fock state occupations.
+        output_fock_states (Optional[ArrayTypes]): The ``(n_states, M)`` output Fock states to compute. Defaults to all
+            the output states with the input photon number, in the ``fock_basis_from_photon_number`` order.
+        chunk_size (int): The amount of column subsets per chunk. Defaults to 4096.
+        worker_amount (Optional[int]): The amount of threads. Defaults to the ``ThreadPoolExecutor`` default.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: The ``(n_states, M)`` output Fock states and their ``(n_states,)`` complex
+        amplitudes.
+    """
+    unitary_matrix = _compose_unitary_matrix(unitary_matrix)
+    mode_amount = unitary_matrix.shape[0]
+    input_columns = _compose_input_columns(input_fock_state)
+    photon_amount = len(input_columns)
+
+    if output_fock_states is None:
+        output_fock_states = fock_basis_from_photon_number(mode_amount, photon_amount)
+    output_fock_states = np.asarray(output_fock_states, dtype=int)
+    if photon_amount == 0:
+        return output_fock_states, (output_fock_states.sum(axis=1) == 0).astype(complex)
+
+    subset_row_sums, subset_sizes = compose_gray_code_subset_row_sums(
+        unitary_matrix[:, input_columns]
+    )
+    subset_signs = (-1.0) ** (photon_amount - subset_sizes)
+
+    def accumulate_permanents(chunk_start: int) -> np.ndarray:
+        chunk = slice(chunk_start, chunk_start + chunk_size)
+        # (n_subsets, n_states) products of the subset row sums raised to the output occupations.
+        subset_products = np.prod(
+            subset_row_sums[chunk, None, :] ** output_fock_states[None, :, :], axis=-1
+        )
+        return subset_signs[chunk] @ subset_products
+
+    chunk_starts = range(0, len(subset_sizes), chunk_size)
+    if len(chunk_starts) == 1:
+        permanents = accumulate_permanents(0)
+    else:
+        with ThreadPoolExecutor(max_workers=worker_amount) as executor:
+            permanents = sum(executor.map(accumulate_permanents, chunk_starts))
+
+    input_fock_state_factorial = np.prod(
+        factorial(np.bincount(input_columns, minlength=mode_amount))
+    )
+    output_fock_state_factorial = np.prod(factorial(output_fock_states), axis=1)
+    amplitudes = permanents / np.sqrt(
+        input_fock_state_factorial * output_fock_state_factorial
+    )
+    return output_fock_states, amplitudes
+
+
+def output_probability_distribution(
+    unitary_matrix: ArrayTypes | SParameterMatrixTuple,
+    input_fock_state: ArrayTypes,
+    output_fock_states: Optional[ArrayTypes] = None,
+    chunk_size: int = 4096,
+    worker_amount: Optional[int] = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Computes the probabilities of all the output Fock states of a unitary for a given input Fock state at once, as the
+    squared magnitudes of the ``output_transition_amplitudes``.
+
+    Args:
+        unitary_matrix (ArrayTypes | SParameterMatrixTuple): The ``(M, M)`` unitary, or the tuple returned by
+            ``sax_to_s_parameters_standard_matrix``.
+        input_fock_state (ArrayTypes): The input Fock state occupations.
+        output_fock_states (Optional[ArrayTypes]): The ``(n_states, M)`` output Fock states to compute. Defaults to all
+            the output states with the input photon number, in the ``fock_basis_from_photon_number`` order.
+        chunk_size (int): The amount of column subsets per chunk. Defaults to 4096.
+        worker_amount (Optional[int]): The amount of threads. Defaults to the ``ThreadPoolExecutor`` default.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: The ``(n_states, M)`` output Fock states and their ``(n_states,)``
+        probabilities.
+    """
+    output_fock_states, amplitudes = output_transition_amplitudes(
+        unitary_matrix,
+        input_fock_state,
+        output_fock_states=output_fock_states,
+        chunk_size=chunk_size,
+        worker_amount=worker_amount,
+    )
+    return output_fock_states, np.abs(amplitudes) ** 2
+
+
+def sample_output_fock_states(
+    unitary_matrix: ArrayTypes | SParameterMatrixTuple,
+    input_fock_state: ArrayTypes,
+    sample_amount: int = 1,
+    seed: Optional[int] = None,
+) -> np.ndarray:
+    """
+    Draws exact boson sampling output Fock states of a unitary for a given input Fock state, without enumerating the
+    output basis, following algorithm B of Clifford and Clifford, "The Classical Complexity of Boson Sampling" (2018).
+
+    The input columns of the unitary are randomly permuted, and the output modes are sampled one photon at a time.
+    The ``k``-th mode is drawn with a weight proportional to :math:`|\\text{per}(A_{r_1 \\dots r_{k-1} i}^{[k]})|^2`,
+    where the permanent of the ``k`` by ``k`` submatrix is expanded along its last row from the ``k`` permanents of
+    its ``k - 1`` by ``k - 1`` minors, which are computed together in a single batched call. A sample hence costs
+    :math:`O(N^2 2^N + M N^2)` operations for ``N`` photons in ``M`` modes.
+
+    Args:
+        unitary_matrix (ArrayTypes | SParameterMatrixTuple): The ``(M, M)`` unitary, or the tuple returned by
+            ``sax_to_s_parameters_standard_matrix``.
+        input_fock_state (ArrayTypes): The input Fock state occupations.
+        sample_amount (int): The amount of samples. Defaults to 1.
+        seed (Optional[int]): The random generator seed. Defaults to None.
+
+    Returns:
+        np.ndarray: The ``(sample_amount, M)`` sampled output Fock states.
+    """
+    unitary_matrix = _compose_unitary_matrix(unitary_matrix)
+    mode_amount = unitary_matrix.shape[0]
+    input_columns = _compose_input_columns(input_fock_state)
+    photon_amount = len(input_columns)
+    random_generator = np.random.default_rng(seed)
+
+    samples = np.zeros((sample_amount, mode_amount), dtype=int)
+    for sample_i in range(sample_amount):
+        matrix = unitary_matrix[:, random_generator.permutation(input_columns)]
+        output_modes = list()
+        for k in range(1, photon_amount + 1):
+            # The permanents of the rows sampled so far, without each of the first k columns in turn.
+            minors = np.stack(
+                [
+                    matrix[np.ix_(output_modes, np.delete(np.arange(k), column))]
+                    for column in range(k)
+                ]
+            )
+            minor_permanents = unitary_permanent_batch(minors)
+            weights = np.abs(matrix[:, :k] @ minor_permanents) ** 2
+            output_modes.append(
+                random_generator.choice(mode_amount, p=weights / weights.sum())
+            )
+        samples[sample_i] = np.bincount(output_modes, minlength=mode_amount)
+    return samples
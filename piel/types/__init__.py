@@ -26,6 +26,7 @@ from .digital import (
     HDLTopLevelLanguage,
     LogicSignalsList,
     LogicImplementationType,
+    LogicMinimizationMethodType,
     TruthTable,
     TruthTableLogicType,
 )
@@ -3,10 +3,12 @@ This module defines files models and types for working with digital circuits and
 It leverages pydantic for model validation and pandas for files manipulation.
 """
 
+import copy
+import numpy as np
 import pandas as pd
-from pydantic import ConfigDict
+from pydantic import ConfigDict, PrivateAttr, field_validator, model_validator
 from typing import Literal, Iterable
-from .core import PielBaseModel, PathTypes
+from .core import ArrayTypes, PielBaseModel, PathTypes
 
 # Type aliases for different types of digital bits and HDL simulators.
 AbstractBitsType = str | bytes | int
@@ -55,22 +57,72 @@ LogicSignalsList: A list of strings representing the names of logic signals.
 
 TruthTableLogicType = Literal["implementation", "full"]
 LogicImplementationType = Literal["combinatorial", "sequential", "memory"]
+LogicMinimizationMethodType = Literal["auto", "quine_mccluskey", "espresso"]
+
+
+def _convert_bits_to_integer_array(bits: Iterable, bit_width: int) -> np.ndarray:
+    # Parses the binary strings of a port column into integers through their unicode code points.
+    bits = np.asarray(list(bits), dtype=f"U{bit_width}")
+    if bit_width > 63:
+        return np.array([int(bits_i, 2) for bits_i in bits], dtype=object)
+    code_points = bits.view(np.uint32).reshape(len(bits), bit_width)
+    if np.any(code_points[:, -1] == 0):
+        # Shorter strings are padded with null code points, so they are zero-filled to the bit width.
+        code_points = (
+            np.char.zfill(bits, bit_width).view(np.uint32).reshape(len(bits), bit_width)
+        )
+    digits = code_points.astype(np.int64) - ord("0")
+    invalid_rows = np.any((digits != 0) & (digits != 1), axis=1)
+    if np.any(invalid_rows):
+        raise ValueError(f"Invalid binary values: {bits[invalid_rows].tolist()}")
+    return digits @ (1 << np.arange(bit_width - 1, -1, -1, dtype=np.int64))
+
+
+def _convert_integer_array_to_bits(
+    integer_array: ArrayTypes, bit_width: int
+) -> list[BitsType]:
+    integer_array = np.asarray(integer_array)
+    if bit_width > 63 or integer_array.dtype == object:
+        return [format(int(value), f"0{bit_width}b") for value in integer_array]
+    shifts = np.arange(bit_width - 1, -1, -1, dtype=np.int64)
+    digits = (integer_array.astype(np.int64)[:, None] >> shifts) & 1
+    code_points = (digits + ord("0")).astype(np.uint32)
+    return np.ascontiguousarray(code_points).view(f"U{bit_width}").ravel().tolist()
+
+
+def _compose_bit_width(integer_array: ArrayTypes) -> int:
+    if len(integer_array) == 0:
+        return 1
+    return max(int(np.max(integer_array)).bit_length(), 1)
 
 
 class TruthTable(PielBaseModel):
     """
     A model representing a truth table for a digital circuit, including its input and output ports.
 
+    The port columns can either be provided as extra fields of binary strings, eg. ``detector_in=["00", "01"]``, or
+    as packed integer arrays through the columnar ``port_arrays`` field, with the bit width of each port in
+    ``port_bit_widths``. The views of the columnar form are composed on first access and cached until the model is
+    modified, and copies of them are returned so that modifying a view does not modify the cache. The views of the
+    binary string form are composed on every access, as its lists can be modified in place. ``to_columnar`` and ``to_bits`` convert between both forms without loss for ports of binary strings
+    with a consistent bit width.
+
     Attributes:
         input_ports (LogicSignalsList): List of input signal names for the truth table.
         output_ports (LogicSignalsList): List of output signal names for the truth table.
+        port_arrays (dict[str, ArrayTypes]): The packed integer values of each port, of shape ``(n_rows,)``.
+        port_bit_widths (dict[str, int]): The bit width of each port of ``port_arrays``.
 
     Properties:
         keys_list (list[str]): A combined list of input and output signal names.
         dataframe (pd.DataFrame): A pandas DataFrame representation of the truth table, excluding input and output ports.
         implementation_dictionary (dict): A dictionary including only the keys specified within input_ports and output_ports.
+        integer_dictionary (dict[str, np.ndarray]): The packed integer values of each port.
+        bit_width_dictionary (dict[str, int]): The bit width of each port.
     """
 
+    # Lazily composed port and dataframe views
+    _cache: dict = PrivateAttr(default_factory=dict)
     model_config = ConfigDict(extra="allow")
 
     input_ports: LogicSignalsList
@@ -83,6 +135,73 @@ class TruthTable(PielBaseModel):
     output_ports (LogicSignalsList): List of output signal names for the truth table.
     """
 
+    port_arrays: dict[str, ArrayTypes] | None = None
+    """
+    port_arrays (dict[str, ArrayTypes]): The packed integer values of each port, of shape ``(n_rows,)``.
+    """
+
+    port_bit_widths: dict[str, int] | None = None
+    """
+    port_bit_widths (dict[str, int]): The bit width of each port of ``port_arrays``. Defaults to the bit length of
+    the largest value of each port.
+    """
+
+    @field_validator("port_arrays")
+    @classmethod
+    def read_only_port_arrays(cls, value):
+        if value is None:
+            return value
+        port_arrays = dict()
+        for port, port_array in value.items():
+            if isinstance(port_array, np.ndarray):
+                port_array = port_array.view()
+                port_array.flags.writeable = False
+            port_arrays[port] = port_array
+        return port_arrays
+
+    @model_validator(mode="after")
+    def validate_port_arrays(self):
+        if self.port_arrays is None:
+            if self.port_bit_widths is not None:
+                raise ValueError("port_bit_widths requires port_arrays.")
+            return self
+
+        for port in self.ports_list:
+            if port not in self.port_arrays:
+                raise ValueError(f"Port '{port}' not found in port_arrays.")
+            if self.model_extra and port in self.model_extra:
+                raise ValueError(
+                    f"Port '{port}' is provided both as bits and in port_arrays."
+                )
+        row_amounts = {len(port_array) for port_array in self.port_arrays.values()}
+        if len(row_amounts) > 1:
+            raise ValueError(
+                f"The port_arrays have different lengths: {sorted(row_amounts)}."
+            )
+        return self
+
+    def __setattr__(self, name, value):
+        if not name.startswith("_"):
+            self._cache.clear()
+        super().__setattr__(name, value)
+
+    def _get_cached_view(self, key: str, compose_view, cacheable: bool = True):
+        if not (self.is_columnar and cacheable):
+            return compose_view()
+        if key not in self._cache:
+            self._cache[key] = compose_view()
+        return self._cache[key]
+
+    @property
+    def is_columnar(self) -> bool:
+        """
+        Returns whether the ports are stored as packed integer arrays.
+
+        Returns:
+            bool: True if the ports are stored in ``port_arrays``.
+        """
+        return self.port_arrays is not None
+
     @property
     def ports_list(self) -> list[str]:
         """
@@ -93,29 +212,160 @@ class TruthTable(PielBaseModel):
         """
         return self.input_ports + self.output_ports
 
+    @property
+    def bit_width_dictionary(self) -> dict[str, int]:
+        """
+        Returns the bit width of each port. The bit width of a port of binary strings is the length of its longest
+        string.
+
+        Returns:
+            dict[str, int]: The bit width of each port.
+        """
+
+        def compose_bit_width_dictionary():
+            if self.is_columnar:
+                port_bit_widths = self.port_bit_widths or {}
+                return {
+                    port: port_bit_widths.get(port)
+                    or _compose_bit_width(self.port_arrays[port])
+                    for port in self.ports_list
+                }
+            bit_width_dictionary = dict()
+            for port, values in self.implementation_dictionary.items():
+                if all(isinstance(value, str) for value in values):
+                    bit_width_dictionary[port] = max(
+                        (len(value) for value in values), default=1
+                    )
+                else:
+                    bit_width_dictionary[port] = _compose_bit_width(
+                        np.asarray(values, dtype=int)
+                    )
+            return bit_width_dictionary
+
+        return dict(
+            self._get_cached_view("bit_width_dictionary", compose_bit_width_dictionary)
+        )
+
+    @property
+    def integer_dictionary(self) -> dict[str, np.ndarray]:
+        """
+        Returns the packed integer values of each port.
+
+        Returns:
+            dict[str, np.ndarray]: The integer array of each port, of shape ``(n_rows,)``.
+        """
+
+        def compose_integer_dictionary():
+            if self.is_columnar:
+                return {
+                    port: np.asarray(self.port_arrays[port]) for port in self.ports_list
+                }
+            integer_dictionary = dict()
+            bit_width_dictionary = self.bit_width_dictionary
+            for port, values in self.implementation_dictionary.items():
+                if all(isinstance(value, str) for value in values):
+                    integer_dictionary[port] = _convert_bits_to_integer_array(
+                        values, bit_width_dictionary[port]
+                    )
+                else:
+                    integer_dictionary[port] = np.asarray(values, dtype=int)
+            return integer_dictionary
+
+        return {
+            port: integer_array.copy()
+            for port, integer_array in self._get_cached_view(
+                "integer_dictionary", compose_integer_dictionary
+            ).items()
+        }
+
     @property
     def dataframe(self) -> pd.DataFrame:
         """
-        Returns a pandas DataFrame representation of the truth table, excluding the input and output ports.
+        Returns a pandas DataFrame representation of the truth table, excluding the input and output ports. In the
+        columnar form, the ports are represented as binary strings of their bit width.
 
         Returns:
             pd.DataFrame: A DataFrame with the truth table files, excluding input and output port keys.
         """
-        data = {
-            k: v
-            for k, v in self.dict().items()
-            if k not in {"input_ports", "output_ports"}
-        }
-        return pd.DataFrame(data)
+
+        def compose_dataframe():
+            data = dict(self.model_extra or {})
+            if self.is_columnar:
+                data.update(self.implementation_dictionary)
+            return pd.DataFrame(data)
+
+        # Extra columns are lists that can be modified in place, so the dataframe is only cached without them.
+        return self._get_cached_view(
+            "dataframe", compose_dataframe, cacheable=not self.model_extra
+        ).copy()
 
     @property
     def implementation_dictionary(self) -> dict:
         """
-        Returns a dictionary including only the keys specified within input_ports and output_ports.
+        Returns a dictionary including only the keys specified within input_ports and output_ports. In the columnar
+        form, the ports are represented as binary strings of their bit width.
 
         Returns:
             dict: A dictionary with keys that are part of the input and output ports.
         """
-        selected_ports = set(self.input_ports + self.output_ports)
-        filtered_dict = {k: v for k, v in self.dict().items() if k in selected_ports}
-        return filtered_dict
+
+        def compose_implementation_dictionary():
+            if self.is_columnar:
+                bit_width_dictionary = self.bit_width_dictionary
+                return {
+                    port: _convert_integer_array_to_bits(
+                        self.port_arrays[port], bit_width_dictionary[port]
+                    )
+                    for port in self.ports_list
+                }
+            extra = self.model_extra or {}
+            return {port: extra[port] for port in self.ports_list if port in extra}
+
+        return {
+            port: copy.copy(values)
+            for port, values in self._get_cached_view(
+                "implementation_dictionary", compose_implementation_dictionary
+            ).items()
+        }
+
+    def to_columnar(self) -> "TruthTable":
+        """
+        Returns the truth table with its ports stored as packed integer arrays, and any other columns unchanged.
+
+        Returns:
+            TruthTable: The columnar truth table.
+        """
+        if self.is_columnar:
+            return self
+        extra = {
+            key: value
+            for key, value in (self.model_extra or {}).items()
+            if key not in self.ports_list
+        }
+        return TruthTable(
+            input_ports=list(self.input_ports),
+            output_ports=list(self.output_ports),
+            port_arrays=dict(self.integer_dictionary),
+            port_bit_widths=dict(self.bit_width_dictionary),
+            **extra,
+        )
+
+    def to_bits(self) -> "TruthTable":
+        """
+        Returns the truth table with its ports stored as extra fields of binary strings, and any other columns
+        unchanged.
+
+        Returns:
+            TruthTable: The truth table of binary strings.
+        """
+        if not self.is_columnar:
+            return self
+        return TruthTable(
+            input_ports=list(self.input_ports),
+            output_ports=list(self.output_ports),
+            **(self.model_extra or {}),
+            **{
+                port: list(values)
+                for port, values in self.implementation_dictionary.items()
+            },
+        )
@@ -5,7 +5,8 @@ It also includes the necessary imports and type aliases for numerical types and
 
 import numpy as np
 import pandas as pd
-from .core import NumericalTypes, PielBaseModel
+from pydantic import PrivateAttr
+from .core import ArrayTypes, NumericalTypes, PielBaseModel
 from .digital import BitsType
 
 
@@ -22,8 +23,18 @@ class BitPhaseMap(PielBaseModel):
     Properties:
         dataframe (pd.DataFrame):
             A pandas DataFrame representation of the BitPhaseMap, combining the bits and phases into a tabular format.
+        sorted_phase (np.ndarray):
+            The phases sorted in ascending order.
+        sorted_bits (np.ndarray):
+            The bits aligned with ``sorted_phase``.
+
+    The dataframe and the sorted phase index are composed once on first access, and are reset when a field is
+    assigned. The conversion methods look up whole arrays of phases or bits at once through ``np.searchsorted``.
     """
 
+    # Lazily composed dataframe and sorted phase and bits indexes
+    _cache: dict = PrivateAttr(default_factory=dict)
+
     bits: list[BitsType] | tuple[BitsType] | np.ndarray
     """
     bits (list[AbstractBitsType] | tuple[AbstractBitsType] | np.ndarray):
@@ -38,6 +49,11 @@ class BitPhaseMap(PielBaseModel):
         Can be a list, tuple, or numpy array of elements that are of type NumericalTypes.
     """
 
+    def __setattr__(self, name, value):
+        if not name.startswith("_"):
+            self._cache.clear()
+        super().__setattr__(name, value)
+
     @property
     def dataframe(self) -> pd.DataFrame:
         """
@@ -46,7 +62,132 @@ class BitPhaseMap(PielBaseModel):
         Returns:
             pd.DataFrame: A DataFrame containing the bits and their corresponding phases.
         """
-        return pd.DataFrame(self.dict())
+        if "dataframe" not in self._cache:
+            self._cache["dataframe"] = pd.DataFrame(self.dict())
+        return self._cache["dataframe"].copy()
+
+    def _compose_phase_index(self) -> None:
+        phase = np.asarray(self.phase, dtype=float)
+        bits = np.asarray(self.bits, dtype=str)
+        # A stable sort keeps the first of any repeated phase first, as in the mapping order.
+        phase_order = np.argsort(phase, kind="stable")
+        self._cache["phase_order"] = phase_order
+        self._cache["sorted_phase"] = phase[phase_order]
+        self._cache["sorted_bits"] = bits[phase_order]
+        bits_order = np.argsort(bits, kind="stable")
+        self._cache["bits_sorted_bits"] = bits[bits_order]
+        self._cache["bits_sorted_phase"] = phase[bits_order]
+
+    @property
+    def sorted_phase(self) -> np.ndarray:
+        """
+        Returns the phases of the mapping sorted in ascending order.
+
+        Returns:
+            np.ndarray: The sorted phases.
+        """
+        if "sorted_phase" not in self._cache:
+            self._compose_phase_index()
+        return self._cache["sorted_phase"]
+
+    @property
+    def sorted_bits(self) -> np.ndarray:
+        """
+        Returns the bits of the mapping aligned with ``sorted_phase``.
+
+        Returns:
+            np.ndarray: The bits of the sorted phases.
+        """
+        if "sorted_bits" not in self._cache:
+            self._compose_phase_index()
+        return self._cache["sorted_bits"]
+
+    def find_nearest_phase_index(
+        self, phase: ArrayTypes | NumericalTypes
+    ) -> np.ndarray:
+        """
+        Returns the index in ``sorted_phase`` of the nearest mapped phase of every phase. When a phase is
+        equidistant to two mapped phases, the one that comes first in the mapping order is chosen, as with a linear
+        scan of the mapping.
+
+        Args:
+            phase (ArrayTypes | NumericalTypes): The phase or array of phases to look up.
+
+        Returns:
+            np.ndarray: The indexes of the nearest phases, with the shape of ``phase``.
+        """
+        sorted_phase = self.sorted_phase
+        phase = np.asarray(phase, dtype=float)
+        if len(sorted_phase) == 1:
+            return np.zeros(phase.shape, dtype=int)
+        # The nearest phase is either side of the insertion point of every phase.
+        upper_index = np.clip(
+            np.searchsorted(sorted_phase, phase, side="left"), 1, len(sorted_phase) - 1
+        )
+        # The first of any repeated phase is the leftmost one, and the first in the mapping order.
+        lower_index = np.searchsorted(
+            sorted_phase, sorted_phase[upper_index - 1], side="left"
+        )
+        upper_index = np.searchsorted(
+            sorted_phase, sorted_phase[upper_index], side="left"
+        )
+        lower_distance = np.abs(phase - sorted_phase[lower_index])
+        upper_distance = np.abs(sorted_phase[upper_index] - phase)
+        phase_order = self._cache["phase_order"]
+        return np.where(
+            (lower_distance < upper_distance)
+            | (
+                (lower_distance == upper_distance)
+                & (phase_order[lower_index] < phase_order[upper_index])
+            ),
+            lower_index,
+            upper_index,
+        )
+
+    def convert_phase_to_bits(
+        self, phase: ArrayTypes | NumericalTypes
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Maps every phase to the bits of its nearest mapped phase.
+
+        Args:
+            phase (ArrayTypes | NumericalTypes): The phase or array of phases to map.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: The bits and the nearest mapped phases, with the shape of ``phase``.
+        """
+        nearest_index = self.find_nearest_phase_index(phase)
+        return self.sorted_bits[nearest_index], self.sorted_phase[nearest_index]
+
+    def convert_bits_to_phase(self, bits: BitsType | ArrayTypes) -> np.ndarray:
+        """
+        Maps every bitstring to its phase. The first phase in the mapping order is returned for bitstrings that map
+        to multiple phases.
+
+        Args:
+            bits (BitsType | ArrayTypes): The bitstring or array of bitstrings to map.
+
+        Returns:
+            np.ndarray: The phases, with the shape of ``bits``.
+
+        Raises:
+            ValueError: If a bitstring is not in the mapping.
+        """
+        if "bits_sorted_bits" not in self._cache:
+            self._compose_phase_index()
+        bits_sorted_bits = self._cache["bits_sorted_bits"]
+        bits = np.asarray(bits, dtype=str)
+        bits_index = np.clip(
+            np.searchsorted(bits_sorted_bits, bits, side="left"),
+            0,
+            len(bits_sorted_bits) - 1,
+        )
+        missing_bits = bits_sorted_bits[bits_index] != bits
+        if np.any(missing_bits):
+            raise ValueError(
+                "No phases found for bits: " + str(np.unique(bits[missing_bits]))
+            )
+        return self._cache["bits_sorted_phase"][bits_index]
 
 
 """
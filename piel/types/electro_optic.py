@@ -3,8 +3,9 @@ This module defines the OpticalStateTransitions class and related types for mana
 It also provides a typed dictionary for Fock state phase transitions and includes necessary imports and type aliases.
 """
 
+import numpy as np
 import pandas as pd
-from pydantic import ConfigDict
+from pydantic import ConfigDict, Field, PrivateAttr, field_validator, model_validator
 from typing import Literal, Optional
 from typing_extensions import TypedDict
 from .core import ArrayTypes, PielBaseModel, TupleNumericalType, TupleIntType
@@ -47,15 +48,43 @@ PhaseTransitionTypes: A literal type for phase transition types.
 
 OpticalTransmissionType = FockStatePhaseTransitionType
 
+# Per-transition columns of the OpticalStateTransitions struct-of-arrays form.
+_transition_column_names = (
+    "phase_array",
+    "input_fock_state_array",
+    "output_fock_state_array",
+    "target_mode_output_array",
+    "raw_output_array",
+    "configuration_index_array",
+)
+
 
 class OpticalStateTransitions(PielBaseModel):
     """
     A model representing transitions between optical states, specifically for Fock states in an electro-optic system.
 
+    The transitions can either be provided as a list of Fock state phase transition mappings through
+    ``transmission_data``, or as a struct-of-arrays through the columnar ``*_array`` fields. In the columnar
+    form, each unitary is stored once per phase configuration in ``unitary_array`` and each transition refers to it
+    through ``configuration_index_array``. The list-of-dictionaries ``transmission_data`` is then composed lazily on
+    first access.
+
+    The columnar arrays are stored as read-only views, so that they are the single source of truth of the cached
+    ``transmission_data`` and dataframe views, which are returned as copies. The list form can be modified in place,
+    so its views are composed on every access. The list form is stored in the ``transmission_records`` field, which is
+    serialized under its ``transmission_data`` alias.
+
     Attributes:
         mode_amount (int): The number of modes in the system.
         target_mode_index (int): The index of the target mode in the system.
         transmission_data (list[FockStatePhaseTransitionType]): A list of Fock state phase transition mappings.
+        phase_array (ArrayTypes): The phase of each transition, of shape ``(n_transitions, n_phases)``.
+        input_fock_state_array (ArrayTypes): The input Fock states, of shape ``(n_transitions, n_modes)``.
+        output_fock_state_array (ArrayTypes): The output Fock states, of shape ``(n_transitions, n_modes)``.
+        target_mode_output_array (ArrayTypes): The target mode output of each transition, of shape ``(n_transitions,)``.
+        raw_output_array (ArrayTypes): The raw output of each transition, of shape ``(n_transitions, n_modes)``.
+        configuration_index_array (ArrayTypes): The phase configuration index of each transition, of shape ``(n_transitions,)``.
+        unitary_array (ArrayTypes): The unitary of each phase configuration, of shape ``(n_configurations, n_modes, n_modes)``.
 
     Properties:
         transition_dataframe (pd.DataFrame): A DataFrame representation of the transmission files.
@@ -64,7 +93,9 @@ class OpticalStateTransitions(PielBaseModel):
 
     # List of keys to ignore
     _ignore_keys: list[str] = ["unitary", "raw_output"]
-    model_config = ConfigDict(extra="allow")
+    # Lazily composed transmission files and dataframe views of the columnar form
+    _cache: dict = PrivateAttr(default_factory=dict)
+    model_config = ConfigDict(extra="allow", populate_by_name=True)
 
     mode_amount: int | None = None
     """
@@ -78,21 +109,211 @@ class OpticalStateTransitions(PielBaseModel):
         The index of the target mode in the system.
     """
 
-    transmission_data: list[OpticalTransmissionType]
+    transmission_records: list[OpticalTransmissionType] | None = Field(
+        default=None, alias="transmission_data"
+    )
+    """
+    transmission_records (list[FockStatePhaseTransitionType]):
+        A list of dictionaries representing the phase transitions for Fock states, provided as ``transmission_data``.
+    """
+
+    phase_array: ArrayTypes | None = None
+    """
+    phase_array (ArrayTypes):
+        The phase of each transition, of shape ``(n_transitions, n_phases)``.
+    """
+
+    input_fock_state_array: ArrayTypes | None = None
+    """
+    input_fock_state_array (ArrayTypes):
+        The integer input Fock state of each transition, of shape ``(n_transitions, n_modes)``.
+    """
+
+    output_fock_state_array: ArrayTypes | None = None
+    """
+    output_fock_state_array (ArrayTypes):
+        The integer output Fock state of each transition, of shape ``(n_transitions, n_modes)``.
+    """
+
+    target_mode_output_array: ArrayTypes | None = None
+    """
+    target_mode_output_array (ArrayTypes):
+        The target mode output of each transition, of shape ``(n_transitions,)``. None if it is not determined.
+    """
+
+    raw_output_array: ArrayTypes | None = None
+    """
+    raw_output_array (ArrayTypes):
+        The raw output of each transition, of shape ``(n_transitions, n_modes)``.
+    """
+
+    configuration_index_array: ArrayTypes | None = None
+    """
+    configuration_index_array (ArrayTypes):
+        The index into ``unitary_array`` of the phase configuration of each transition, of shape ``(n_transitions,)``.
+    """
+
+    unitary_array: ArrayTypes | None = None
     """
-    transmission_data (list[FockStatePhaseTransitionType]):
-        A list of dictionaries representing the phase transitions for Fock states.
+    unitary_array (ArrayTypes):
+        The unitary of each phase configuration, of shape ``(n_configurations, n_modes, n_modes)``.
     """
 
+    @field_validator(*_transition_column_names, "unitary_array")
+    @classmethod
+    def read_only_column(cls, value):
+        if isinstance(value, np.ndarray):
+            value = value.view()
+            value.flags.writeable = False
+        return value
+
+    @model_validator(mode="after")
+    def validate_columns(self):
+        if self.transmission_records is not None and self.phase_array is not None:
+            raise ValueError(
+                "Provide either transmission_data or the columnar arrays, not both."
+            )
+        if self.phase_array is not None:
+            transition_amount = len(self.phase_array)
+            for column_i in _transition_column_names:
+                column = getattr(self, column_i)
+                if column is not None and len(column) != transition_amount:
+                    raise ValueError(
+                        f"Column {column_i} has {len(column)} entries, expected {transition_amount}."
+                    )
+            if self.input_fock_state_array is None or (
+                self.output_fock_state_array is None
+            ):
+                raise ValueError(
+                    "The columnar form requires input_fock_state_array and output_fock_state_array."
+                )
+            if (self.unitary_array is None) != (self.configuration_index_array is None):
+                raise ValueError(
+                    "unitary_array and configuration_index_array must be provided together."
+                )
+        return self
+
+    def __setattr__(self, name, value):
+        if not name.startswith("_"):
+            self._cache.clear()
+        super().__setattr__(name, value)
+
+    def model_dump(self, *, by_alias: bool = True, **kwargs) -> dict:
+        return super().model_dump(by_alias=by_alias, **kwargs)
+
+    def model_dump_json(self, *, by_alias: bool = True, **kwargs) -> str:
+        return super().model_dump_json(by_alias=by_alias, **kwargs)
+
+    def _get_cached_view(self, key: str, compose_view):
+        if not self.is_columnar:
+            return compose_view()
+        if key not in self._cache:
+            self._cache[key] = compose_view()
+        return self._cache[key]
+
+    @property
+    def is_columnar(self) -> bool:
+        """
+        Returns whether the transitions are stored in the columnar struct-of-arrays form.
+
+        Returns:
+            bool: True if the transitions are stored as arrays.
+        """
+        return self.phase_array is not None
+
+    @property
+    def transition_amount(self) -> int:
+        """
+        Returns the number of transitions.
+
+        Returns:
+            int: The number of transitions.
+        """
+        if self.is_columnar:
+            return len(self.phase_array)
+        return len(self.transmission_records or [])
+
+    def _compose_transition_entry(
+        self, transition_index: int, include_arrays: bool = True
+    ) -> OpticalTransmissionType:
+        target_mode_output = None
+        if self.target_mode_output_array is not None:
+            target_mode_output = int(self.target_mode_output_array[transition_index])
+
+        entry = {
+            "phase": tuple(self.phase_array[transition_index].tolist()),
+            "input_fock_state": tuple(
+                int(i) for i in self.input_fock_state_array[transition_index]
+            ),
+            "output_fock_state": tuple(
+                int(i) for i in self.output_fock_state_array[transition_index]
+            ),
+            "target_mode_output": target_mode_output,
+        }
+        if include_arrays and self.raw_output_array is not None:
+            entry["raw_output"] = self.raw_output_array[transition_index][:, None]
+        if include_arrays and self.unitary_array is not None:
+            entry["unitary"] = self.unitary_array[
+                int(self.configuration_index_array[transition_index])
+            ]
+        return entry
+
+    @property
+    def transmission_data(self) -> list[OpticalTransmissionType]:
+        """
+        Returns the transitions as a list of Fock state phase transition mappings. In the columnar form, the list is
+        composed on first access and a copy of it is returned, in which the ``unitary`` entries are read-only views of
+        the per-configuration ``unitary_array``.
+
+        Returns:
+            list[FockStatePhaseTransitionType]: A list of dictionaries representing the phase transitions.
+        """
+        if not self.is_columnar:
+            return self.transmission_records if self.transmission_records else []
+
+        transmission_data = self._get_cached_view(
+            "transmission_data",
+            lambda: [
+                self._compose_transition_entry(transition_index)
+                for transition_index in range(self.transition_amount)
+            ],
+        )
+        return [dict(entry) for entry in transmission_data]
+
+    @transmission_data.setter
+    def transmission_data(self, value: list[OpticalTransmissionType]) -> None:
+        for column_i in _transition_column_names + ("unitary_array",):
+            if getattr(self, column_i) is not None:
+                setattr(self, column_i, None)
+        self.transmission_records = value
+
+    def _compose_columnar_dataframe(self) -> pd.DataFrame:
+        data = {
+            "phase": [tuple(phase_i) for phase_i in self.phase_array.tolist()],
+            "input_fock_state": [
+                tuple(state_i) for state_i in self.input_fock_state_array.tolist()
+            ],
+            "output_fock_state": [
+                tuple(state_i) for state_i in self.output_fock_state_array.tolist()
+            ],
+            "target_mode_output": self.target_mode_output_array.tolist()
+            if self.target_mode_output_array is not None
+            else [None] * self.transition_amount,
+        }
+        return pd.DataFrame(data)
+
     @property
     def dataframe(self) -> pd.DataFrame:
         """
-        Returns a full pandas DataFrame representation of the transmission files.
+        Returns a full pandas DataFrame representation of the transmission files. In the columnar form, the DataFrame
+        is cached until the model is modified and a copy of it is returned.
 
         Returns:
             pd.DataFrame: A DataFrame containing the transmission files for the optical states.
         """
-        return pd.DataFrame(self.transmission_data)
+        return self._get_cached_view(
+            "dataframe", lambda: pd.DataFrame(self.transmission_data)
+        ).copy()
 
     @property
     def keys_list(self) -> list[str]:
@@ -105,20 +326,23 @@ class OpticalStateTransitions(PielBaseModel):
         Notes:
             The keys specified in `_ignore_keys` will be excluded from the list of ports.
         """
-        if not self.transmission_data:
+        if self.transition_amount == 0:
             return []
 
+        if self.is_columnar:
+            first_entry = self._compose_transition_entry(0, include_arrays=False)
+        else:
+            first_entry = self.transmission_data[0]
+
         # Get keys from the first entry in the transmission files and exclude specified keys
-        return [
-            key
-            for key in self.transmission_data[0].keys()
-            if key not in self._ignore_keys
-        ]
+        return [key for key in first_entry.keys() if key not in self._ignore_keys]
 
     @property
     def transition_dataframe(self) -> pd.DataFrame:
         """
-        Returns a pandas DataFrame representation of the transmission files, excluding specific keys.
+        Returns a pandas DataFrame representation of the transmission files, excluding specific keys. In the
+        columnar form, it is composed directly from the arrays, cached until the model is modified and a copy of it
+        is returned.
 
         Returns:
             pd.DataFrame: A DataFrame containing the transmission files for the optical states, with specified keys excluded.
@@ -126,6 +350,10 @@ class OpticalStateTransitions(PielBaseModel):
         Notes:
             The keys 'unitary' and 'raw_output' will be excluded from the transmission files.
         """
+        if self.is_columnar:
+            return self._get_cached_view(
+                "transition_dataframe", self._compose_columnar_dataframe
+            ).copy()
 
         # Filter out the specified keys from each dictionary in the list
         filtered_data = [
@@ -145,9 +373,8 @@ class OpticalStateTransitions(PielBaseModel):
             pd.DataFrame: A DataFrame containing only the transitions where the target mode is an output.
         """
         # TODO: add verification eventually
-        return self.transition_dataframe[
-            self.transition_dataframe["target_mode_output"] == 1
-        ]
+        transition_dataframe = self.transition_dataframe
+        return transition_dataframe[transition_dataframe["target_mode_output"] == 1]
 
 
 SwitchFunctionParameter = dict
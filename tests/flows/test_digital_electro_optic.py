@@ -0,0 +1,106 @@
+import numpy as np
+import pytest
+from piel.flows import convert_phase_to_bit_iterable, find_nearest_bit_for_phase
+from piel.flows.digital_electro_optic import (
+    convert_optical_transitions_to_truth_table,
+    filter_and_correct_truth_table,
+)
+from piel.types import BitPhaseMap, OpticalStateTransitions
+
+bit_phase_map = BitPhaseMap(bits=["0", "1", "10", "11"], phase=[0.0, 1.0, 2.0, 3.0])
+
+
+def test_convert_phase_to_bit_iterable():
+    assert convert_phase_to_bit_iterable((0.0, 2.0, 3.0), bit_phase_map) == (
+        "00",
+        "10",
+        "11",
+    )
+    # Phases between the mapped phases are mapped to the nearest one
+    assert convert_phase_to_bit_iterable(np.array([0.4, 1.6, 9.0]), bit_phase_map) == (
+        "00",
+        "10",
+        "11",
+    )
+    assert convert_phase_to_bit_iterable(
+        [0.6, 1.4], bit_phase_map, rounding_function=np.floor
+    ) == ("00", "01")
+
+
+def test_find_nearest_bit_for_phase():
+    assert find_nearest_bit_for_phase(1.2, bit_phase_map) == ("1", 1.0)
+    assert find_nearest_bit_for_phase(1.5, bit_phase_map) == ("1", 1.0)
+    assert find_nearest_bit_for_phase(2.7, bit_phase_map, np.ceil) == ("11", 3.0)
+
+
+def optical_state_transitions(columnar: bool = False):
+    phase_array = np.array([[0.0, 3.0], [1.0, 2.0], [2.0, 1.0], [3.0, 0.0]])
+    input_fock_state_array = np.array([[1, 0, 0], [0, 1, 0], [1, 0, 0], [0, 0, 1]])
+    target_mode_output_array = np.array([1, 0, 1, 1])
+    if columnar:
+        return OpticalStateTransitions(
+            mode_amount=3,
+            target_mode_index=0,
+            phase_array=phase_array,
+            input_fock_state_array=input_fock_state_array,
+            output_fock_state_array=input_fock_state_array,
+            target_mode_output_array=target_mode_output_array,
+        )
+    return OpticalStateTransitions(
+        mode_amount=3,
+        target_mode_index=0,
+        transmission_data=[
+            {
+                "phase": tuple(phase_i),
+                "input_fock_state": tuple(input_fock_state_i.tolist()),
+                "output_fock_state": tuple(input_fock_state_i.tolist()),
+                "target_mode_output": int(target_mode_output_i),
+            }
+            for phase_i, input_fock_state_i, target_mode_output_i in zip(
+                phase_array, input_fock_state_array, target_mode_output_array
+            )
+        ],
+    )
+
+
+@pytest.mark.parametrize("columnar", [False, True])
+def test_convert_optical_transitions_to_truth_table(columnar):
+    transitions = optical_state_transitions(columnar=columnar)
+    truth_table = convert_optical_transitions_to_truth_table(transitions, bit_phase_map)
+    assert truth_table.input_ports == ["input_fock_state_str"]
+    assert truth_table.output_ports == ["bit_phase_0", "bit_phase_1"]
+    # The first transition of each input Fock state is kept
+    assert truth_table.input_fock_state_str == ["100", "001"]
+    assert truth_table.bit_phase_0 == ["00", "11"]
+    assert truth_table.bit_phase_1 == ["11", "00"]
+
+    truth_table = convert_optical_transitions_to_truth_table(
+        transitions, bit_phase_map, logic="full"
+    )
+    assert truth_table.input_fock_state_str == ["100", "010", "001"]
+    assert truth_table.bit_phase_0 == ["00", "01", "11"]
+
+    with pytest.raises(ValueError):
+        convert_optical_transitions_to_truth_table(
+            transitions, bit_phase_map, logic="invalid"
+        )
+
+
+def test_filter_and_correct_truth_table():
+    truth_table = filter_and_correct_truth_table(
+        {
+            "a": ["0", "1", "0", "1"],
+            "b": ["0", "0", "0", "1"],
+            "x": ["1", "0", "0", "1"],
+            "unused": [0, 1, 2, 3],
+        },
+        input_ports=["a", "b"],
+        output_ports=["x"],
+    )
+    assert truth_table == {
+        "a": ["0", "1", "1"],
+        "b": ["0", "0", "1"],
+        "x": ["1", "0", "1"],
+    }
+    with pytest.raises(ValueError):
+        filter_and_correct_truth_table({"a": ["0"]}, ["a"], ["x"])
@@ -0,0 +1,336 @@
+from itertools import product
+import numpy as np
+import pytest
+from piel.flows.electro_optic import (
+    calculate_classical_transition_probability_amplitude_matrix,
+    calculate_switch_unitaries,
+    calculate_switch_unitaries_batched,
+    calculate_target_mode_transmission,
+    compose_network_matrix_from_models,
+    compose_phase_configuration_chunks,
+    construct_unitary_transition_probability_amplitude_matrices,
+    filter_phase_configurations_by_transition,
+    solve_transition_phases,
+    stream_network_matrix_from_models,
+    stream_switch_unitaries,
+)
+from piel.integration import fock_transition_probability_amplitude
+from piel.models.logic.photonic import compose_lattice_unitary_function
+from piel.tools.qutip import fock_states_only_individual_modes
+from piel.tools.sax import compose_switch_phase_unitary_function
+
+switch_states = [0, np.pi / 3, np.pi]
+
+
+@pytest.fixture(scope="module")
+def lattice_component_models():
+    import piel
+    from gdsfactory.generic_tech import get_generic_pdk
+    from piel.models.physical.photonic import (
+        component_lattice_generic,
+        mzi2x2_2x2_phase_shifter,
+    )
+
+    get_generic_pdk().activate()
+    verification_models = piel.models.frequency.get_default_models(
+        type="optical_logic_verification"
+    )
+    models = piel.models.frequency.compose_custom_model_library_from_defaults(
+        custom_defaults=verification_models,
+        custom_models={
+            "straight_heater_metal_undercut_length200": verification_models[
+                "straight_heater_metal_undercut"
+            ]
+        },
+    )
+    network = [[mzi2x2_2x2_phase_shifter(), 0], [0, mzi2x2_2x2_phase_shifter()]]
+    return component_lattice_generic(network=network), models
+
+
+@pytest.fixture(scope="module")
+def lattice_network_matrix(lattice_component_models):
+    circuit_component, models = lattice_component_models
+    return compose_network_matrix_from_models(
+        circuit_component=circuit_component,
+        models=models,
+        switch_states=switch_states,
+        chunk_size=2,
+    )
+
+
+def test_calculate_target_mode_transmission():
+    unitary = np.array([[0, 1], [1, 0]], dtype=complex)
+    assert np.isclose(calculate_target_mode_transmission(unitary, [1, 0], [0, 1]), 1)
+    assert np.isclose(calculate_target_mode_transmission(unitary, [1, 0], [1, 0]), 0)
+
+
+def test_solve_transition_phases_chain_lattice():
+    unitary_function = compose_lattice_unitary_function([["X", 0], [0, "X"]])
+    target_transition_list = [
+        ((1, 0, 0), (0, 0, 1)),
+        ((1, 0, 0), (0, 1, 0)),
+    ]
+    solution_list = solve_transition_phases(
+        unitary_function=unitary_function,
+        switch_amount=2,
+        target_transition_list=target_transition_list,
+        start_amount=4,
+    )
+
+    assert len(solution_list) == 2
+    for solution_i, (input_fock_state_i, output_fock_state_i) in zip(
+        solution_list, target_transition_list
+    ):
+        assert solution_i["input_fock_state"] == input_fock_state_i
+        assert solution_i["output_fock_state"] == output_fock_state_i
+        assert solution_i["transmission"] > 0.999
+        assert solution_i["start_transmissions"].shape == (4,)
+        unitary = np.asarray(unitary_function(np.array(solution_i["phase"])))
+        assert np.isclose(
+            calculate_target_mode_transmission(
+                unitary, input_fock_state_i, output_fock_state_i
+            ),
+            solution_i["transmission"],
+        )
+    # Crossing the first switch and barring the second routes the first mode to the second mode
+    assert np.isclose(np.cos(solution_list[1]["phase"][0]), 1, atol=1e-3)
+    assert np.isclose(np.cos(solution_list[1]["phase"][1]), -1, atol=1e-3)
+
+
+def test_compose_phase_configuration_chunks():
+    chunks = list(
+        compose_phase_configuration_chunks(
+            switch_states=switch_states, switch_amount=3, chunk_size=4
+        )
+    )
+    assert [len(chunk) for chunk in chunks] == [4] * 6 + [3]
+    assert [
+        phase_configuration for chunk in chunks for phase_configuration in chunk
+    ] == list(product(switch_states, repeat=3))
+
+    with pytest.raises(ValueError):
+        next(compose_phase_configuration_chunks(switch_states, 3, chunk_size=0))
+
+
+def test_compose_network_matrix_from_models_chunked(lattice_network_matrix):
+    switch_unitaries, _, phase_address_state, *_ = lattice_network_matrix
+    assert list(switch_unitaries.keys()) == list(range(len(switch_states) ** 2))
+    unitaries = np.stack([unitary_i for unitary_i, _ in switch_unitaries.values()])
+    assert all(
+        ports_order_i == switch_unitaries[0][1]
+        for _, ports_order_i in switch_unitaries.values()
+    )
+    ports_order = switch_unitaries[0][1]
+
+    _, switch_function_parameter_state, *_, circuit, _ = lattice_network_matrix
+    reference_unitaries, reference_ports_order = calculate_switch_unitaries_batched(
+        circuit=circuit,
+        switch_function_parameter_state=switch_function_parameter_state,
+    )
+    assert ports_order == reference_ports_order
+    assert np.allclose(unitaries, reference_unitaries)
+    assert [
+        tuple(phase_address_state[id_i].values()) for id_i in range(len(unitaries))
+    ] == list(product(switch_states, repeat=2))
+
+
+def test_stream_switch_unitaries_matches_unchunked(lattice_network_matrix):
+    switch_unitaries, *_, switch_instance_list, circuit, _ = lattice_network_matrix
+    unitaries = np.stack([unitary_i for unitary_i, _ in switch_unitaries.values()])
+    ports_order = switch_unitaries[0][1]
+    streamed_chunks = list(
+        stream_switch_unitaries(
+            circuit=circuit,
+            switch_instance_list=switch_instance_list,
+            switch_states=switch_states,
+            chunk_size=2,
+        )
+    )
+    assert [len(chunk) for chunk, *_ in streamed_chunks] == [2, 2, 2, 2, 1]
+    assert all(
+        streamed_ports_order == ports_order
+        for *_, streamed_ports_order in streamed_chunks
+    )
+    assert np.allclose(
+        np.concatenate([chunk_unitaries for _, chunk_unitaries, _ in streamed_chunks]),
+        unitaries,
+    )
+
+
+def test_stream_network_matrix_from_models_matches_composed(
+    lattice_component_models, lattice_network_matrix
+):
+    circuit_component, models = lattice_component_models
+    switch_unitaries, _, phase_address_state, *_ = lattice_network_matrix
+    streamed_chunks = list(
+        stream_network_matrix_from_models(
+            circuit_component=circuit_component,
+            models=models,
+            switch_states=switch_states,
+            chunk_size=4,
+        )
+    )
+    assert [len(chunk_unitaries) for _, chunk_unitaries, _ in streamed_chunks] == [
+        4,
+        4,
+        1,
+    ]
+    for phase_address_state_chunk, chunk_unitaries, ports_order in streamed_chunks:
+        for id_i, unitary_i in zip(phase_address_state_chunk, chunk_unitaries):
+            assert phase_address_state_chunk[id_i] == phase_address_state[id_i]
+            assert ports_order == switch_unitaries[id_i][1]
+            assert np.allclose(unitary_i, switch_unitaries[id_i][0])
+
+
+def test_filter_phase_configurations_by_transition_matches_unchunked(
+    lattice_network_matrix,
+):
+    switch_unitaries, *_, switch_instance_list, circuit, _ = lattice_network_matrix
+    unitaries = [unitary_i for unitary_i, _ in switch_unitaries.values()]
+    input_fock_state, output_fock_state = (1, 0, 0), (0, 0, 1)
+    phase_configurations = list(product(switch_states, repeat=2))
+    expected_phase_configurations = [
+        phase_configuration_i
+        for phase_configuration_i, unitary_i in zip(phase_configurations, unitaries)
+        if np.array_equal(
+            np.abs(unitary_i @ np.array(input_fock_state)) > 1e-6,
+            np.array(output_fock_state) > 0,
+        )
+    ]
+    assert len(expected_phase_configurations) > 0
+
+    for chunk_size in [1, 4, 1024]:
+        assert (
+            filter_phase_configurations_by_transition(
+                circuit=circuit,
+                switch_instance_list=switch_instance_list,
+                input_fock_state=input_fock_state,
+                output_fock_state=output_fock_state,
+                switch_states=switch_states,
+                chunk_size=chunk_size,
+            )
+            == expected_phase_configurations
+        )
+
+
+def test_calculate_switch_unitaries_batched_matches_per_configuration(
+    lattice_network_matrix,
+):
+    _, switch_function_parameter_state, *_, circuit, _ = lattice_network_matrix
+    unitaries, ports_order = calculate_switch_unitaries_batched(
+        circuit=circuit,
+        switch_function_parameter_state=switch_function_parameter_state,
+    )
+    per_configuration_unitaries = calculate_switch_unitaries(
+        circuit=circuit,
+        switch_function_parameter_state=switch_function_parameter_state,
+    )
+    assert unitaries.shape[0] == len(per_configuration_unitaries)
+    for id_i, (unitary_i, ports_order_i) in per_configuration_unitaries.items():
+        assert ports_order_i == ports_order
+        assert np.allclose(unitaries[id_i], unitary_i)
+
+
+def test_calculate_classical_transition_probability_amplitude_matrix_matches_per_state():
+    random_generator = np.random.default_rng(0)
+    unitaries = np.linalg.qr(
+        random_generator.normal(size=(4, 3, 3))
+        + 1j * random_generator.normal(size=(4, 3, 3))
+    )[0]
+    input_fock_states = fock_states_only_individual_modes(
+        mode_amount=3, maximum_photon_amount=2, output_type="jax"
+    )
+    classical_transitions = calculate_classical_transition_probability_amplitude_matrix(
+        unitary_matrix=unitaries,
+        input_fock_states=input_fock_states,
+        target_mode_index=1,
+    )
+    assert classical_transitions["mode_transformation"].shape == (
+        4,
+        3,
+        len(input_fock_states),
+    )
+    for unitary_i, mode_transformation_i, target_mode_probability_i in zip(
+        unitaries,
+        classical_transitions["mode_transformation"],
+        classical_transitions["classical_transition_target_mode_probability"],
+    ):
+        for state_i, input_fock_state in enumerate(input_fock_states):
+            mode_transformation = np.ravel(np.dot(unitary_i, input_fock_state))
+            assert np.allclose(mode_transformation_i[:, state_i], mode_transformation)
+            assert np.isclose(
+                target_mode_probability_i[state_i], np.abs(mode_transformation[1])
+            )
+
+    single_classical_transitions = (
+        calculate_classical_transition_probability_amplitude_matrix(
+            unitary_matrix=unitaries[0], input_fock_states=input_fock_states
+        )
+    )
+    assert (
+        single_classical_transitions["classical_transition_target_mode_probability"]
+        is None
+    )
+    assert np.allclose(
+        single_classical_transitions["classical_transition_mode_probability"],
+        np.abs(classical_transitions["mode_transformation"][0]),
+    )
+
+
+def test_construct_unitary_transition_probability_amplitude_matrices():
+    unitaries = compose_lattice_unitary_function([["X", 0], [0, "X"]])(
+        np.array([np.pi / 3, np.pi / 5])
+    )[None]
+    input_fock_states = fock_states_only_individual_modes(
+        mode_amount=3, maximum_photon_amount=2, output_type="jax"
+    )
+    output_fock_states = input_fock_states[::-1]
+    amplitudes = construct_unitary_transition_probability_amplitude_matrices(
+        unitary_matrices=unitaries,
+        input_fock_states=input_fock_states,
+        output_fock_states=output_fock_states,
+    )
+    assert amplitudes.shape == (1, len(input_fock_states), len(output_fock_states))
+    for input_index, input_fock_state in enumerate(input_fock_states):
+        for output_index, output_fock_state in enumerate(output_fock_states):
+            assert np.isclose(
+                amplitudes[0, input_index, output_index],
+                fock_transition_probability_amplitude(
+                    initial_fock_state=input_fock_state,
+                    final_fock_state=output_fock_state,
+                    unitary_matrix=unitaries[0],
+                ),
+            )
+
+
+def test_solve_transition_phases_sax_lattice(lattice_network_matrix):
+    *_, switch_instance_list, circuit, _ = lattice_network_matrix
+    unitary_function, _ = compose_switch_phase_unitary_function(
+        circuit=circuit, switch_instance_list=switch_instance_list
+    )
+    target_transition_list = [
+        ((1, 0, 0), (0, 0, 1)),
+        ((1, 0, 0), (0, 1, 0)),
+    ]
+    solution_list = solve_transition_phases(
+        unitary_function=unitary_function,
+        switch_amount=len(switch_instance_list),
+        target_transition_list=target_transition_list,
+        start_amount=2,
+        iteration_amount=100,
+    )
+
+    for solution_i, (input_fock_state_i, output_fock_state_i) in zip(
+        solution_list, target_transition_list
+    ):
+        assert solution_i["transmission"] > 0.99
+        unitary = np.asarray(unitary_function(np.array(solution_i["phase"])))
+        assert np.isclose(
+            calculate_target_mode_transmission(
+                unitary, input_fock_state_i, output_fock_state_i
+            ),
+            solution_i["transmission"],
+        )
+    # Crossing the first switch and barring the second routes the first mode to the second mode
+    assert np.isclose(np.cos(solution_list[1]["phase"][0]), 1, atol=0.1)
+    assert np.isclose(np.cos(solution_list[1]["phase"][1]), -1, atol=0.1)
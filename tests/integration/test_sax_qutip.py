@@ -0,0 +1,21 @@
+import numpy as np
+import sax
+from piel.integration import verify_sax_model_is_unitary
+
+splitter_s_parameters = sax.reciprocal(
+    {
+        ("in_o_0", "out_o_0"): np.sqrt(0.5),
+        ("in_o_0", "out_o_1"): 1j * np.sqrt(0.5),
+        ("in_o_1", "out_o_0"): 1j * np.sqrt(0.5),
+        ("in_o_1", "out_o_1"): np.sqrt(0.5),
+    }
+)
+
+
+def test_verify_sax_model_is_unitary():
+    assert verify_sax_model_is_unitary(splitter_s_parameters)
+    lossy_s_parameters = {
+        ports: 0.9 * value for ports, value in splitter_s_parameters.items()
+    }
+    assert not verify_sax_model_is_unitary(lossy_s_parameters)
+    assert verify_sax_model_is_unitary(lossy_s_parameters, atol=0.2)
@@ -0,0 +1,85 @@
+import jax.numpy as jnp
+import numpy as np
+import qutip
+from scipy.linalg import block_diag
+from scipy.sparse import csr_matrix
+from scipy.stats import unitary_group
+from thewalrus import perm
+from piel.integration import (
+    fock_space_unitary_operator,
+    fock_transition_probability_amplitude,
+    fock_transition_probability_amplitude_matrix,
+)
+from piel.tools.qutip import (
+    fock_basis_from_photon_number,
+    fock_basis_size,
+    fock_states_only_individual_modes,
+)
+
+
+def test_fock_space_unitary_operator_matches_amplitudes():
+    unitary = unitary_group.rvs(4, random_state=0)
+    basis = fock_basis_from_photon_number(4, 2)
+    operator = fock_space_unitary_operator(unitary, 2)
+    amplitudes = fock_transition_probability_amplitude_matrix(
+        unitary, list(basis), list(basis)
+    )
+    assert isinstance(operator, csr_matrix)
+    assert np.allclose(operator.toarray(), amplitudes.T)
+    assert np.allclose(operator.toarray().conj().T @ operator.toarray(), np.eye(10))
+
+
+def test_fock_space_unitary_operator_is_sparse_for_block_unitaries():
+    unitary = block_diag(*[unitary_group.rvs(2, random_state=i) for i in range(3)])
+    operator = fock_space_unitary_operator(unitary, 2, output_type="qutip")
+    assert isinstance(operator, qutip.Qobj)
+    assert operator.shape == (fock_basis_size(6, 2), fock_basis_size(6, 2))
+    assert operator.check_isunitary()
+    # Photons cannot leave their 2x2 block, so most transitions vanish.
+    assert operator.data.nnz < 0.25 * fock_basis_size(6, 2) ** 2
+
+
+def test_fock_transition_probability_amplitude_matrix_matches_scalar_path():
+    unitaries = unitary_group.rvs(3, size=2, random_state=1)
+    # Includes the bunched states and the transitions between different photon numbers.
+    fock_states = fock_states_only_individual_modes(
+        mode_amount=3, maximum_photon_amount=2, output_type="jax"
+    )
+    amplitudes = fock_transition_probability_amplitude_matrix(
+        unitaries, fock_states, fock_states
+    )
+    assert amplitudes.shape == (2, len(fock_states), len(fock_states))
+    for unitary, unitary_amplitudes in zip(unitaries, amplitudes):
+        for input_index, input_fock_state in enumerate(fock_states):
+            for output_index, output_fock_state in enumerate(fock_states):
+                assert np.isclose(
+                    unitary_amplitudes[input_index, output_index],
+                    fock_transition_probability_amplitude(
+                        initial_fock_state=input_fock_state,
+                        final_fock_state=output_fock_state,
+                        unitary_matrix=jnp.asarray(unitary),
+                    ),
+                )
+
+
+def test_fock_transition_probability_amplitude_bunched_expanded_permanent():
+    unitary = unitary_group.rvs(3, random_state=2)
+    input_fock_state, output_fock_state = (
+        jnp.array([[2], [0], [1]]),
+        jnp.array([[0], [1], [2]]),
+    )
+    # The columns are repeated by the input occupation and the rows by the output occupation.
+    expanded_subunitary = unitary[np.ix_([1, 2, 2], [0, 0, 2])]
+    expected_amplitude = perm(expanded_subunitary) / np.sqrt(2 * 2)
+    assert np.isclose(
+        fock_transition_probability_amplitude(
+            input_fock_state, output_fock_state, jnp.asarray(unitary)
+        ),
+        expected_amplitude,
+    )
+    assert np.isclose(
+        fock_transition_probability_amplitude_matrix(
+            unitary, [input_fock_state], [output_fock_state]
+        )[0, 0],
+        expected_amplitude,
+    )
@@ -0,0 +1,143 @@
+import numpy as np
+import pytest
+from piel.models.logic.photonic import (
+    IncrementalLatticeUnitary,
+    calculate_lattice_unitary,
+    compose_lattice_element_list,
+    compose_lattice_unitary_function,
+    ideal_mzi_2x2_transfer_matrix,
+)
+
+chain_3_mode_network = [["X", 0], [0, "X"]]
+
+
+def random_network(mode_amount: int, stage_amount: int) -> list[list]:
+    return [
+        ["X" if (mode + stage) % 2 == 0 else 0 for mode in range(mode_amount - 1)]
+        for stage in range(stage_amount)
+    ]
+
+
+def test_ideal_mzi_2x2_transfer_matrix_states():
+    assert np.allclose(np.abs(ideal_mzi_2x2_transfer_matrix(0.0)), [[0, 1], [1, 0]])
+    assert np.allclose(np.abs(ideal_mzi_2x2_transfer_matrix(np.pi)), [[1, 0], [0, 1]])
+    assert ideal_mzi_2x2_transfer_matrix(np.zeros(3)).shape == (3, 2, 2)
+
+
+def test_compose_lattice_element_list():
+    mode_amount, stage_amount, switches, crossings = compose_lattice_element_list(
+        [["X", "-"], [0, "X"]]
+    )
+    assert (mode_amount, stage_amount) == (3, 2)
+    assert switches == [(0, 0), (1, 1)]
+    assert crossings == [(0, 1)]
+
+
+def test_incremental_lattice_unitary_chain_routing():
+    lattice = IncrementalLatticeUnitary(chain_3_mode_network)
+    # Both switches cross and route the first mode to the last mode
+    assert np.allclose(np.abs(lattice.unitary[:, 0]) ** 2, [0, 0, 1])
+    lattice.set_switch_phase(1, np.pi)
+    assert np.allclose(np.abs(lattice.unitary[:, 0]) ** 2, [0, 1, 0])
+
+
+def test_incremental_lattice_unitary_matches_full_product():
+    rng = np.random.default_rng(0)
+    network = random_network(mode_amount=8, stage_amount=8)
+    lattice = IncrementalLatticeUnitary(network)
+    switch_amount = len(lattice.switch_position_list)
+
+    for switch_index in rng.integers(0, switch_amount, size=50):
+        lattice.set_switch_phase(int(switch_index), rng.uniform(0, 2 * np.pi))
+
+    reference = IncrementalLatticeUnitary(
+        network, switch_phases=lattice.switch_phases
+    ).unitary
+    assert np.allclose(lattice.unitary, reference)
+    assert np.allclose(lattice.unitary @ lattice.unitary.conj().T, np.eye(8))
+
+
+def test_incremental_lattice_unitary_evaluate_switch_phases():
+    lattice = IncrementalLatticeUnitary(random_network(mode_amount=5, stage_amount=4))
+    phases = np.linspace(0, np.pi, 5)
+    candidates = lattice.evaluate_switch_phases(2, phases)
+    assert candidates.shape == (5, 5, 5)
+    lattice.set_switch_phase(2, phases[3])
+    assert np.allclose(candidates[3], lattice.unitary)
+
+
+def test_incremental_lattice_unitary_invalid_phases():
+    with pytest.raises(ValueError):
+        IncrementalLatticeUnitary(chain_3_mode_network, switch_phases=[0.0])
+
+
+def test_compose_lattice_unitary_function_matches_incremental():
+    rng = np.random.default_rng(1)
+    network = random_network(mode_amount=6, stage_amount=6)
+    network[1][0:2] = ["-", 0]
+    lattice_unitary = compose_lattice_unitary_function(network)
+    switch_amount = len(compose_lattice_element_list(network)[2])
+    switch_phases = rng.uniform(0, 2 * np.pi, size=(3, switch_amount))
+
+    unitaries = np.asarray(lattice_unitary(switch_phases))
+    assert unitaries.shape == (3, 6, 6)
+    for unitary_i, switch_phases_i in zip(unitaries, switch_phases):
+        reference = IncrementalLatticeUnitary(
+            network, switch_phases=switch_phases_i
+        ).unitary
+        assert np.allclose(unitary_i, reference)
+
+
+def test_compose_lattice_unitary_function_overlapping_elements():
+    with pytest.raises(ValueError):
+        compose_lattice_unitary_function([["X", "X"]])
+
+
+def test_calculate_lattice_unitary_matches_sax():
+    import piel
+    from gdsfactory.generic_tech import get_generic_pdk
+    from piel.models.physical.photonic import (
+        component_lattice_generic,
+        mzi2x2_2x2_phase_shifter,
+    )
+
+    get_generic_pdk().activate()
+    verification_models = piel.models.frequency.get_default_models(
+        type="optical_logic_verification"
+    )
+    models = piel.models.frequency.compose_custom_model_library_from_defaults(
+        custom_defaults=verification_models,
+        custom_models={
+            "straight_heater_metal_undercut_length200": verification_models[
+                "straight_heater_metal_undercut"
+            ]
+        },
+    )
+    network = [[mzi2x2_2x2_phase_shifter(), 0], [0, mzi2x2_2x2_phase_shifter()]]
+    lattice = component_lattice_generic(network=network)
+
+    (
+        sax_unitaries,
+        _,
+        phase_address_state,
+        *_,
+    ) = piel.flows.electro_optic.compose_network_matrix_from_models(
+        circuit_component=lattice,
+        models=models,
+        switch_states=[0, np.pi / 3, np.pi],
+    )
+    switch_phases = np.array(
+        [
+            piel.flows.electro_optic.extract_phase_tuple_from_phase_address_state(
+                phase_address_state[id_i]
+            )
+            for id_i in range(len(sax_unitaries))
+        ],
+        dtype=float,
+    )
+
+    unitaries = calculate_lattice_unitary(network, switch_phases)
+    assert np.allclose(
+        np.asarray(unitaries),
+        np.stack([np.asarray(unitary_i) for unitary_i, _ in sax_unitaries.values()]),
+    )
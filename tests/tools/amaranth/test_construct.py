@@ -123,3 +123,36 @@ def test_sequential_truth_table():
 
     # For sequential, a detailed simulation handling clock and state would be required.
     # Here, we check that the module is created correctly.
+
+
+def test_memory_truth_table(tmp_path):
+    from piel.tools.amaranth import verify_amaranth_truth_table
+
+    truth_table = TruthTable(
+        input_ports=["input_port"],
+        output_ports=["output_port1", "output_port2"],
+        input_port=["000", "011", "101", "111"],
+        output_port1=["00", "10", "11", "01"],
+        output_port2=["1", "0", "1", "1"],
+    )
+    am_module = construct_amaranth_module_from_truth_table(
+        truth_table, logic_implementation_type="memory"
+    )
+    assert am_module.memory.depth == 8
+    # The words concatenate the outputs from the least significant bit, and unlisted inputs are zero
+    assert list(am_module.memory.init) == [0b100, 0, 0, 0b010, 0, 0b111, 0, 0b101]
+
+    # The module can be simulated more than once
+    for _ in range(2):
+        verify_amaranth_truth_table(
+            am_module,
+            truth_table,
+            "memory.vcd",
+            tmp_path,
+            implementation_type="memory",
+        )
+
+    with pytest.raises(ValueError):
+        construct_amaranth_module_from_truth_table(
+            truth_table, logic_implementation_type="invalid"
+        )
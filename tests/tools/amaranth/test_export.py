@@ -56,6 +56,29 @@ def test_generate_verilog(tmp_path):
         assert "output1" in verilog_code
 
 
+def test_generate_verilog_memory(tmp_path):
+    from piel.tools.amaranth import construct_amaranth_module_from_truth_table
+
+    truth_table = TruthTable(
+        input_ports=["input1"],
+        output_ports=["output1"],
+        input1=["00", "01", "10", "11"],
+        output1=["01", "10", "11", "01"],
+    )
+    am_module = construct_amaranth_module_from_truth_table(
+        truth_table, logic_implementation_type="memory"
+    )
+    generate_verilog_from_amaranth_truth_table(
+        am_module, truth_table, "memory.v", tmp_path
+    )
+
+    verilog_code = (tmp_path / "memory.v").read_text()
+    assert "input1" in verilog_code
+    assert "output1" in verilog_code
+    # The clock of the synchronous memory read is exported as a port
+    assert "input clk" in verilog_code
+
+
 def test_generate_verilog_with_missing_port(tmp_path):
     # Define a truth table with a missing port
     truth_table_data = {
@@ -0,0 +1,98 @@
+import numpy as np
+import pytest
+from piel.tools.amaranth import (
+    construct_amaranth_module_from_truth_table,
+    minimize_truth_table,
+    verify_amaranth_truth_table,
+)
+from piel.types import TruthTable
+
+
+def evaluate_sum_of_products(implicants, input_values):
+    return np.array(
+        [
+            any((int(x) & care_mask) == value for value, care_mask in implicants)
+            for x in input_values
+        ]
+    )
+
+
+def random_truth_table(input_bit_width, row_amount, seed=0):
+    random_generator = np.random.default_rng(seed)
+    return TruthTable(
+        input_ports=["a"],
+        output_ports=["q"],
+        port_arrays={
+            "a": random_generator.choice(2**input_bit_width, row_amount, replace=False),
+            "q": random_generator.integers(0, 8, row_amount),
+        },
+        port_bit_widths={"a": input_bit_width, "q": 3},
+    )
+
+
+def test_minimize_truth_table():
+    truth_table = TruthTable(
+        input_ports=["detector_in"],
+        output_ports=["phase_map_out"],
+        detector_in=["00", "01", "10", "11"],
+        phase_map_out=["00", "10", "11", "11"],
+    )
+    minimization = minimize_truth_table(truth_table)
+    assert minimization["method"] == "quine_mccluskey"
+    assert minimization["sum_of_products"]["phase_map_out"] == [
+        [(2, 2)],
+        [(1, 1), (2, 2)],
+    ]
+    assert minimization["metrics"] == {
+        "case_amount": 4,
+        "unminimized_term_amount": 5,
+        "unminimized_literal_amount": 10,
+        "term_amount": 3,
+        "literal_amount": 3,
+    }
+
+
+@pytest.mark.parametrize("method", ["quine_mccluskey", "espresso"])
+@pytest.mark.parametrize("dont_care_unlisted_inputs", [True, False])
+def test_minimize_truth_table_implements_rows(method, dont_care_unlisted_inputs):
+    truth_table = random_truth_table(input_bit_width=6, row_amount=40)
+    minimization = minimize_truth_table(
+        truth_table,
+        method=method,
+        dont_care_unlisted_inputs=dont_care_unlisted_inputs,
+    )
+    sum_of_products = minimization["sum_of_products"]["q"]
+    inputs = truth_table.integer_dictionary["a"]
+    outputs = sum(
+        evaluate_sum_of_products(bit_implicants, inputs) << bit_i
+        for bit_i, bit_implicants in enumerate(sum_of_products)
+    )
+    assert outputs.tolist() == truth_table.integer_dictionary["q"].tolist()
+    assert (
+        minimization["metrics"]["literal_amount"]
+        < minimization["metrics"]["unminimized_literal_amount"]
+    )
+
+    if not dont_care_unlisted_inputs:
+        # The unlisted inputs are zero outputs as in the default case
+        unlisted_inputs = np.setdiff1d(np.arange(2**6), inputs)
+        for bit_implicants in sum_of_products:
+            assert not np.any(evaluate_sum_of_products(bit_implicants, unlisted_inputs))
+
+
+def test_minimize_truth_table_auto_method():
+    assert minimize_truth_table(random_truth_table(9, 50))["method"] == "espresso"
+    with pytest.raises(ValueError):
+        minimize_truth_table(random_truth_table(4, 5), method="invalid")
+
+
+def test_construct_minimized_module(tmp_path):
+    truth_table = random_truth_table(input_bit_width=5, row_amount=20).to_bits()
+    am_module = construct_amaranth_module_from_truth_table(truth_table, minimize=True)
+    assert am_module.minimization["metrics"]["case_amount"] == 20
+    verify_amaranth_truth_table(am_module, truth_table, "minimized.vcd", tmp_path)
+
+    with pytest.raises(ValueError):
+        construct_amaranth_module_from_truth_table(
+            truth_table, logic_implementation_type="sequential", minimize=True
+        )
@@ -197,3 +197,20 @@ def test_verify_memory_logic(tmp_path):
     # Check that the VCD file was created
     vcd_file_path = target_directory / vcd_file_name
     assert vcd_file_path.exists()
+
+
+def test_verify_columnar_truth_table(tmp_path):
+    truth_table = TruthTable(
+        input_ports=["input1"],
+        output_ports=["output1"],
+        input1=["00", "01", "10", "11"],
+        output1=["0", "0", "0", "1"],
+    ).to_columnar()
+    verify_amaranth_truth_table(
+        SimpleAmaranthModule(),
+        truth_table,
+        "output_columnar.vcd",
+        tmp_path,
+        implementation_type="combinatorial",
+    )
+    assert (tmp_path / "output_columnar.vcd").exists()
@@ -0,0 +1,69 @@
+import itertools
+import numpy as np
+import pytest
+from piel.tools.qutip import (
+    all_fock_states_from_photon_number,
+    fock_basis_from_photon_number,
+    fock_basis_size,
+    fock_state_rank,
+    fock_state_unrank,
+    fock_states_at_mode_index,
+)
+
+
+def test_all_fock_states_from_photon_number_product_order():
+    states = all_fock_states_from_photon_number(3, 2, output_type="numpy")
+    expected_states = list(itertools.product(range(3), repeat=3))
+    assert len(states) == len(expected_states)
+    for state, expected_state in zip(states, expected_states):
+        assert np.array_equal(state, np.array(expected_state).reshape(3, 1))
+
+
+def test_fock_states_at_mode_index_constrains_target_mode():
+    states = fock_states_at_mode_index(3, 1, 2, output_type="numpy")
+    expected_states = [
+        state for state in itertools.product(range(3), repeat=3) if 0 < state[1] <= 2
+    ]
+    assert [tuple(state.ravel()) for state in states] == expected_states
+    assert fock_states_at_mode_index(3, 3, 2) == []
+
+
+def test_fock_basis_from_photon_number():
+    basis = fock_basis_from_photon_number(3, 2)
+    assert basis.tolist() == [
+        [2, 0, 0],
+        [1, 1, 0],
+        [1, 0, 1],
+        [0, 2, 0],
+        [0, 1, 1],
+        [0, 0, 2],
+    ]
+    assert fock_basis_from_photon_number(12, 3).shape == (fock_basis_size(12, 3), 12)
+    assert fock_basis_from_photon_number(2, 0).tolist() == [[0, 0]]
+
+
+@pytest.mark.parametrize("mode_amount, photon_amount", [(1, 3), (4, 0), (5, 3)])
+def test_fock_state_rank_unrank_roundtrip(mode_amount, photon_amount):
+    basis = fock_basis_from_photon_number(mode_amount, photon_amount)
+    ranks = np.arange(len(basis))
+    assert np.array_equal(fock_state_rank(basis), ranks)
+    assert np.array_equal(fock_state_unrank(ranks, mode_amount, photon_amount), basis)
+    assert fock_state_rank(basis[-1]) == len(basis) - 1
+
+
+@pytest.mark.parametrize("mode_amount, photon_amount", [(30, 30), (40, 40)])
+def test_fock_state_rank_unrank_roundtrip_large_basis(mode_amount, photon_amount):
+    # The basis sizes exceed 2**53, and the second one also exceeds int64.
+    basis_size = fock_basis_size(mode_amount, photon_amount)
+    assert basis_size > 2**53
+    ranks = [0, 2**53 + 1, basis_size // 3, basis_size - 2, basis_size - 1]
+    fock_states = fock_state_unrank(ranks, mode_amount, photon_amount)
+    assert np.all(fock_states.sum(axis=-1) == photon_amount)
+    assert fock_states[-1].tolist() == [0] * (mode_amount - 1) + [photon_amount]
+    assert [int(rank) for rank in fock_state_rank(fock_states)] == ranks
+    assert fock_state_rank(fock_states[-2]) == basis_size - 2
+
+
+def test_fock_state_unrank_out_of_range():
+    with pytest.raises(ValueError):
+        fock_state_unrank(fock_basis_size(3, 2), 3, 2)
@@ -0,0 +1,60 @@
+import jax.numpy as jnp
+import numpy as np
+import pytest
+from scipy.stats import unitary_group
+from piel.tools.qutip import (
+    calculate_unitarity_metrics,
+    subunitary_selection_on_index,
+    verify_matrix_is_unitary,
+)
+
+
+def test_calculate_unitarity_metrics_batch():
+    unitaries = unitary_group.rvs(4, size=6, random_state=0)
+    unitaries[2] *= 0.5
+    unitaries[4, 0, 0] += 1e-3
+    metrics = calculate_unitarity_metrics(unitaries, atol=1e-6)
+    assert np.asarray(metrics["unitarity_deviation"]).shape == (6,)
+    assert np.asarray(metrics["insertion_loss_dB"]).shape == (6, 4)
+    assert np.asarray(metrics["is_unitary"]).tolist() == [
+        True,
+        True,
+        False,
+        True,
+        False,
+        True,
+    ]
+    assert np.allclose(metrics["insertion_loss_dB"][2], -10 * np.log10(0.25))
+    assert np.allclose(
+        np.asarray(metrics["insertion_loss_dB"])[[0, 1, 3, 5]], 0, atol=1e-9
+    )
+    assert calculate_unitarity_metrics(unitaries[4], atol=1e-2)["is_unitary"]
+
+
+def test_verify_matrix_is_unitary():
+    unitary = unitary_group.rvs(3, random_state=1)
+    assert verify_matrix_is_unitary(unitary) is True
+    assert verify_matrix_is_unitary(0.9 * unitary) is False
+    assert verify_matrix_is_unitary(0.9 * unitary, atol=0.5) is True
+    assert verify_matrix_is_unitary(np.stack([unitary, 0.9 * unitary])).tolist() == [
+        True,
+        False,
+    ]
+
+
+def test_verify_matrix_is_unitary_rejects_isometries():
+    isometry = np.array([[1.0], [0.0]])
+    with pytest.raises(ValueError):
+        verify_matrix_is_unitary(isometry)
+    metrics = calculate_unitarity_metrics(isometry)
+    # The isometry columns are orthonormal, but it is not unitary
+    assert np.isclose(metrics["unitarity_deviation"], 0)
+    assert not metrics["is_unitary"]
+
+
+def test_subunitary_selection_on_index_selects_rows_and_columns():
+    unitary = unitary_group.rvs(4, random_state=2)
+    subunitary = subunitary_selection_on_index(
+        unitary_matrix=jnp.asarray(unitary), rows_index=(1, 2), columns_index=(0, 3)
+    )
+    assert np.allclose(subunitary, unitary[np.ix_([1, 2], [0, 3])])
@@ -0,0 +1,198 @@
+import gdsfactory as gf
+import jax.numpy as jnp
+import numpy as np
+import pytest
+import sax
+from gdsfactory.generic_tech import get_generic_pdk
+from piel.tools.sax import (
+    SaxCircuitCache,
+    address_value_dictionary_to_function_parameter_dictionary,
+    compose_switch_phase_executable,
+    sax_to_s_parameters_standard_matrix,
+)
+
+get_generic_pdk().activate()
+
+# Sample netlist and models for testing
+sample_netlist = {
+    "instances": {
+        "lft": "coupler",
+        "rgt": "coupler",
+    },
+    "connections": {
+        "lft,out0": "rgt,in0",
+        "lft,out1": "rgt,in1",
+    },
+    "ports": {
+        "in0": "lft,in0",
+        "in1": "lft,in1",
+        "out0": "rgt,out0",
+        "out1": "rgt,out1",
+    },
+}
+sample_models = {"coupler": sax.models.coupler}
+
+
+def phase_shifter(wl=1.55, active_phase_rad=0.0):
+    return sax.reciprocal({("in0", "out0"): jnp.exp(1j * active_phase_rad)})
+
+
+# A Mach-Zehnder interferometer with a phase shifter on each arm
+mzi_netlist = {
+    "instances": {
+        "lft": "coupler",
+        "top": "phase_shifter",
+        "btm": "phase_shifter",
+        "rgt": "coupler",
+    },
+    "connections": {
+        "lft,out0": "btm,in0",
+        "btm,out0": "rgt,in0",
+        "lft,out1": "top,in0",
+        "top,out0": "rgt,in1",
+    },
+    "ports": {
+        "in0": "lft,in0",
+        "in1": "lft,in1",
+        "out0": "rgt,out0",
+        "out1": "rgt,out1",
+    },
+}
+mzi_models = {"coupler": sax.models.coupler, "phase_shifter": phase_shifter}
+mzi_switch_instance_list = [("mzi", "top"), ("mzi", "btm")]
+
+
+def test_get_circuit_hit_and_miss():
+    cache = SaxCircuitCache()
+    circuit_0, _ = cache.get_circuit(netlist=sample_netlist, models=sample_models)
+    circuit_1, _ = cache.get_circuit(netlist=sample_netlist, models=sample_models)
+    assert circuit_0 is circuit_1
+    assert cache.circuit_hits == 1
+    assert cache.circuit_misses == 1
+
+
+def test_get_circuit_models_identity():
+    cache = SaxCircuitCache()
+    cache.get_circuit(netlist=sample_netlist, models=sample_models)
+    cache.get_circuit(
+        netlist=sample_netlist, models={"coupler": lambda: sax.models.coupler()}
+    )
+    assert cache.circuit_misses == 2
+
+
+def test_get_circuit_lru_eviction():
+    cache = SaxCircuitCache(maxsize=1)
+    cache.get_circuit(netlist=sample_netlist, models=sample_models)
+    cache.get_circuit(netlist=sample_netlist, models=sample_models, backend="default")
+    cache.get_circuit(netlist=sample_netlist, models=sample_models)
+    assert cache.statistics == {
+        "netlist_hits": 0,
+        "netlist_misses": 0,
+        "circuit_hits": 0,
+        "circuit_misses": 3,
+        "executable_hits": 0,
+        "executable_misses": 0,
+    }
+
+
+def test_get_netlist_disk_cache(tmp_path):
+    calls = []
+
+    def netlist_function(component):
+        calls.append(component.name)
+        return component.get_netlist()
+
+    component = gf.components.straight(length=11.0)
+    cache = SaxCircuitCache(cache_directory=tmp_path)
+    netlist_0 = cache.get_netlist(component, netlist_function=netlist_function)
+    netlist_1 = cache.get_netlist(component, netlist_function=netlist_function)
+    assert netlist_0 is netlist_1
+    assert len(calls) == 1
+
+    # A new cache instance reads the netlist back from disk.
+    new_cache = SaxCircuitCache(cache_directory=tmp_path)
+    new_cache.get_netlist(component, netlist_function=netlist_function)
+    assert len(calls) == 1
+    assert new_cache.netlist_hits == 1
+    assert new_cache.netlist_misses == 0
+
+
+def test_get_netlist_disk_cache_round_trip(tmp_path):
+    def netlist_function(component):
+        netlist = component.get_netlist()
+        netlist["placements"] = {"straight_1": {"origin": (0.0, 1.5), "labels": []}}
+        return netlist
+
+    component = gf.components.straight(length=12.0)
+    netlist = SaxCircuitCache(cache_directory=tmp_path).get_netlist(
+        component, netlist_function=netlist_function
+    )
+    disk_netlist = SaxCircuitCache(cache_directory=tmp_path).get_netlist(
+        component, netlist_function=netlist_function
+    )
+    assert disk_netlist == netlist_function(component)
+    assert disk_netlist == netlist
+    assert disk_netlist["placements"]["straight_1"]["origin"] == (0.0, 1.5)
+
+    # Netlists that cannot be stored faithfully are rejected rather than stringified
+    with pytest.raises(TypeError):
+        SaxCircuitCache(cache_directory=tmp_path / "invalid").get_netlist(
+            component, netlist_function=lambda component: {"settings": {1: object()}}
+        )
+    with pytest.raises(TypeError):
+        SaxCircuitCache(cache_directory=tmp_path / "invalid").get_netlist(
+            component, netlist_function=lambda component: {"settings": object()}
+        )
+
+
+def test_get_switch_phase_executable_hit_and_miss():
+    cache = SaxCircuitCache()
+    executable_0 = cache.get_switch_phase_executable(
+        netlist=mzi_netlist,
+        models=mzi_models,
+        switch_instance_list=mzi_switch_instance_list,
+    )
+    executable_1 = cache.get_switch_phase_executable(
+        netlist=mzi_netlist,
+        models=mzi_models,
+        switch_instance_list=mzi_switch_instance_list,
+    )
+    assert executable_0 is executable_1
+    assert (cache.executable_hits, cache.executable_misses) == (1, 1)
+
+    # A different phase order is a different executable, but reuses the compiled circuit.
+    cache.get_switch_phase_executable(
+        netlist=mzi_netlist,
+        models=mzi_models,
+        switch_instance_list=mzi_switch_instance_list[::-1],
+    )
+    assert (cache.executable_hits, cache.executable_misses) == (1, 2)
+    assert (cache.circuit_hits, cache.circuit_misses) == (1, 1)
+
+
+def test_compose_switch_phase_executable_matches_standard_matrix():
+    circuit, _ = sax.circuit(netlist=mzi_netlist, models=mzi_models)
+    for input_ports_order in [None, ("in1", "in0")]:
+        executable, ports_order = compose_switch_phase_executable(
+            circuit=circuit,
+            switch_instance_list=mzi_switch_instance_list,
+            input_ports_order=input_ports_order,
+        )
+        for phases in [(0.0, 0.0), (np.pi / 3, 0.0), (np.pi, np.pi / 5)]:
+            reference_matrix, reference_ports_order = (
+                sax_to_s_parameters_standard_matrix(
+                    circuit(
+                        **address_value_dictionary_to_function_parameter_dictionary(
+                            address_value_dictionary=dict(
+                                zip(mzi_switch_instance_list, phases)
+                            ),
+                            parameter_key="active_phase_rad",
+                        )
+                    ),
+                    input_ports_order=input_ports_order,
+                )
+            )
+            assert ports_order == tuple(reference_ports_order)
+            assert np.allclose(executable(jnp.array(phases)), reference_matrix)
+        if input_ports_order is not None:
+            assert ports_order == input_ports_order
@@ -0,0 +1,257 @@
+import numpy as np
+import pytest
+import sax
+from piel.models.frequency.photonic import active_waveguide, waveguide
+from piel.models.frequency.photonic.coupler_simple import coupler
+from piel.tools.sax import (
+    RecursiveNetlistIndex,
+    address_value_dictionary_to_function_parameter_dictionary,
+    compose_recursive_instance_addresses,
+    compose_recursive_instance_location,
+    compose_recursive_netlist_dependency_graph,
+    compose_recursive_netlist_index,
+    get_component_instances,
+    get_matched_model_recursive_netlist_instances,
+    get_netlist_instances_by_prefix,
+)
+
+
+def compose_mzi_netlist(heater_component: str) -> dict:
+    return {
+        "instances": {
+            "lft": "coupler",
+            "sxt": heater_component,
+            "sxb": "waveguide",
+            "rgt": "coupler",
+        },
+        "connections": {
+            "lft,out0": "sxt,o1",
+            "sxt,o2": "rgt,in0",
+            "lft,out1": "sxb,o1",
+            "sxb,o2": "rgt,in1",
+        },
+        "ports": {
+            "in0": "lft,in0",
+            "in1": "lft,in1",
+            "out0": "rgt,out0",
+            "out1": "rgt,out1",
+        },
+    }
+
+
+recursive_netlist = {
+    "lattice_545e9440": {
+        "instances": {
+            "mzi_1": "mzi_214beef3",
+            "mzi_2": "mzi_214beef3",
+            "mzi_3": "mzi_214beef3",
+        },
+        "connections": {
+            "mzi_1,out0": "mzi_2,in0",
+            "mzi_2,out0": "mzi_3,in0",
+        },
+        "ports": {
+            "in0": "mzi_1,in0",
+            "in1": "mzi_1,in1",
+            "in2": "mzi_2,in1",
+            "in3": "mzi_3,in1",
+            "out0": "mzi_3,out0",
+            "out1": "mzi_1,out1",
+            "out2": "mzi_2,out1",
+            "out3": "mzi_3,out1",
+        },
+    },
+    "mzi_214beef3": compose_mzi_netlist("straight_heater_metal_s_ad3c1693"),
+    "mzi_d46c281f": compose_mzi_netlist("straight_heater_metal_s_ad3c1693"),
+    "ring_b1c2d3e4": compose_mzi_netlist("waveguide"),
+}
+models = {
+    "coupler": coupler,
+    "waveguide": waveguide,
+    "straight_heater_metal_s_ad3c1693": active_waveguide,
+}
+
+
+def test_recursive_netlist_index_lookups():
+    netlist_index = RecursiveNetlistIndex(recursive_netlist)
+    assert compose_recursive_netlist_index(netlist_index) is netlist_index
+    assert netlist_index.get_cells_by_prefix("mzi") == ["mzi_214beef3", "mzi_d46c281f"]
+    assert netlist_index.get_cell_by_prefix("lattice") == "lattice_545e9440"
+    assert netlist_index.get_component_instances(
+        "lattice_545e9440", component_name_prefix="mzi_2"
+    ) == ["mzi_1", "mzi_2", "mzi_3"]
+    assert (
+        netlist_index.get_component_instances(
+            "lattice_545e9440", component_name_prefix="mzi_d"
+        )
+        == []
+    )
+    assert netlist_index.get_component_instances("mzi_214beef3", "straight") == ["sxt"]
+    with pytest.raises(ValueError):
+        netlist_index.get_cell_by_prefix("mzi")
+    with pytest.raises(ValueError):
+        netlist_index.get_cell_by_prefix("splitter")
+
+
+def test_recursive_netlist_helpers_accept_index():
+    netlist_index = compose_recursive_netlist_index(recursive_netlist)
+    for netlist in (recursive_netlist, netlist_index):
+        assert get_netlist_instances_by_prefix(netlist, "lattice") == "lattice_545e9440"
+        assert get_component_instances(netlist, "ring", "wave") == {
+            "wave": ["sxt", "sxb"]
+        }
+        assert get_matched_model_recursive_netlist_instances(
+            netlist,
+            top_level_instance_prefix="lattice",
+            target_component_prefix="mzi",
+            models=models,
+        ) == [
+            ("lattice_545e9440", "mzi_1", "sxt"),
+            ("lattice_545e9440", "mzi_2", "sxt"),
+            ("lattice_545e9440", "mzi_3", "sxt"),
+        ]
+
+
+def test_matched_model_instances_at_any_depth():
+    chip_netlist = {
+        "chip_0a1b2c3d": {
+            "instances": {
+                "lattice_a": "lattice_545e9440",
+                "mzi_top": "mzi_d46c281f",
+                "lattice_b": "lattice_545e9440",
+            },
+            "connections": {
+                "lattice_a,out0": "mzi_top,in0",
+                "mzi_top,out0": "lattice_b,in0",
+            },
+            "ports": {
+                "in0": "lattice_a,in0",
+                "out0": "lattice_b,out0",
+                "out1": "lattice_a,out1",
+            },
+        },
+        **recursive_netlist,
+    }
+    switch_instance_list = get_matched_model_recursive_netlist_instances(
+        chip_netlist,
+        top_level_instance_prefix="chip",
+        target_component_prefix="mzi",
+        models=models,
+    )
+    # The instances are grouped by component, in the order in which the components first appear.
+    assert switch_instance_list == [
+        ("chip_0a1b2c3d", "lattice_a", "mzi_1", "sxt"),
+        ("chip_0a1b2c3d", "lattice_a", "mzi_2", "sxt"),
+        ("chip_0a1b2c3d", "lattice_a", "mzi_3", "sxt"),
+        ("chip_0a1b2c3d", "lattice_b", "mzi_1", "sxt"),
+        ("chip_0a1b2c3d", "lattice_b", "mzi_2", "sxt"),
+        ("chip_0a1b2c3d", "lattice_b", "mzi_3", "sxt"),
+        ("chip_0a1b2c3d", "mzi_top", "sxt"),
+    ]
+    assert compose_recursive_instance_addresses(
+        chip_netlist,
+        top_level_instance_name="chip_0a1b2c3d",
+        target_component_prefix="straight_heater_metal",
+    )[:2] == [
+        ("chip_0a1b2c3d", "lattice_a", "mzi_1", "sxt"),
+        ("chip_0a1b2c3d", "lattice_a", "mzi_2", "sxt"),
+    ]
+    (
+        model_composition_mapping,
+        instance_composition_mapping,
+        target_component_mapping,
+    ) = compose_recursive_instance_location(
+        chip_netlist,
+        top_level_instance_name="chip_0a1b2c3d",
+        required_models=None,
+        target_component_prefix="mzi",
+        models=models,
+    )
+    assert model_composition_mapping == {"lattice_545e9440": ["mzi_214beef3"]}
+    assert instance_composition_mapping["lattice_545e9440"] == [
+        "lattice_a",
+        "lattice_b",
+    ]
+    assert target_component_mapping == {
+        "mzi_d46c281f": "chip_0a1b2c3d",
+        "mzi_214beef3": "lattice_545e9440",
+    }
+
+    function_parameters = address_value_dictionary_to_function_parameter_dictionary(
+        {address: 0.0 for address in switch_instance_list},
+        parameter_key="active_phase_rad",
+    )
+    assert function_parameters["lattice_b"]["mzi_2"] == {
+        "sxt": {"active_phase_rad": 0.0}
+    }
+    # The nested parameters address the phase shifters within the nested instances.
+    circuit, _ = sax.circuit(netlist=chip_netlist, models=models)
+    s_parameters = sax.sdense(circuit(**function_parameters))[0]
+    function_parameters["lattice_a"]["mzi_1"]["sxt"]["active_phase_rad"] = np.pi
+    assert not np.allclose(sax.sdense(circuit(**function_parameters))[0], s_parameters)
+
+
+def test_matched_model_instances_mixed_lattice_order():
+    import piel
+    from gdsfactory.generic_tech import get_generic_pdk
+    from piel.models.physical.photonic import (
+        component_lattice_generic,
+        mzi2x2_2x2,
+        mzi2x2_2x2_phase_shifter,
+    )
+
+    get_generic_pdk().activate()
+    phase_shifter_mzi, mzi = mzi2x2_2x2_phase_shifter(), mzi2x2_2x2()
+    lattice = component_lattice_generic(
+        network=[
+            [phase_shifter_mzi, 0, mzi],
+            [0, mzi, 0],
+            [mzi, 0, phase_shifter_mzi],
+        ]
+    )
+    lattice_netlist = lattice.get_netlist_recursive(allow_multiple=True)
+    default_models = piel.models.frequency.get_default_models()
+
+    # The switch order of the previous releases, which defines the order of the saved phase configurations.
+    switch_instance_list = get_matched_model_recursive_netlist_instances(
+        lattice_netlist,
+        top_level_instance_prefix="component_lattice_generic",
+        target_component_prefix="mzi",
+        models=default_models,
+    )
+    assert [address[1:] for address in switch_instance_list] == [
+        ("mzi_1", "sxt"),
+        ("mzi_5", "sxt"),
+        ("mzi_2", "sxt"),
+        ("mzi_3", "sxt"),
+        ("mzi_4", "sxt"),
+    ]
+
+    # A leaf matched within the switches is addressed by its own instance, without repeating it.
+    heater_instance_list = get_matched_model_recursive_netlist_instances(
+        lattice_netlist,
+        top_level_instance_prefix="component_lattice_generic",
+        target_component_prefix="straight_heater",
+        models=default_models,
+    )
+    assert [address[1:] for address in heater_instance_list] == [
+        ("mzi_1", "sxt"),
+        ("mzi_5", "sxt"),
+    ]
+
+
+def test_recursive_netlist_dependency_graph_cycle():
+    cyclic_netlist = {
+        "cell_a": {
+            "instances": {"b": "cell_b"},
+            "connections": {},
+            "ports": {"o1": "b,o1"},
+        },
+        "cell_b": {
+            "instances": {"a": "cell_a"},
+            "connections": {},
+            "ports": {"o1": "a,o1"},
+        },
+    }
+    with pytest.raises(ValueError):
+        compose_recursive_netlist_dependency_graph(cyclic_netlist)
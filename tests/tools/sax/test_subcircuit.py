@@ -0,0 +1,152 @@
+import jax.numpy as jnp
+import numpy as np
+import sax
+from piel.models.frequency.photonic import active_waveguide, waveguide
+from piel.models.frequency.photonic.coupler_simple import coupler
+from piel.tools.sax import (
+    SaxCircuitCache,
+    address_value_dictionary_to_function_parameter_dictionary,
+    compose_cached_model,
+    compose_passive_cached_circuit,
+    get_matched_model_recursive_netlist_instances,
+)
+
+mzi_netlist = {
+    "instances": {
+        "lft": "coupler",
+        "sxt": "active_waveguide",
+        "sxb": "waveguide",
+        "rgt": "coupler",
+    },
+    "connections": {
+        "lft,out0": "sxt,o1",
+        "sxt,o2": "rgt,in0",
+        "lft,out1": "sxb,o1",
+        "sxb,o2": "rgt,in1",
+    },
+    "ports": {
+        "in0": "lft,in0",
+        "in1": "lft,in1",
+        "out0": "rgt,out0",
+        "out1": "rgt,out1",
+    },
+}
+# Three instances of the same mzi cell, and two of the same passive delay cell.
+recursive_netlist = {
+    "lattice_545e9440": {
+        "instances": {
+            "mzi_1": "mzi_214beef3",
+            "mzi_2": "mzi_214beef3",
+            "mzi_3": "mzi_214beef3",
+            "delay_1": "delay_0f1e2d3c",
+            "delay_2": "delay_0f1e2d3c",
+        },
+        "connections": {
+            "mzi_1,out0": "delay_1,o1",
+            "delay_1,o2": "mzi_2,in0",
+            "mzi_1,out1": "delay_2,o1",
+            "delay_2,o2": "mzi_2,in1",
+            "mzi_2,out1": "mzi_3,in0",
+        },
+        "ports": {
+            "in0": "mzi_1,in0",
+            "in1": "mzi_1,in1",
+            "in2": "mzi_3,in1",
+            "out0": "mzi_2,out0",
+            "out1": "mzi_3,out0",
+            "out2": "mzi_3,out1",
+        },
+    },
+    "mzi_214beef3": mzi_netlist,
+    "delay_0f1e2d3c": {
+        "instances": {"wg_1": "waveguide", "wg_2": "waveguide"},
+        "connections": {"wg_1,o2": "wg_2,o1"},
+        "ports": {"o1": "wg_1,o1", "o2": "wg_2,o2"},
+    },
+}
+models = {
+    "coupler": coupler,
+    "waveguide": waveguide,
+    "active_waveguide": active_waveguide,
+}
+
+
+def compose_phase_parameters(phases: jnp.ndarray) -> dict:
+    switch_instance_list = get_matched_model_recursive_netlist_instances(
+        recursive_netlist,
+        top_level_instance_prefix="lattice",
+        target_component_prefix="mzi",
+        models=models,
+    )
+    return address_value_dictionary_to_function_parameter_dictionary(
+        {
+            address: phases[:, address_i]
+            for address_i, address in enumerate(switch_instance_list)
+        },
+        parameter_key="active_phase_rad",
+    )
+
+
+def test_passive_cached_circuit_matches_sax_circuit():
+    circuit, _ = sax.circuit(netlist=recursive_netlist, models=models)
+    passive_cached_circuit, info = compose_passive_cached_circuit(
+        netlist=recursive_netlist, models=models
+    )
+    assert "mzi_214beef3__passive" in info.models
+    assert "delay_0f1e2d3c" in info.models
+
+    phase_parameters = compose_phase_parameters(
+        jnp.asarray(np.random.default_rng(0).uniform(0, np.pi, (4, 3)))
+    )
+    for settings in [{}, phase_parameters, {**phase_parameters, "wl": 1.56}]:
+        s_parameters = circuit(**settings)
+        passive_cached_s_parameters = passive_cached_circuit(**settings)
+        assert set(s_parameters) == set(passive_cached_s_parameters)
+        for key in s_parameters:
+            assert np.allclose(s_parameters[key], passive_cached_s_parameters[key])
+
+
+def test_passive_cached_circuit_backend(monkeypatch):
+    circuit_backends = []
+    sax_circuit = sax.circuit
+
+    def recording_circuit(*args, **kwargs):
+        circuit_backends.append(kwargs.get("backend"))
+        return sax_circuit(*args, **kwargs)
+
+    monkeypatch.setattr(sax, "circuit", recording_circuit)
+    # Without a backend, every circuit is composed with the default backend of sax.circuit.
+    compose_passive_cached_circuit(netlist=recursive_netlist, models=models)
+    assert len(circuit_backends) > 1
+    assert set(circuit_backends) == {None}
+
+    circuit_backends.clear()
+    circuit, _ = compose_passive_cached_circuit(
+        netlist=recursive_netlist, models=models, backend="filipsson_gunnar"
+    )
+    assert set(circuit_backends) == {"filipsson_gunnar"}
+    s_parameters = sax_circuit(netlist=recursive_netlist, models=models)[0]()
+    passive_cached_s_parameters = circuit()
+    for key in s_parameters:
+        assert np.allclose(s_parameters[key], passive_cached_s_parameters[key])
+
+
+def test_compose_cached_model():
+    cached_coupler = compose_cached_model(coupler)
+    assert sax.get_settings(cached_coupler) == sax.get_settings(coupler)
+    assert cached_coupler() is cached_coupler(**sax.get_settings(coupler))
+    assert cached_coupler(coupling=0.2) is not cached_coupler()
+    assert np.isclose(
+        cached_coupler(coupling=0.2)["in0", "out1"],
+        coupler(coupling=0.2)["in0", "out1"],
+    )
+
+
+def test_circuit_cache_passive_subcircuits():
+    cache = SaxCircuitCache()
+    cache.get_circuit(netlist=recursive_netlist, models=models)
+    circuit, info = cache.get_circuit(
+        netlist=recursive_netlist, models=models, cache_passive_subcircuits=True
+    )
+    assert cache.statistics["circuit_misses"] == 2
+    assert "mzi_214beef3__passive" in info.models
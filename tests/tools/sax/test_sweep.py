@@ -0,0 +1,96 @@
+import jax.numpy as jnp
+import numpy as np
+import pytest
+import sax
+from piel.models.frequency.photonic import active_waveguide, waveguide
+from piel.models.frequency.photonic.coupler_simple import coupler
+from piel.tools.sax import (
+    calculate_wavelength_sweep_s_parameters,
+    sax_to_s_parameters_standard_matrix,
+)
+
+mzi_netlist = {
+    "instances": {
+        "lft": "coupler",
+        "sxt": "active_waveguide",
+        "sxb": "waveguide",
+        "rgt": "coupler",
+    },
+    "connections": {
+        "lft,out0": "sxt,o1",
+        "sxt,o2": "rgt,in0",
+        "lft,out1": "sxb,o1",
+        "sxb,o2": "rgt,in1",
+    },
+    "ports": {
+        "in0": "lft,in0",
+        "in1": "lft,in1",
+        "out0": "rgt,out0",
+        "out1": "rgt,out1",
+    },
+}
+mzi_models = {
+    "coupler": coupler,
+    "waveguide": waveguide,
+    "active_waveguide": active_waveguide,
+}
+mzi_circuit, _ = sax.circuit(netlist=mzi_netlist, models=mzi_models)
+# The switch instance addresses refer to the instances within a top level circuit.
+lattice_circuit, _ = sax.circuit(
+    netlist={
+        "lattice": {
+            "instances": {"mzi_1": "mzi"},
+            "connections": {},
+            "ports": {
+                "in0": "mzi_1,in0",
+                "in1": "mzi_1,in1",
+                "out0": "mzi_1,out0",
+                "out1": "mzi_1,out1",
+            },
+        },
+        "mzi": mzi_netlist,
+    },
+    models=mzi_models,
+)
+wavelength_array = jnp.linspace(1.5, 1.6, 7)
+
+
+def test_wavelength_sweep_matches_loop():
+    matrices, ports_order = calculate_wavelength_sweep_s_parameters(
+        circuit=mzi_circuit, wavelength_array=wavelength_array, chunk_size=3
+    )
+    assert matrices.shape == (7, 2, 2)
+    assert ports_order == ("in0", "in1")
+    for wavelength_i, matrix_i in zip(wavelength_array, matrices):
+        expected_matrix, _ = sax_to_s_parameters_standard_matrix(
+            mzi_circuit(wl=wavelength_i)
+        )
+        assert np.allclose(matrix_i, expected_matrix)
+
+
+def test_wavelength_sweep_with_phase_configurations():
+    switch_phase_array = jnp.array([[0.0], [jnp.pi / 2], [jnp.pi]])
+    matrices, _ = calculate_wavelength_sweep_s_parameters(
+        circuit=lattice_circuit,
+        wavelength_array=wavelength_array,
+        switch_instance_list=[("lattice", "mzi_1", "sxt")],
+        switch_phase_array=switch_phase_array,
+        chunk_size=4,
+    )
+    assert matrices.shape == (3, 7, 2, 2)
+    expected_matrix, _ = sax_to_s_parameters_standard_matrix(
+        lattice_circuit(
+            wl=wavelength_array[5], mzi_1={"sxt": {"active_phase_rad": jnp.pi / 2}}
+        )
+    )
+    assert np.allclose(matrices[1, 5], expected_matrix)
+    assert not np.allclose(matrices[0], matrices[2])
+
+
+def test_wavelength_sweep_requires_switch_instances():
+    with pytest.raises(ValueError):
+        calculate_wavelength_sweep_s_parameters(
+            circuit=mzi_circuit,
+            wavelength_array=wavelength_array,
+            switch_phase_array=jnp.zeros((2, 1)),
+        )
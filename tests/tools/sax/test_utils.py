@@ -0,0 +1,86 @@
+import jax
+import jax.numpy as jnp
+import numpy as np
+import pytest
+import sax
+from piel.tools.sax import SParameterPortPlan, sax_to_s_parameters_standard_matrix
+
+coupler_s_parameters = sax.reciprocal(
+    {
+        ("in_o_0", "out_o_0"): 0.6,
+        ("in_o_0", "out_o_1"): 0.8j,
+        ("in_o_1", "out_o_0"): 0.8j,
+        ("in_o_1", "out_o_1"): 0.6,
+    }
+)
+
+
+def test_port_plan_matches_standard_matrix():
+    port_plan = SParameterPortPlan.from_sax_input(coupler_s_parameters)
+    assert port_plan.input_ports_order == ("in_o_0", "in_o_1")
+    assert port_plan.output_ports_order == ("out_o_0", "out_o_1")
+    assert np.allclose(port_plan(coupler_s_parameters), [[0.6, 0.8j], [0.8j, 0.6]])
+    assert np.allclose(
+        port_plan(sax.sdense(coupler_s_parameters)),
+        port_plan(coupler_s_parameters),
+    )
+    matrix, ports_order = sax_to_s_parameters_standard_matrix(
+        coupler_s_parameters, port_plan=port_plan
+    )
+    assert ports_order == ("in_o_0", "in_o_1")
+    assert np.allclose(matrix, port_plan(coupler_s_parameters))
+
+
+def test_port_plan_selected_input_ports():
+    port_plan = SParameterPortPlan.from_sax_input(
+        coupler_s_parameters, input_ports_order=("in_o_1", "in_o_0")
+    )
+    assert port_plan.output_ports_order == ("out_o_0", "out_o_1")
+    assert np.allclose(port_plan(coupler_s_parameters), [[0.8j, 0.6], [0.6, 0.8j]])
+
+
+def test_port_plan_selected_input_ports_sorts_output_ports_by_name():
+    # The dense index of the SDict lists "o4" before "o3"
+    s_parameters = sax.reciprocal(
+        {
+            ("o4", "o1"): 0.6,
+            ("o4", "o2"): 0.8j,
+            ("o3", "o1"): 0.8j,
+            ("o3", "o2"): 0.6,
+        }
+    )
+    expected_matrix = [[0.6, 0.8j], [0.8j, 0.6]]
+    for sax_input in [s_parameters, sax.sdense(s_parameters)]:
+        port_plan = SParameterPortPlan.from_sax_input(
+            sax_input, input_ports_order=("o2", "o1")
+        )
+        assert port_plan.input_ports_order == ("o2", "o1")
+        assert port_plan.output_ports_order == ("o3", "o4")
+        matrix, ports_order = sax_to_s_parameters_standard_matrix(
+            sax_input, input_ports_order=("o2", "o1")
+        )
+        assert ports_order == ("o2", "o1")
+        assert np.allclose(matrix, expected_matrix)
+
+
+def test_port_plan_batched_and_jit():
+    transmission = jnp.linspace(0.1, 0.9, 5)
+    batched_s_parameters = sax.reciprocal(
+        {
+            ("in_o_0", "out_o_0"): transmission,
+            ("in_o_0", "out_o_1"): 1j * jnp.sqrt(1 - transmission**2),
+            ("in_o_1", "out_o_1"): 1.0,
+        }
+    )
+    port_plan = SParameterPortPlan.from_sax_input(batched_s_parameters)
+    matrices = jax.jit(port_plan)(batched_s_parameters)
+    assert matrices.shape == (5, 2, 2)
+    assert np.allclose(matrices[:, 0, 0], transmission)
+    assert np.allclose(matrices[:, 1, 1], 1.0)
+    assert np.allclose(matrices[:, 0, 1], 0.0)
+    assert np.allclose(port_plan(sax.sdense(batched_s_parameters)), matrices)
+
+
+def test_port_plan_missing_output_ports():
+    with pytest.raises(TypeError):
+        SParameterPortPlan.from_sax_input({("o1", "o2"): 1.0})
@@ -0,0 +1,94 @@
+import itertools
+import numpy as np
+import pytest
+import thewalrus
+from scipy.stats import unitary_group
+from piel.integration import fock_transition_probability_amplitude_matrix
+from piel.tools.thewalrus import unitary_permanent_batch, unitary_permanent_repeated
+
+
+def test_unitary_permanent_batch_matches_thewalrus():
+    unitaries = unitary_group.rvs(4, size=3, random_state=0)
+    permanents = unitary_permanent_batch(unitaries)
+    assert np.allclose(permanents, [thewalrus.perm(unitary) for unitary in unitaries])
+
+
+@pytest.mark.parametrize(
+    "rows_multiplicity, columns_multiplicity",
+    [((2, 1), (1, 2)), ((3,), (1, 1, 1)), ((1, 1, 1), (1, 1, 1)), ((2, 2), (3, 1))],
+)
+def test_unitary_permanent_repeated_matches_expanded(
+    rows_multiplicity, columns_multiplicity
+):
+    matrix = unitary_group.rvs(3, random_state=1)[
+        : len(rows_multiplicity), : len(columns_multiplicity)
+    ]
+    expanded_matrix = np.repeat(
+        np.repeat(matrix, rows_multiplicity, axis=0), columns_multiplicity, axis=1
+    )
+    assert np.isclose(
+        unitary_permanent_repeated(matrix, rows_multiplicity, columns_multiplicity),
+        thewalrus.perm(expanded_matrix),
+    )
+
+
+def test_unitary_permanent_repeated_random_bunched_matches_expanded():
+    random_generator = np.random.default_rng(3)
+    for _ in range(20):
+        photon_amount = int(random_generator.integers(2, 6))
+        rows_multiplicity, columns_multiplicity = [
+            tuple(
+                np.bincount(
+                    random_generator.integers(0, mode_amount, photon_amount),
+                    minlength=mode_amount,
+                )
+            )
+            for mode_amount in random_generator.integers(1, 5, size=2)
+        ]
+        matrices = random_generator.normal(
+            size=(3, len(rows_multiplicity), len(columns_multiplicity), 2)
+        ).view(complex)[..., 0]
+        expanded_matrices = np.repeat(
+            np.repeat(matrices, rows_multiplicity, axis=-2),
+            columns_multiplicity,
+            axis=-1,
+        )
+        assert np.allclose(
+            unitary_permanent_repeated(
+                matrices, rows_multiplicity, columns_multiplicity
+            ),
+            [thewalrus.perm(matrix) for matrix in expanded_matrices],
+        )
+
+
+def test_unitary_permanent_repeated_matches_thewalrus_permanent_repeated():
+    unitary = unitary_group.rvs(3, random_state=4)
+    assert np.isclose(
+        unitary_permanent_repeated(unitary, (2, 0, 1), (2, 0, 1)),
+        thewalrus.permanent_repeated(unitary, [2, 0, 1]),
+    )
+
+
+def test_unitary_permanent_repeated_invalid_multiplicity():
+    with pytest.raises(ValueError):
+        unitary_permanent_repeated(np.eye(2), (2, 1), (1, 1))
+
+
+def test_fock_transition_probability_amplitude_matrix_bunched_states():
+    unitary = unitary_group.rvs(3, random_state=2)
+    fock_states = [
+        np.array(state).reshape(-1, 1)
+        for state in itertools.product(range(3), repeat=3)
+        if sum(state) == 2
+    ]
+    amplitudes = fock_transition_probability_amplitude_matrix(
+        unitary, fock_states, fock_states
+    )
+    # The two-photon transition matrix is unitary, including the bunched states
+    assert np.allclose(amplitudes @ amplitudes.conj().T, np.eye(len(fock_states)))
+    # Hong-Ou-Mandel interference on a balanced beamsplitter suppresses coincidences
+    beamsplitter = np.array([[1, 1j], [1j, 1]]) / np.sqrt(2)
+    hong_ou_mandel = fock_transition_probability_amplitude_matrix(
+        beamsplitter, [np.array([[1], [1]])], [np.array([[1], [1]])]
+    )
+    assert np.isclose(hong_ou_mandel[0, 0], 0)
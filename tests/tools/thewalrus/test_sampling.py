@@ -0,0 +1,71 @@
+import itertools
+import numpy as np
+import pytest
+import thewalrus
+from scipy.stats import unitary_group
+from piel.integration import fock_transition_probability_amplitude_matrix
+from piel.tools.thewalrus import (
+    compose_gray_code_subset_row_sums,
+    output_probability_distribution,
+    sample_output_fock_states,
+)
+
+
+def test_compose_gray_code_subset_row_sums_covers_all_subsets():
+    matrix = np.arange(12).reshape(4, 3)
+    subset_row_sums, subset_sizes = compose_gray_code_subset_row_sums(matrix)
+    expected_row_sums = {
+        tuple(matrix[:, list(subset)].sum(axis=1))
+        for size in range(1, 4)
+        for subset in itertools.combinations(range(3), size)
+    }
+    assert subset_row_sums.shape == (7, 4)
+    assert {tuple(np.real(row).astype(int)) for row in subset_row_sums} == (
+        expected_row_sums
+    )
+    assert sorted(subset_sizes) == [1, 1, 1, 2, 2, 2, 3]
+
+
+@pytest.mark.parametrize("input_fock_state", [(1, 1, 0, 1, 0), (2, 0, 1, 0, 0)])
+def test_output_probability_distribution_matches_amplitudes(input_fock_state):
+    unitary = unitary_group.rvs(5, random_state=3)
+    states, probabilities = output_probability_distribution(
+        unitary, input_fock_state, chunk_size=3, worker_amount=2
+    )
+    amplitudes = fock_transition_probability_amplitude_matrix(
+        unitary,
+        [np.array(input_fock_state).reshape(-1, 1)],
+        [state.reshape(-1, 1) for state in states],
+    )
+    assert states.shape == (35, 5)
+    assert np.all(states.sum(axis=1) == 3)
+    assert np.isclose(probabilities.sum(), 1)
+    assert np.allclose(probabilities, np.abs(amplitudes[0]) ** 2)
+
+
+def test_output_probability_distribution_selected_states():
+    unitary = unitary_group.rvs(3, random_state=0)
+    output_fock_states = np.array([[1, 1, 0], [0, 0, 2]])
+    states, probabilities = output_probability_distribution(
+        (unitary, ("o0", "o1", "o2")), (0, 1, 1), output_fock_states
+    )
+    assert np.array_equal(states, output_fock_states)
+    assert np.isclose(
+        probabilities[0], np.abs(thewalrus.perm(unitary[np.ix_([0, 1], [1, 2])])) ** 2
+    )
+
+
+def test_sample_output_fock_states_follows_distribution():
+    unitary = unitary_group.rvs(4, random_state=2)
+    input_fock_state = (1, 1, 0, 0)
+    states, probabilities = output_probability_distribution(unitary, input_fock_state)
+    samples = sample_output_fock_states(
+        unitary, input_fock_state, sample_amount=4000, seed=0
+    )
+    assert samples.shape == (4000, 4)
+    assert np.all(samples.sum(axis=1) == 2)
+    state_index = {tuple(state): i for i, state in enumerate(states)}
+    frequencies = np.bincount(
+        [state_index[tuple(sample)] for sample in samples], minlength=len(states)
+    ) / len(samples)
+    assert np.allclose(frequencies, probabilities, atol=0.03)
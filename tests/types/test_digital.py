@@ -1,4 +1,6 @@
+import numpy as np
 import pandas as pd
+import pytest
 from piel.types import (
     TruthTable,
 )  # Adjust the import based on your actual module structure
@@ -68,3 +70,90 @@ def test_truth_table_implementation_dictionary():
     assert impl_dict["A"] == truth_table_data["A"]
     assert impl_dict["B"] == truth_table_data["B"]
     assert impl_dict["Q"] == truth_table_data["Q"]
+
+
+def test_truth_table_columnar_conversion():
+    truth_table_data = {
+        "input_ports": ["detector_in"],
+        "output_ports": ["phase_map_out"],
+        "detector_in": ["00", "01", "10", "11"],
+        "phase_map_out": ["000", "010", "011", "111"],
+        "comment": ["a", "b", "c", "d"],
+    }
+    tt = TruthTable(**truth_table_data)
+    assert not tt.is_columnar
+    assert tt.bit_width_dictionary == {"detector_in": 2, "phase_map_out": 3}
+    assert tt.integer_dictionary["phase_map_out"].tolist() == [0, 2, 3, 7]
+
+    columnar_tt = tt.to_columnar()
+    assert columnar_tt.is_columnar
+    assert columnar_tt.port_arrays["detector_in"].tolist() == [0, 1, 2, 3]
+    assert columnar_tt.comment == truth_table_data["comment"]
+    assert (
+        columnar_tt.implementation_dictionary["phase_map_out"]
+        == truth_table_data["phase_map_out"]
+    )
+    assert (
+        columnar_tt.dataframe["detector_in"].tolist() == truth_table_data["detector_in"]
+    )
+    # The conversion is loss-free
+    assert columnar_tt.to_bits().model_dump() == tt.model_dump()
+
+
+def test_truth_table_columnar_views_are_cached():
+    tt = TruthTable(
+        input_ports=["A"],
+        output_ports=["Q"],
+        port_arrays={"A": np.array([0, 1, 2]), "Q": np.array([1, 0, 1])},
+        port_bit_widths={"A": 4},
+    )
+    assert tt.bit_width_dictionary == {"A": 4, "Q": 1}
+    assert tt.implementation_dictionary == {
+        "A": ["0000", "0001", "0010"],
+        "Q": ["1", "0", "1"],
+    }
+    # The cached views are returned as copies
+    tt.dataframe.loc[0, "A"] = "1111"
+    tt.implementation_dictionary["Q"][0] = "0"
+    tt.integer_dictionary["A"][0] = 15
+    assert tt.dataframe["A"].tolist() == ["0000", "0001", "0010"]
+    assert tt.implementation_dictionary["Q"] == ["1", "0", "1"]
+    assert tt.integer_dictionary["A"].tolist() == [0, 1, 2]
+    assert tt.port_arrays["A"].tolist() == [0, 1, 2]
+    tt.port_arrays = {"A": np.array([3, 4, 5]), "Q": np.array([0, 0, 1])}
+    assert tt.dataframe["A"].tolist() == ["0011", "0100", "0101"]
+
+
+def test_truth_table_bit_views_follow_in_place_changes():
+    tt = TruthTable(input_ports=["a"], output_ports=["q"], a=["0", "1"], q=["1", "0"])
+    assert tt.dataframe.shape == (2, 2)
+    assert tt.integer_dictionary["a"].tolist() == [0, 1]
+
+    # The binary string columns are lists that can be modified in place
+    tt.a.append("1")
+    tt.q.append("1")
+    assert tt.dataframe.shape == (3, 2)
+    assert tt.integer_dictionary["a"].tolist() == [0, 1, 1]
+    assert tt.implementation_dictionary == {"a": ["0", "1", "1"], "q": ["1", "0", "1"]}
+
+    # The columnar views are cached, so the port arrays are read-only
+    columnar_tt = tt.to_columnar()
+    with pytest.raises(ValueError):
+        columnar_tt.port_arrays["a"][0] = 1
+
+
+def test_truth_table_columnar_validation():
+    with pytest.raises(ValueError):
+        TruthTable(
+            input_ports=["A"], output_ports=["Q"], port_arrays={"A": np.zeros(2)}
+        )
+    with pytest.raises(ValueError):
+        TruthTable(
+            input_ports=["A"],
+            output_ports=["Q"],
+            port_arrays={"A": np.zeros(2, dtype=int), "Q": np.zeros(3, dtype=int)},
+        )
+    with pytest.raises(ValueError):
+        TruthTable(
+            input_ports=["A"], output_ports=["Q"], A=["2"], Q=["0"]
+        ).integer_dictionary
@@ -40,3 +40,64 @@ def test_bit_phase_map_invalid_input():
     phases = ["invalid", "files"]  # Phases should be numerical types
     with pytest.raises(ValueError):
         BitPhaseMap(bits=bits, phase=phases)
+
+
+def test_bit_phase_map_dataframe_cache():
+    bpm = BitPhaseMap(bits=["00", "01"], phase=[0.0, 0.5])
+    # The cached dataframe is returned as a copy
+    bpm.dataframe.loc[0, "phase"] = 0.3
+    assert bpm.dataframe["phase"].tolist() == [0.0, 0.5]
+    bpm.phase = [0.0, 0.7]
+    assert bpm.dataframe["phase"].tolist() == [0.0, 0.7]
+    assert bpm.sorted_phase.tolist() == [0.0, 0.7]
+
+
+def test_bit_phase_map_convert_phase_to_bits():
+    # Unsorted phases with a repeated phase, which maps to the first bits in the mapping order
+    bpm = BitPhaseMap(
+        bits=["00", "01", "10", "11", "100"], phase=[0.5, 0.1, 0.5, 0.9, 0.1]
+    )
+    assert bpm.sorted_phase.tolist() == [0.1, 0.1, 0.5, 0.5, 0.9]
+    assert bpm.sorted_bits.tolist() == ["01", "100", "00", "10", "11"]
+
+    phases = np.array([[-1.0, 0.1, 0.29], [0.3, 0.71, 2.0]])
+    bits, nearest_phases = bpm.convert_phase_to_bits(phases)
+    assert bits.tolist() == [["01", "01", "01"], ["01", "11", "11"]]
+    assert nearest_phases.tolist() == [[0.1, 0.1, 0.1], [0.1, 0.9, 0.9]]
+    # The nearest phase index matches a linear scan of the mapping
+    random_phases = np.random.default_rng(0).uniform(-1, 2, 100)
+    nearest_index = bpm.find_nearest_phase_index(random_phases)
+    assert np.array_equal(
+        bpm.sorted_phase[nearest_index],
+        np.asarray(bpm.phase)[
+            np.argmin(
+                np.abs(np.asarray(bpm.phase)[None, :] - random_phases[:, None]), axis=1
+            )
+        ],
+    )
+
+
+def test_bit_phase_map_nearest_phase_ties_follow_mapping_order():
+    # Non-monotonic mapping in which the higher of two equidistant phases comes first
+    bpm = BitPhaseMap(bits=["10", "01", "00", "11"], phase=[0.75, 0.25, 0.5, 1.0])
+    bits, nearest_phases = bpm.convert_phase_to_bits([0.375, 0.625, 0.875])
+    assert bits.tolist() == ["01", "10", "10"]
+    assert nearest_phases.tolist() == [0.25, 0.75, 0.75]
+
+    # The ties match a linear scan of the mapping, which keeps the first minimum
+    tied_phases = np.array([0.0, 0.125, 0.375, 0.625, 0.875, 1.25])
+    linear_scan_index = np.argmin(
+        np.abs(np.asarray(bpm.phase)[None, :] - tied_phases[:, None]), axis=1
+    )
+    assert (
+        bpm.convert_phase_to_bits(tied_phases)[0].tolist()
+        == np.asarray(bpm.bits)[linear_scan_index].tolist()
+    )
+
+
+def test_bit_phase_map_convert_bits_to_phase():
+    bpm = BitPhaseMap(bits=["00", "01", "10", "01"], phase=[0.5, 0.1, 0.9, 0.3])
+    assert bpm.convert_bits_to_phase(["10", "01", "00"]).tolist() == [0.9, 0.1, 0.5]
+    assert bpm.convert_bits_to_phase("10") == 0.9
+    with pytest.raises(ValueError):
+        bpm.convert_bits_to_phase(["11"])
@@ -1,4 +1,5 @@
 import pytest
+import numpy as np
 import pandas as pd
 from piel.types import (
     OpticalStateTransitions,
@@ -135,3 +136,86 @@ def test_optical_state_transitions_invalid_phase_transition_type():
 #             target_mode_index=1,
 #             transmission_data=sample_transmission_data
 #         )
+
+
+def columnar_optical_state_transitions():
+    unitary_array = np.stack([np.array([[0, 1], [1, 0]]), np.eye(2)]).astype(complex)
+    return OpticalStateTransitions(
+        mode_amount=2,
+        target_mode_index=1,
+        phase_array=np.array([[0.0], [0.0], [np.pi], [np.pi]]),
+        input_fock_state_array=np.array([[1, 0], [0, 1], [1, 0], [0, 1]]),
+        output_fock_state_array=np.array([[0, 1], [1, 0], [1, 0], [0, 1]]),
+        target_mode_output_array=np.array([1, 0, 0, 1]),
+        raw_output_array=np.array([[0, 1], [1, 0], [1, 0], [0, 1]], dtype=float),
+        configuration_index_array=np.array([0, 0, 1, 1]),
+        unitary_array=unitary_array,
+    )
+
+
+def test_optical_state_transitions_columnar_views():
+    model = columnar_optical_state_transitions()
+    assert model.is_columnar
+    assert model.transition_amount == 4
+    assert model.keys_list == [
+        "phase",
+        "input_fock_state",
+        "output_fock_state",
+        "target_mode_output",
+    ]
+    df = model.transition_dataframe
+    assert df.shape == (4, 4)
+    assert df.loc[0, "input_fock_state"] == (1, 0)
+    assert model.target_output_dataframe.shape == (2, 4)
+    # The views are cached copies, so modifying them does not modify the model
+    df.loc[0, "target_mode_output"] = 0
+    assert model.transition_dataframe.loc[0, "target_mode_output"] == 1
+    model.transmission_data[0]["target_mode_output"] = 0
+    assert model.transmission_data[0]["target_mode_output"] == 1
+    with pytest.raises(ValueError):
+        model.target_mode_output_array[0] = 0
+
+
+def test_optical_state_transitions_columnar_lazy_transmission_data():
+    model = columnar_optical_state_transitions()
+    entry = model.transmission_data[2]
+    assert entry["phase"] == (np.pi,)
+    assert entry["output_fock_state"] == (1, 0)
+    assert entry["raw_output"].shape == (2, 1)
+    # The unitaries are shared views of the per-configuration tensor
+    assert np.shares_memory(entry["unitary"], model.unitary_array)
+    assert model.dataframe.shape == (4, 6)
+
+    model.transmission_data = sample_transmission_data
+    assert not model.is_columnar
+    assert model.transmission_data == sample_transmission_data
+
+
+def test_optical_state_transitions_list_form_in_place_modification():
+    model = OpticalStateTransitions(
+        mode_amount=2,
+        target_mode_index=1,
+        transmission_data=[dict(entry) for entry in sample_transmission_data],
+    )
+    assert model.target_output_dataframe.shape == (1, 4)
+    model.transmission_data.append(dict(sample_transmission_data[0]))
+    assert model.dataframe.shape == (3, 4)
+    assert model.target_output_dataframe.shape == (2, 4)
+
+
+def test_optical_state_transitions_model_dump_field_name():
+    model = OpticalStateTransitions(
+        mode_amount=2, target_mode_index=1, transmission_data=sample_transmission_data
+    )
+    assert model.model_dump()["transmission_data"] == sample_transmission_data
+    assert "transmission_records" not in model.model_dump()
+    assert '"transmission_data"' in model.model_dump_json()
+
+
+def test_optical_state_transitions_columnar_length_mismatch():
+    with pytest.raises(ValueError):
+        OpticalStateTransitions(
+            phase_array=np.zeros((2, 1)),
+            input_fock_state_array=np.zeros((3, 2), dtype=int),
+            output_fock_state_array=np.zeros((2, 2), dtype=int),
+        )